@@ -0,0 +1,90 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models.database import Base, database_url
+import app.models.user  # noqa: F401 (registers tables on Base.metadata)
+import app.models.content  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Tables split into monthly partitions (app/services/partitioning.py) and their partitions
+partitioned_tables = set()
+partitions = set()
+
+
+def _load_partitions(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+
+    result = connection.execute(text(
+        "SELECT c.relname, c.relkind = 'p' FROM pg_class c "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema() AND (c.relkind = 'p' OR c.relispartition) AND c.relkind IN ('p', 'r')"
+    ))
+    for name, is_partitioned in result.all():
+        (partitioned_tables if is_partitioned else partitions).add(name)
+    # End the implicit transaction so the migrations run in their own
+    connection.commit()
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Partitions are created at run time and are not models
+    if type_ == "table" and reflected and name in partitions:
+        return False
+    # Foreign keys cannot reference a partitioned table, so they are dropped when partitioning
+    if type_ == "foreign_key_constraint" and object.referred_table.name in partitioned_tables:
+        return False
+    return True
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        # SQLite cannot ALTER most things in place; batch mode recreates the table
+        render_as_batch=database_url.startswith("sqlite"),
+        compare_type=True,
+        include_object=include_object,
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit the SQL to stdout instead of running it (alembic upgrade --sql)"""
+    _configure(url=database_url, literal_binds=True, dialect_opts={"paramstyle": "named"})
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    _load_partitions(connection)
+    _configure(connection=connection)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    connectable = create_async_engine(database_url, poolclass=NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
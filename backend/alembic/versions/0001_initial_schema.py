@@ -0,0 +1,183 @@
+"""initial schema
+
+Matches what Base.metadata.create_all produced before migrations were
+introduced. Existing databases should be stamped at this revision
+(alembic stamp 0001) and then upgraded.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 08:01:37.007292
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum types are shared between tables, so they are created once up front
+platform_enum = postgresql.ENUM('TWITTER', 'LINKEDIN', name='platform', create_type=False)
+post_status_enum = postgresql.ENUM('DRAFT', 'SCHEDULED', 'PUBLISHED', 'FAILED', name='poststatus', create_type=False)
+
+
+def _enum(enum_type: postgresql.ENUM) -> sa.Enum:
+    return sa.Enum(*enum_type.enums, name=enum_type.name).with_variant(enum_type, 'postgresql')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    platform_enum.create(bind, checkfirst=True)
+    post_status_enum.create(bind, checkfirst=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.Column('anthropic_api_key', sa.String(), nullable=True),
+    sa.Column('perplexity_api_key', sa.String(), nullable=True),
+    sa.Column('twitter_access_token', sa.String(), nullable=True),
+    sa.Column('twitter_access_token_secret', sa.String(), nullable=True),
+    sa.Column('linkedin_access_token', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('topic', sa.String(), nullable=False),
+    sa.Column('research_data', sa.JSON(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('platform', _enum(platform_enum), nullable=False),
+    sa.Column('status', _enum(post_status_enum), nullable=True),
+    sa.Column('platform_post_id', sa.String(), nullable=True),
+    sa.Column('likes', sa.Integer(), nullable=True),
+    sa.Column('shares', sa.Integer(), nullable=True),
+    sa.Column('comments', sa.Integer(), nullable=True),
+    sa.Column('impressions', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_posts_id', 'posts', ['id'], unique=False)
+
+    op.create_table('content_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('platform', _enum(platform_enum), nullable=False),
+    sa.Column('template', sa.Text(), nullable=False),
+    sa.Column('usage_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_content_templates_id', 'content_templates', ['id'], unique=False)
+
+    op.create_table('posting_slot_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('platform', _enum(platform_enum), nullable=False),
+    sa.Column('hour_of_week', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('engagement', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('impressions', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('weighted_posts', sa.Float(), server_default='0', nullable=False),
+    sa.Column('weighted_engagement', sa.Float(), server_default='0', nullable=False),
+    sa.Column('weighted_impressions', sa.Float(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'platform', 'hour_of_week', name='uq_posting_slot_stats_slot')
+    )
+    op.create_index('ix_posting_slot_stats_id', 'posting_slot_stats', ['id'], unique=False)
+
+    op.create_table('recurring_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('rrule', sa.Text(), nullable=False),
+    sa.Column('dtstart', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('timezone', sa.String(), server_default='UTC', nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('anchor_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('anchor_index', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('materialized_until', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_recurring_schedules_id', 'recurring_schedules', ['id'], unique=False)
+    op.create_index('ix_recurring_schedules_user_id', 'recurring_schedules', ['user_id'], unique=False)
+
+    op.create_table('recurrence_exceptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recurring_schedule_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('is_skipped', sa.Boolean(), nullable=False),
+    sa.Column('override_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('override_content', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['recurring_schedule_id'], ['recurring_schedules.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('recurring_schedule_id', 'occurrence_time', name='uq_recurrence_exceptions_occurrence')
+    )
+    op.create_index('ix_recurrence_exceptions_id', 'recurrence_exceptions', ['id'], unique=False)
+
+    op.create_table('scheduled_posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('scheduled_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('celery_task_id', sa.String(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_posted', sa.Boolean(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('recurring_schedule_id', sa.Integer(), nullable=True),
+    sa.Column('occurrence_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.ForeignKeyConstraint(['recurring_schedule_id'], ['recurring_schedules.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('post_id'),
+    sa.UniqueConstraint('recurring_schedule_id', 'occurrence_time', name='uq_scheduled_posts_occurrence')
+    )
+    op.create_index('ix_scheduled_posts_id', 'scheduled_posts', ['id'], unique=False)
+    op.create_index('ix_scheduled_posts_scheduled_time', 'scheduled_posts', ['scheduled_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('scheduled_posts')
+    op.drop_table('recurrence_exceptions')
+    op.drop_table('recurring_schedules')
+    op.drop_table('posting_slot_stats')
+    op.drop_table('content_templates')
+    op.drop_table('posts')
+    op.drop_table('users')
+
+    bind = op.get_bind()
+    post_status_enum.drop(bind, checkfirst=True)
+    platform_enum.drop(bind, checkfirst=True)
@@ -0,0 +1,74 @@
+"""composite and partial indexes
+
+Per-user listings and calendar ranges get (user_id, ...) composite indexes,
+and the dispatcher's scan of unposted rows gets a partial index that stays
+small no matter how many posts have been published. The single-column
+scheduled_time index is covered by those and is dropped.
+
+On PostgreSQL the indexes are built CONCURRENTLY so a large scheduled_posts
+table stays writable during the upgrade.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 08:20:11.418920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_indexes() -> None:
+    concurrently = {'postgresql_concurrently': True}
+
+    op.create_index(
+        'ix_posts_user_id_created_at', 'posts',
+        ['user_id', 'created_at', 'id'], unique=False, **concurrently
+    )
+    op.create_index(
+        'ix_scheduled_posts_user_id_scheduled_time', 'scheduled_posts',
+        ['user_id', 'scheduled_time', 'id'], unique=False, **concurrently
+    )
+    op.create_index(
+        'ix_scheduled_posts_user_id_is_posted_scheduled_time', 'scheduled_posts',
+        ['user_id', 'is_posted', 'scheduled_time'], unique=False, **concurrently
+    )
+    op.create_index(
+        'ix_scheduled_posts_pending', 'scheduled_posts', ['scheduled_time'], unique=False,
+        postgresql_where=sa.text('is_posted = false'), sqlite_where=sa.text('is_posted = 0'),
+        **concurrently
+    )
+    op.create_index(
+        'ix_recurring_schedules_active', 'recurring_schedules', ['materialized_until'], unique=False,
+        postgresql_where=sa.text('is_active = true'), sqlite_where=sa.text('is_active = 1'),
+        **concurrently
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            _create_indexes()
+    else:
+        _create_indexes()
+
+    op.drop_index('ix_scheduled_posts_scheduled_time', table_name='scheduled_posts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_scheduled_posts_scheduled_time', 'scheduled_posts', ['scheduled_time'], unique=False)
+
+    op.drop_index('ix_recurring_schedules_active', table_name='recurring_schedules')
+    op.drop_index('ix_scheduled_posts_pending', table_name='scheduled_posts')
+    op.drop_index('ix_scheduled_posts_user_id_is_posted_scheduled_time', table_name='scheduled_posts')
+    op.drop_index('ix_scheduled_posts_user_id_scheduled_time', table_name='scheduled_posts')
+    op.drop_index('ix_posts_user_id_created_at', table_name='posts')
@@ -0,0 +1,32 @@
+"""add id to the pending scheduled posts listing index
+
+The scheduled posts listing pages by (scheduled_time, id), so the id
+completes the sort key and pages are read straight off the index.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:02:45.176301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_scheduled_posts_user_id_is_posted_scheduled_time'
+
+
+def upgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='scheduled_posts')
+    op.create_index(INDEX_NAME, 'scheduled_posts', ['user_id', 'is_posted', 'scheduled_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='scheduled_posts')
+    op.create_index(INDEX_NAME, 'scheduled_posts', ['user_id', 'is_posted', 'scheduled_time'], unique=False)
@@ -0,0 +1,57 @@
+"""engagement history: raw snapshots and hourly/daily rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:14:03.512870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counters() -> list:
+    return [
+        sa.Column(name, sa.Integer(), server_default='0', nullable=False)
+        for name in ('likes', 'shares', 'comments', 'impressions')
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'engagement_snapshots',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('captured_at', sa.Integer(), autoincrement=False, nullable=False),
+        *_counters(),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id']),
+        sa.PrimaryKeyConstraint('post_id', 'captured_at')
+    )
+    op.create_table(
+        'engagement_rollups',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('resolution_hours', sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column('bucket_start', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        *_counters(),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('post_id', 'resolution_hours', 'bucket_start')
+    )
+    op.create_index(
+        'ix_engagement_rollups_user_id_bucket_start', 'engagement_rollups',
+        ['user_id', 'bucket_start'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_engagement_rollups_user_id_bucket_start', table_name='engagement_rollups')
+    op.drop_table('engagement_rollups')
+    op.drop_table('engagement_snapshots')
@@ -0,0 +1,32 @@
+"""add users.token_version
+
+Access tokens carry the user's token_version ("ver" claim); bumping it
+revokes every token issued before, including ones held in the principal
+cache (app/core/principals.py).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:14:52.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
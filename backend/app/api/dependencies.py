@@ -1,51 +1,86 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.config import settings
-from app.models.database import get_db
+from app.core.principals import principal_cache
+from app.core.security import decode_access_token
+from app.core.tracing import traced
+from app.models.database import get_db, read_session, current_user_id
 from app.models.user import User
-from app.schemas.user import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
 
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    """Get current authenticated user"""
-    
+def _token_user_id(token: str) -> Optional[int]:
+    """User id from a valid token, or None"""
+    token_data = decode_access_token(token)
+    return int(token_data.sub) if token_data is not None else None
+
+
+async def get_read_db(
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes (the replica when configured and safe)"""
+    user_id = _token_user_id(token) if token else None
+    async with read_session(user_id) as session:
+        yield session
+
+
+@traced("auth")
+async def _load_current_user(db: AsyncSession, token: str) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except JWTError:
-        raise credentials_exception
-    
-    if token_data.sub is None:
+    token_data = decode_access_token(token)
+    if token_data is None:
         raise credentials_exception
+    user_id = int(token_data.sub)
     
-    stmt = select(User).where(User.id == token_data.sub)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    
-    if user is None:
-        raise credentials_exception
+    user = principal_cache.get(user_id, token_data.ver)
+    if user is not None:
+        # Attach without a query so the route can still change and commit it
+        db.add(user)
+    else:
+        generation = principal_cache.generation()
+        stmt = select(User).where(User.id == user_id)
+        result = await db.execute(stmt)
+        user = result.scalar_one_or_none()
+        
+        # Tokens issued before the user's token_version was bumped are revoked
+        if user is None or user.token_version != token_data.ver:
+            raise credentials_exception
+        principal_cache.set(user, generation)
     
+    # Lets commits on the primary record this user's writes (read-your-writes)
+    current_user_id.set(user.id)
     return user
 
 
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """Get current authenticated user"""
+    return await _load_current_user(db, token)
+
+
+async def get_current_user_read(
+    db: AsyncSession = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """Get current authenticated user for read-only routes (loaded with get_read_db)"""
+    return await _load_current_user(db, token)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -55,6 +90,15 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_active_user_read(
+    current_user: User = Depends(get_current_user_read)
+) -> User:
+    """Get current active user for read-only routes"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
 async def get_current_active_superuser(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -63,4 +107,4 @@ async def get_current_active_superuser(
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
@@ -4,20 +4,29 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_db, get_current_user
+from app.api.dependencies import get_db, get_current_user, get_current_user_read
 from app.core.config import settings
 from app.core.security import (
     authenticate_user,
     create_access_token,
-    get_password_hash,
+    password_hasher,
+    PasswordHasherBusy,
 )
 from app.models.user import User
-from app.schemas.user import Token, UserCreate, User as UserSchema, LoginRequest
+from app.schemas.user import Token, UserCreate, User as UserSchema, LoginRequest, PasswordChange
 from sqlalchemy import select
 
 router = APIRouter()
 
 
+def _busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/register", response_model=UserSchema)
 async def register(
     user_data: UserCreate,
@@ -47,8 +56,12 @@ async def register(
             detail="Username already taken"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (no pooled connection is held while bcrypt runs)
+    await db.commit()
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise _busy_exception()
     
     db_user = User(
         email=user_data.email,
@@ -72,7 +85,10 @@ async def login(
 ) -> Any:
     """Login and get access token"""
     
-    user = await authenticate_user(db, login_data.username, login_data.password)
+    try:
+        user = await authenticate_user(db, login_data.username, login_data.password)
+    except PasswordHasherBusy:
+        raise _busy_exception()
     
     if not user:
         raise HTTPException(
@@ -95,7 +111,7 @@ async def login(
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
+        subject=user.id, expires_delta=access_token_expires, token_version=user.token_version
     )
     
     return {
@@ -106,7 +122,7 @@ async def login(
 
 @router.get("/me", response_model=UserSchema)
 async def read_current_user(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_read)
 ) -> Any:
     """Get current user info"""
     return current_user
@@ -117,4 +133,55 @@ async def test_token(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """Test access token"""
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+@router.post("/change-password", response_model=Token)
+async def change_password(
+    password_data: PasswordChange,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Change the password and sign out every session (returns a token for this one)"""
+    
+    # No pooled connection is held while bcrypt runs
+    await db.commit()
+    try:
+        if not await password_hasher.verify(password_data.current_password, current_user.hashed_password):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Incorrect password"
+            )
+        hashed_password = await password_hasher.hash(password_data.new_password)
+    except PasswordHasherBusy:
+        raise _busy_exception()
+    
+    # The new password and the revocation of older tokens commit together
+    current_user.hashed_password = hashed_password
+    current_user.token_version = User.token_version + 1
+    await db.commit()
+    await db.refresh(current_user)
+    
+    access_token = create_access_token(
+        subject=current_user.id,
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        token_version=current_user.token_version
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer"
+    }
+
+
+@router.post("/logout-all")
+async def logout_all(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Sign out every session by revoking all tokens issued so far"""
+    
+    current_user.token_version = User.token_version + 1
+    await db.commit()
+    
+    return {"message": "Signed out of all sessions"}
@@ -1,24 +1,83 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, case, Text
+from sqlalchemy.orm import undefer
 
-from app.api.dependencies import get_db, get_current_active_user
+from app.api.dependencies import get_db, get_read_db, get_current_active_user, get_current_active_user_read
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_page
+from app.core.tracing import span
+from app.models.database import run_write
 from app.models.user import User
-from app.models.content import Post, ContentTemplate, Platform as PlatformEnum
+from app.models.content import Post, POST_ATTRIBUTES, PostStatus, ContentTemplate, Platform as PlatformEnum
 from app.schemas.content import (
     ContentGenerationRequest,
     GeneratedContent,
     PostCreate,
     Post as PostSchema,
+    PostListItem,
+    Platform,
+    EngagementResolution,
+    PostEngagementCurve,
+    EngagementSummary,
     ContentTemplateCreate,
+    ContentTemplateUpdate,
     ContentTemplate as ContentTemplateSchema
 )
-from app.services.ai_service import ai_service, AIProvider
-from app.services.perplexity_service import perplexity_service
-from app.services.claude_service import claude_service
+from app.services.registry import services, ai_service, claude_service, perplexity_service
+from app.services.publishers import PublishError, get_publisher
+from app.services.best_times import best_time_service
+from app.services.engagement import engagement_service, HOUR, DAY
+from app.services.partitioning import select_post
+from app.services.template_engine import template_engine, template_usage, compile_template, TemplateSyntaxError
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+POST_PREVIEW_LENGTH = 100
+
+# Columns GET /posts can return, by field name
+POST_LIST_COLUMNS: Dict[str, Any] = {
+    name: getattr(Post, name) for name in PostListItem.model_fields if name != "content_preview"
+}
+POST_LIST_COLUMNS["content_preview"] = case(
+    (
+        func.length(Post.content) > POST_PREVIEW_LENGTH,
+        func.substr(Post.content, 1, POST_PREVIEW_LENGTH, type_=Text) + "..."
+    ),
+    else_=Post.content
+)
+
+# Research results by (user, topic, context), reused by template generation
+research_cache = TTLCache(settings.RESEARCH_CACHE_TTL_SECONDS, max_entries=1000)
+
+# The full post, as listings returned before fields= (research_data can be
+# large: clients that don't show it leave it out with fields=-research_data)
+DEFAULT_POST_LIST_FIELDS = [name for name in POST_LIST_COLUMNS if name != "content_preview"]
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Fields to return: the listed ones, or the defaults minus "-name" entries"""
+    if not fields:
+        return DEFAULT_POST_LIST_FIELDS
+    
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    excluded = [name[1:] for name in names if name.startswith("-")]
+    if excluded and len(excluded) == len(names):
+        names = [name for name in DEFAULT_POST_LIST_FIELDS if name not in excluded]
+    else:
+        excluded = []
+    unknown = [name for name in names + excluded if name not in POST_LIST_COLUMNS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown) or fields}. Available: {', '.join(POST_LIST_COLUMNS)}"
+        )
+    return names
 
 
 @router.post("/generate", response_model=List[GeneratedContent])
@@ -29,37 +88,95 @@ async def generate_content(
 ) -> Any:
     """Generate content for multiple platforms"""
     
-    print(f"🎯 Content generation request:")
-    print(f"   Topic: {request.topic}")
-    print(f"   Platforms: {[p.value for p in request.platforms]}")
-    print(f"   AI Provider: {request.ai_provider}")
-    print(f"   Include Research: {request.include_research}")
+    logger.info(
+        "Content generation request",
+        extra={
+            "topic": request.topic,
+            "platforms": [p.value for p in request.platforms],
+            "ai_provider": request.ai_provider,
+            "include_research": request.include_research,
+            "template_id": request.template_id,
+        }
+    )
+    
+    template = None
+    if request.template_id is not None:
+        result = await db.execute(
+            select(ContentTemplate).where(
+                ContentTemplate.id == request.template_id,
+                ContentTemplate.user_id == current_user.id
+            )
+        )
+        template = result.scalar_one_or_none()
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+        
+        other_platforms = [p.value for p in request.platforms if p.value != template.platform.value]
+        if other_platforms:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Template is for {template.platform.value}, not {', '.join(other_platforms)}"
+            )
     
     generated_content = []
-    research_data = None
+    research_data = request.research_data.model_dump() if request.research_data else None
+    research_key = (current_user.id, request.topic, request.additional_context)
     
-    # Perform research if requested
-    if request.include_research:
+    if template is not None:
+        # Template mode stays local: only research passed in or done earlier is used
+        if request.include_research and research_data is None:
+            research_data = research_cache.get(research_key)
+    elif request.include_research and research_data is None:
+        # Perform research if requested (and not passed in)
         try:
-            research_data = await perplexity_service.research_topic(
-                request.topic,
-                request.additional_context
-            )
+            with span("research"):
+                research_data = await perplexity_service.research_topic(
+                    request.topic,
+                    request.additional_context
+                )
+            research_cache.set(research_key, research_data)
         except Exception as e:
             # Continue without research if it fails
-            print(f"Research failed: {e}")
+            logger.warning("Research failed, generating without it", extra={"error": str(e)})
             research_data = None
     
+    # Template mode: filled locally, no AI call
+    if template is not None:
+        try:
+            with span("template.render", template_id=template.id):
+                suggestions_data = template_engine.render_suggestions(
+                    template,
+                    request.topic,
+                    template.platform.value,
+                    research_data,
+                    request.additional_context
+                )
+        except TemplateSyntaxError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid template: {e}")
+        if not suggestions_data:
+            raise HTTPException(status_code=400, detail="Template rendered empty content")
+        
+        template_usage.record(template.id)
+        return [
+            GeneratedContent(
+                platform=platform,
+                suggestions=suggestions_data,
+                research_data=research_data
+            )
+            for platform in request.platforms
+        ]
+    
     # Generate content for each platform
     for platform in request.platforms:
         try:
-            suggestions_data = await ai_service.generate_content(
-                request.topic,
-                platform.value,
-                request.ai_provider,
-                research_data,
-                request.additional_context
-            )
+            with span("generate", platform=platform.value, provider=request.ai_provider.value):
+                suggestions_data = await ai_service.generate_content(
+                    request.topic,
+                    platform.value,
+                    request.ai_provider,
+                    research_data,
+                    request.additional_context
+                )
             
             # Convert to PostSuggestion objects
             from app.schemas.content import PostSuggestion
@@ -79,10 +196,7 @@ async def generate_content(
             ))
             
         except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"❌ Content generation error for {platform.value}:")
-            print(error_details)
+            logger.exception("Content generation failed", extra={"platform": platform.value})
             raise HTTPException(
                 status_code=500,
                 detail=f"Content generation failed for {platform.value}: {str(e)}"
@@ -94,63 +208,198 @@ async def generate_content(
 @router.post("/posts", response_model=PostSchema)
 async def create_post(
     post_data: PostCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Create a new post"""
     
     # Convert platform string to enum
     platform_enum = PlatformEnum[post_data.platform.upper()]
     
-    db_post = Post(
-        user_id=current_user.id,
-        topic=post_data.topic,
-        content=post_data.content,
-        platform=platform_enum,
-        research_data=post_data.research_data
-    )
+    async def insert_post(db: AsyncSession) -> Post:
+        db_post = Post(
+            user_id=current_user.id,
+            topic=post_data.topic,
+            content=post_data.content,
+            platform=platform_enum,
+            research_data=post_data.research_data
+        )
+        db.add(db_post)
+        await db.flush()
+        await db.refresh(db_post, POST_ATTRIBUTES)
+        return db_post
     
-    db.add(db_post)
-    await db.commit()
-    await db.refresh(db_post)
+    db_post = await run_write(insert_post)
     
     return db_post
 
 
-@router.get("/posts", response_model=List[PostSchema])
+@router.get("/posts", response_model=List[PostListItem], response_model_exclude_unset=True)
 async def get_posts(
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated fields to return, or fields to leave out as -name (default: every field except content_preview)"
+    ),
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
-    """Get user's posts"""
+    """Get user's posts, newest first.
     
-    stmt = select(Post).where(Post.user_id == current_user.id).offset(skip).limit(limit)
-    result = await db.execute(stmt)
-    posts = result.scalars().all()
+    Only the requested columns are selected. Pass the X-Next-Cursor response
+    header back as `cursor` to get the next page; `skip` is still accepted but
+    gets slower the deeper it goes.
+    """
+    
+    names = _parse_fields(fields)
+    stmt = (
+        select(*[POST_LIST_COLUMNS[name].label(name) for name in names])
+        .where(Post.user_id == current_user.id)
+    )
+    posts, next_cursor = await keyset_page(
+        db, stmt, [Post.created_at, Post.id], limit,
+        cursor=cursor, skip=skip, descending=True, scalars=False
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return posts
 
 
 @router.get("/posts/{post_id}", response_model=PostSchema)
 async def get_post(
+    post_id: int,
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Get a specific post"""
+    
+    stmt = (
+        select(Post)
+        .where(Post.id == post_id, Post.user_id == current_user.id)
+        .options(undefer(Post.research_data))
+    )
+    post = await select_post(db, stmt, post_id)
+    
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    return post
+
+
+@router.post("/posts/{post_id}/refresh-metrics", response_model=PostSchema)
+async def refresh_post_metrics(
     post_id: int,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Get a specific post"""
+    """Fetch the latest engagement metrics for a published post from its platform"""
     
-    stmt = select(Post).where(Post.id == post_id, Post.user_id == current_user.id)
-    result = await db.execute(stmt)
-    post = result.scalar_one_or_none()
+    stmt = (
+        select(Post)
+        .where(Post.id == post_id, Post.user_id == current_user.id)
+        .options(undefer(Post.research_data))
+    )
+    post = await select_post(db, stmt, post_id)
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
+    if post.status != PostStatus.PUBLISHED or not post.platform_post_id:
+        raise HTTPException(status_code=400, detail="Post has not been published")
+    
+    try:
+        publisher = get_publisher(post.platform.value, current_user)
+        metrics = await publisher.fetch_metrics(post.platform_post_id)
+    except PublishError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch metrics: {str(e)}")
+    
+    previous = {
+        "likes": post.likes,
+        "shares": post.shares,
+        "comments": post.comments,
+        "impressions": post.impressions
+    }
+    for name in previous:
+        setattr(post, name, metrics.get(name, 0))
+    
+    # Keep the best-time rollups and engagement history in step with the new numbers
+    await best_time_service.record_metrics(db, post, previous)
+    await engagement_service.record(db, post, previous)
+    await db.commit()
+    await db.refresh(post, POST_ATTRIBUTES)
+    
     return post
 
 
+RESOLUTION_SECONDS = {
+    EngagementResolution.HOUR: HOUR,
+    EngagementResolution.DAY: DAY
+}
+
+
+@router.get("/posts/{post_id}/engagement", response_model=PostEngagementCurve)
+async def get_post_engagement(
+    post_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    resolution: Optional[EngagementResolution] = Query(
+        None,
+        description="Keep the last point per hour or day (default: every stored point)"
+    ),
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Cumulative engagement of a post over time.
+    
+    Recent points are individual metrics refreshes; older history is hourly
+    and then daily, as kept by the engagement compaction.
+    """
+    
+    stmt = select(Post).where(Post.id == post_id, Post.user_id == current_user.id)
+    post = await select_post(db, stmt, post_id)
+    
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    points = await engagement_service.post_curve(
+        db, post, start_date, end_date,
+        bucket_seconds=RESOLUTION_SECONDS[resolution] if resolution else None
+    )
+    
+    return {"post_id": post.id, "resolution": resolution, "points": points}
+
+
+@router.get("/engagement", response_model=EngagementSummary)
+async def get_engagement(
+    start_date: Optional[datetime] = Query(None, description="Default: 30 days ago"),
+    end_date: Optional[datetime] = Query(None, description="Default: now"),
+    resolution: EngagementResolution = EngagementResolution.DAY,
+    platform: Optional[Platform] = None,
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Engagement gained across all of the user's posts per hour or day"""
+    
+    end_date = end_date or datetime.utcnow()
+    start_date = start_date or end_date - timedelta(days=30)
+    if start_date >= end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    
+    summary = await engagement_service.user_engagement(
+        db, current_user.id, start_date, end_date,
+        bucket_seconds=RESOLUTION_SECONDS[resolution],
+        platform=platform.value if platform else None
+    )
+    summary["resolution"] = resolution
+    
+    return summary
+
+
 @router.post("/variations")
 async def generate_variations(
     post_id: int,
@@ -162,8 +411,7 @@ async def generate_variations(
     
     # Get the original post
     stmt = select(Post).where(Post.id == post_id, Post.user_id == current_user.id)
-    result = await db.execute(stmt)
-    post = result.scalar_one_or_none()
+    post = await select_post(db, stmt, post_id)
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -175,7 +423,7 @@ async def generate_variations(
         # Use user's API key if available
         user_claude_key = current_user.anthropic_api_key
         if user_claude_key:
-            user_claude_service = type(claude_service)(user_claude_key)
+            user_claude_service = services.create("claude", user_claude_key)
             variations = await user_claude_service.generate_variations(
                 post.content,
                 platform_value,
@@ -203,33 +451,40 @@ async def generate_variations(
 @router.post("/templates", response_model=ContentTemplateSchema)
 async def create_template(
     template_data: ContentTemplateCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Create a content template"""
     
+    try:
+        compile_template(template_data.template)
+    except TemplateSyntaxError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid template: {e}")
+    
     # Convert platform string to enum
     platform_enum = PlatformEnum[template_data.platform.upper()]
     
-    db_template = ContentTemplate(
-        user_id=current_user.id,
-        name=template_data.name,
-        description=template_data.description,
-        platform=platform_enum,
-        template=template_data.template
-    )
+    async def insert_template(db: AsyncSession) -> ContentTemplate:
+        db_template = ContentTemplate(
+            user_id=current_user.id,
+            name=template_data.name,
+            description=template_data.description,
+            platform=platform_enum,
+            template=template_data.template
+        )
+        db.add(db_template)
+        await db.flush()
+        await db.refresh(db_template)
+        return db_template
     
-    db.add(db_template)
-    await db.commit()
-    await db.refresh(db_template)
+    db_template = await run_write(insert_template)
     
     return db_template
 
 
 @router.get("/templates", response_model=List[ContentTemplateSchema])
 async def get_templates(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """Get user's content templates"""
     
@@ -237,7 +492,60 @@ async def get_templates(
     result = await db.execute(stmt)
     templates = result.scalars().all()
     
-    return templates
+    # Include uses that have not been flushed to the database yet
+    response = []
+    for template in templates:
+        item = ContentTemplateSchema.model_validate(template)
+        item.usage_count = (item.usage_count or 0) + template_usage.pending(template.id)
+        response.append(item)
+    
+    return response
+
+
+@router.put("/templates/{template_id}", response_model=ContentTemplateSchema)
+async def update_template(
+    template_id: int,
+    template_data: ContentTemplateUpdate,
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Update a content template"""
+    
+    changes = template_data.model_dump(exclude_unset=True)
+    if changes.get("template") is not None:
+        try:
+            compile_template(changes["template"])
+        except TemplateSyntaxError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid template: {e}")
+    if changes.get("platform") is not None:
+        changes["platform"] = PlatformEnum[changes["platform"].upper()]
+    
+    async def apply_update(db: AsyncSession) -> Optional[ContentTemplate]:
+        result = await db.execute(
+            select(ContentTemplate).where(
+                ContentTemplate.id == template_id,
+                ContentTemplate.user_id == current_user.id
+            )
+        )
+        db_template = result.scalar_one_or_none()
+        if not db_template:
+            return None
+        
+        for field, value in changes.items():
+            if value is not None or field == "description":
+                setattr(db_template, field, value)
+        await db.flush()
+        await db.refresh(db_template)
+        return db_template
+    
+    db_template = await run_write(apply_update)
+    if not db_template:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    template_engine.invalidate(template_id)
+    
+    item = ContentTemplateSchema.model_validate(db_template)
+    item.usage_count = (item.usage_count or 0) + template_usage.pending(template_id)
+    return item
 
 
 @router.get("/trending-topics")
@@ -251,7 +559,7 @@ async def get_trending_topics(
         # Use user's API key if available
         user_perplexity_key = current_user.perplexity_api_key
         if user_perplexity_key:
-            user_perplexity_service = type(perplexity_service)(user_perplexity_key)
+            user_perplexity_service = services.create("perplexity", user_perplexity_key)
             topics = await user_perplexity_service.get_trending_topics(category)
         else:
             topics = await perplexity_service.get_trending_topics(category)
@@ -283,6 +591,7 @@ async def research_topic(
             topic,
             additional_context
         )
+        research_cache.set((current_user.id, topic, additional_context), research_data)
         
         return research_data
         
@@ -1,12 +1,14 @@
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_db, get_current_active_user
 from app.models.user import User
 from app.schemas.user import PlatformCredentials, UserAPIKeys
-from app.services.twitter_service import twitter_service
+from app.services.registry import twitter_service
 from app.services.linkedin_service import LinkedInService
+from app.services.publishers import PUBLISHERS
+from app.services.credential_validation import credential_validation_cache
 
 router = APIRouter()
 
@@ -14,6 +16,7 @@ router = APIRouter()
 @router.post("/credentials")
 async def update_platform_credentials(
     credentials: PlatformCredentials,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
@@ -31,6 +34,11 @@ async def update_platform_credentials(
     
     await db.commit()
     
+    # Revalidate the new credentials after the response is sent
+    background_tasks.add_task(
+        credential_validation_cache.refresh, current_user, credentials.platform.lower()
+    )
+    
     return {"message": f"{credentials.platform} credentials updated successfully"}
 
 
@@ -59,14 +67,17 @@ async def get_platform_status(
 ) -> Any:
     """Get connection status for all platforms"""
     
+    # Cached per account; cold accounts come back pending and are validated in the background
+    validation = await credential_validation_cache.get_status(current_user)
+    
     status = {
         "twitter": {
             "connected": bool(current_user.twitter_access_token),
-            "valid": False
+            **validation["twitter"]
         },
         "linkedin": {
             "connected": bool(current_user.linkedin_access_token),
-            "valid": False
+            **validation["linkedin"]
         },
         "api_keys": {
             "anthropic": bool(current_user.anthropic_api_key),
@@ -74,23 +85,6 @@ async def get_platform_status(
         }
     }
     
-    # Validate Twitter credentials
-    if current_user.twitter_access_token:
-        try:
-            # Use global twitter_service for validation
-            test_result = await twitter_service.test_connection()
-            status["twitter"]["valid"] = test_result.get("success", False)
-        except:
-            status["twitter"]["valid"] = False
-    
-    # Validate LinkedIn credentials
-    if current_user.linkedin_access_token:
-        try:
-            linkedin_service = LinkedInService(current_user.linkedin_access_token)
-            status["linkedin"]["valid"] = await linkedin_service.validate_credentials()
-        except:
-            status["linkedin"]["valid"] = False
-    
     return status
 
 
@@ -113,6 +107,7 @@ async def remove_platform_credentials(
         raise HTTPException(status_code=400, detail="Unsupported platform")
     
     await db.commit()
+    credential_validation_cache.invalidate(current_user.id, platform.lower())
     
     return {"message": f"{platform} credentials removed successfully"}
 
@@ -122,16 +117,8 @@ async def get_platform_limits() -> Any:
     """Get character limits and posting limits for platforms"""
     
     return {
-        "twitter": {
-            "character_limit": 280,
-            "posts_per_day": 2400,  # API limit
-            "posts_per_hour": 300
-        },
-        "linkedin": {
-            "character_limit": 3000,
-            "posts_per_day": 100,  # Conservative estimate
-            "posts_per_hour": 25
-        }
+        platform: publisher_class.get_limits()
+        for platform, publisher_class in PUBLISHERS.items()
     }
 
 
@@ -1,21 +1,99 @@
-from typing import List, Any
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, func, case, or_, Text
+from sqlalchemy.orm import undefer
 
-from app.api.dependencies import get_db, get_current_active_user
+from app.api.dependencies import (
+    get_db,
+    get_read_db,
+    get_current_active_user,
+    get_current_active_user_read,
+    get_current_active_superuser
+)
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_page
+from app.core.tracing import span
+from app.models.database import dialect_insert
 from app.models.user import User
-from app.models.content import Post, ScheduledPost, Platform as PlatformEnum
+from app.models.content import (
+    Post,
+    POST_ATTRIBUTES,
+    ScheduledPost,
+    RecurringSchedule,
+    RecurrenceException,
+    Platform as PlatformEnum
+)
 from app.schemas.content import (
     ScheduledPostCreate,
     ScheduledPost as ScheduledPostSchema,
-    PostCreate
+    PostCreate,
+    CrossPostRequest,
+    BulkScheduleRequest,
+    BulkCancelRequest,
+    BulkItemResult,
+    BulkOperationResult,
+    BestTimesResponse,
+    RecurringScheduleCreate,
+    RecurringSchedule as RecurringScheduleSchema,
+    RecurrenceExceptionCreate,
+    RecurrenceException as RecurrenceExceptionSchema,
+    RecurringOccurrence,
+    ConflictPolicy,
+    Platform
+)
+from app.services.publishers import (
+    PUBLISHERS,
+    Publisher,
+    PublishError,
+    get_publisher,
+    get_connected_publishers,
+    publish_dispatcher
 )
-from app.services.twitter_service import twitter_service
 from app.models.content import PostStatus
+from app.services.scheduler import schedule_dispatcher
+from app.services.publish_worker import local_workers
+from app.services.calendar_cache import calendar_cache
+from app.services.partitioning import attach_posts, select_post, select_posts
+from app.services.slot_allocator import SlotAllocator, to_utc_naive
+from app.services.schedule_index import schedule_index
+from app.services.best_times import best_time_service
+from app.services.recurrence import (
+    recurrence_service,
+    parse_rule,
+    expand,
+    is_occurrence,
+    load_exceptions
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+CALENDAR_PREVIEW_LENGTH = 100
+
+
+async def _get_scheduled_post_with_post(db: AsyncSession, scheduled_post_id: int) -> ScheduledPost:
+    """Load a scheduled post with its post eagerly (no lazy loads under AsyncSession)"""
+    stmt = select(ScheduledPost).where(ScheduledPost.id == scheduled_post_id)
+    result = await db.execute(stmt)
+    scheduled_post = result.scalar_one()
+    await attach_posts(db, [scheduled_post], undefer(Post.research_data))
+    return scheduled_post
+
+
+def _hourly_caps(overrides: Optional[Dict[Platform, int]] = None) -> Dict[str, int]:
+    """Per-platform hourly caps for one user's schedule"""
+    hourly_caps = {
+        platform: min(publisher.posts_per_hour, settings.SCHEDULE_MAX_POSTS_PER_HOUR)
+        for platform, publisher in PUBLISHERS.items()
+    }
+    hourly_caps.update({platform.value: cap for platform, cap in (overrides or {}).items()})
+    return hourly_caps
 
 
 @router.post("/schedule", response_model=ScheduledPostSchema)
@@ -31,14 +109,14 @@ async def schedule_post(
         Post.id == schedule_data.post_id,
         Post.user_id == current_user.id
     )
-    result = await db.execute(stmt)
-    post = result.scalar_one_or_none()
+    post = await select_post(db, stmt, schedule_data.post_id)
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
     # Check if the scheduled time is in the future
-    if schedule_data.scheduled_time <= datetime.utcnow():
+    scheduled_time = to_utc_naive(schedule_data.scheduled_time)
+    if scheduled_time <= datetime.utcnow():
         raise HTTPException(
             status_code=400,
             detail="Scheduled time must be in the future"
@@ -49,53 +127,306 @@ async def schedule_post(
     result = await db.execute(stmt)
     existing_schedule = result.scalar_one_or_none()
     
+    # Check for other posts too close to this one
+    platform = post.platform.value
+    if schedule_data.on_conflict != ConflictPolicy.allow:
+        allocator = SlotAllocator(
+            timedelta(minutes=settings.SCHEDULE_MIN_SPACING_MINUTES),
+            _hourly_caps(),
+            base=await schedule_index.get(db, current_user.id),
+            exclude={existing_schedule.id} if existing_schedule else ()
+        )
+        if not allocator.is_free(platform, scheduled_time):
+            free_slot = allocator.find_slot(platform, scheduled_time, scheduled_time + timedelta(days=7))
+            if schedule_data.on_conflict == ConflictPolicy.shift and free_slot is not None:
+                scheduled_time = free_slot
+            else:
+                raise HTTPException(
+                    status_code=409,
+                    detail={
+                        "message": (
+                            f"Another {platform} post is scheduled within "
+                            f"{settings.SCHEDULE_MIN_SPACING_MINUTES} minutes, or the hourly limit is reached"
+                        ),
+                        "suggested_time": free_slot.isoformat() if free_slot else None
+                    }
+                )
+    
     if existing_schedule:
         # Update existing schedule
-        existing_schedule.scheduled_time = schedule_data.scheduled_time
+        existing_schedule.scheduled_time = scheduled_time
         existing_schedule.is_posted = False
         existing_schedule.error_message = None
+        existing_schedule.attempts = 0
+        existing_schedule.next_attempt_at = None
         
         await db.commit()
-        await db.refresh(existing_schedule)
+        scheduled_post_id = existing_schedule.id
+    else:
+        # Create new scheduled post
+        db_scheduled_post = ScheduledPost(
+            post_id=schedule_data.post_id,
+            user_id=current_user.id,
+            scheduled_time=scheduled_time
+        )
         
-        # TODO: Update Celery task
+        db.add(db_scheduled_post)
+        await db.commit()
+        scheduled_post_id = db_scheduled_post.id
+    
+    schedule_dispatcher.schedule(scheduled_post_id, scheduled_time)
+    schedule_index.add(current_user.id, scheduled_post_id, platform, scheduled_time)
+    calendar_cache.invalidate(current_user.id)
+    
+    return await _get_scheduled_post_with_post(db, scheduled_post_id)
+
+
+@router.post("/bulk", response_model=BulkOperationResult)
+async def bulk_schedule_posts(
+    request: BulkScheduleRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Schedule many posts in one transaction, optionally spreading them over a time window"""
+    
+    now = datetime.utcnow()
+    post_ids = [item.post_id for item in request.items]
+    
+    # Posts owned by the user, and their existing schedules
+    rows = await select_posts(
+        db,
+        select(Post.id, Post.platform).where(Post.id.in_(post_ids), Post.user_id == current_user.id),
+        post_ids,
+        scalars=False
+    )
+    post_platforms = {post_id: platform.value for post_id, platform in rows}
+    
+    result = await db.execute(
+        select(ScheduledPost.post_id, ScheduledPost.id, ScheduledPost.is_posted)
+        .where(ScheduledPost.post_id.in_(post_ids))
+    )
+    existing = {post_id: (scheduled_post_id, is_posted) for post_id, scheduled_post_id, is_posted in result.all()}
+    
+    results: Dict[int, BulkItemResult] = {}
+    times: Dict[int, datetime] = {}
+    explicit: Dict[int, datetime] = {}
+    to_spread: Dict[str, List[int]] = defaultdict(list)
+    seen = set()
+    
+    for index, item in enumerate(request.items):
+        error = None
+        if item.post_id in seen:
+            error = "Duplicate post_id in request"
+        elif item.post_id not in post_platforms:
+            error = "Post not found"
+        elif item.post_id in existing and existing[item.post_id][1]:
+            error = "Post has already been published"
+        elif item.scheduled_time is None:
+            if request.spread is None:
+                error = "scheduled_time is required unless spread is given"
+            else:
+                to_spread[post_platforms[item.post_id]].append(index)
+        elif to_utc_naive(item.scheduled_time) <= now:
+            error = "Scheduled time must be in the future"
+        else:
+            explicit[index] = to_utc_naive(item.scheduled_time)
         
-        return existing_schedule
+        seen.add(item.post_id)
+        if error:
+            results[index] = BulkItemResult(post_id=item.post_id, status="error", error=error)
     
-    # Create new scheduled post
-    db_scheduled_post = ScheduledPost(
-        post_id=schedule_data.post_id,
-        user_id=current_user.id,
-        scheduled_time=schedule_data.scheduled_time
+    # Already scheduled posts come from the schedule index; rows being
+    # rescheduled by this request do not count against themselves
+    spread = request.spread
+    min_spacing = timedelta(
+        minutes=spread.min_spacing_minutes if spread else settings.SCHEDULE_MIN_SPACING_MINUTES
+    )
+    allocator = SlotAllocator(
+        min_spacing,
+        _hourly_caps(spread.max_per_hour if spread else None),
+        base=await schedule_index.get(db, current_user.id),
+        exclude={scheduled_post_id for scheduled_post_id, _ in existing.values()}
     )
     
-    db.add(db_scheduled_post)
-    await db.commit()
-    await db.refresh(db_scheduled_post)
+    for index, when in explicit.items():
+        platform = post_platforms[request.items[index].post_id]
+        if request.on_conflict != ConflictPolicy.allow and not allocator.is_free(platform, when):
+            free_slot = None
+            if request.on_conflict == ConflictPolicy.shift:
+                free_slot = allocator.find_slot(platform, when, when + timedelta(days=7))
+            if free_slot is None:
+                results[index] = BulkItemResult(
+                    post_id=request.items[index].post_id,
+                    status="error",
+                    error=f"Collides with another {platform} post (spacing or hourly limit)"
+                )
+                continue
+            when = free_slot
+        
+        allocator.occupy(platform, when)
+        times[index] = when
+    
+    if to_spread:
+        window_start = max(to_utc_naive(spread.window_start), now)
+        window_end = to_utc_naive(spread.window_end)
+        
+        for platform, indexes in to_spread.items():
+            if spread.prefer_best_times:
+                hour_scores, _ = await best_time_service.get_hour_scores(db, current_user.id, platform)
+                slots = allocator.spread_ranked(platform, len(indexes), window_start, window_end, hour_scores)
+            else:
+                slots = allocator.spread(platform, len(indexes), window_start, window_end)
+            for index, slot in zip(indexes, slots):
+                if slot is None:
+                    results[index] = BulkItemResult(
+                        post_id=request.items[index].post_id,
+                        status="error",
+                        error="No free slot left in the spread window"
+                    )
+                else:
+                    times[index] = slot
+    
+    if times:
+        # Single multi-row upsert keyed on the unique post_id
+        insert = dialect_insert(db)
+        insert_stmt = insert(ScheduledPost).values([
+            {
+                "post_id": request.items[index].post_id,
+                "user_id": current_user.id,
+                "scheduled_time": when,
+                "is_posted": False,
+                "attempts": 0
+            }
+            for index, when in times.items()
+        ])
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[ScheduledPost.post_id],
+            set_={
+                "scheduled_time": insert_stmt.excluded.scheduled_time,
+                "is_posted": False,
+                "error_message": None,
+                "attempts": 0,
+                "next_attempt_at": None
+            }
+        ).returning(ScheduledPost.id, ScheduledPost.post_id)
+        result = await db.execute(upsert_stmt)
+        scheduled_ids = dict((post_id, scheduled_post_id) for scheduled_post_id, post_id in result.all())
+        await db.commit()
+        
+        for index, when in times.items():
+            post_id = request.items[index].post_id
+            schedule_dispatcher.schedule(scheduled_ids[post_id], when)
+            schedule_index.add(current_user.id, scheduled_ids[post_id], post_platforms[post_id], when)
+            results[index] = BulkItemResult(
+                post_id=post_id,
+                scheduled_post_id=scheduled_ids[post_id],
+                status="rescheduled" if post_id in existing else "scheduled",
+                scheduled_time=when
+            )
+        calendar_cache.invalidate(current_user.id)
     
-    # TODO: Create Celery task for publishing
+    ordered = [results[index] for index in range(len(request.items))]
+    failed = sum(1 for item in ordered if item.status == "error")
     
-    return db_scheduled_post
+    return BulkOperationResult(
+        succeeded=len(ordered) - failed,
+        failed=failed,
+        results=ordered
+    )
 
 
-@router.get("/scheduled", response_model=List[ScheduledPostSchema])
-async def get_scheduled_posts(
-    skip: int = 0,
-    limit: int = 100,
+@router.post("/bulk-cancel", response_model=BulkOperationResult)
+async def bulk_cancel_scheduled_posts(
+    request: BulkCancelRequest,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Get user's scheduled posts"""
+    """Cancel many scheduled posts in one transaction"""
+    
+    now = datetime.utcnow()
+    scheduled_post_ids = list(dict.fromkeys(request.scheduled_post_ids))
+    
+    result = await db.execute(
+        select(ScheduledPost.id, ScheduledPost.post_id, ScheduledPost.is_posted)
+        .where(ScheduledPost.id.in_(scheduled_post_ids))
+        .where(ScheduledPost.user_id == current_user.id)
+    )
+    found = {scheduled_post_id: (post_id, is_posted) for scheduled_post_id, post_id, is_posted in result.all()}
+    
+    cancellable = [
+        scheduled_post_id for scheduled_post_id, (_, is_posted) in found.items()
+        if not is_posted
+    ]
+    
+    cancelled = set()
+    if cancellable:
+        # Rows claimed by a publish worker are left alone
+        result = await db.execute(
+            delete(ScheduledPost)
+            .where(ScheduledPost.id.in_(cancellable))
+            .where(ScheduledPost.is_posted == False)
+            .where(or_(ScheduledPost.celery_task_id.is_(None), ScheduledPost.lease_expires_at < now))
+            .returning(ScheduledPost.id)
+            .execution_options(synchronize_session=False)
+        )
+        cancelled = set(result.scalars().all())
+        await db.commit()
+        
+        for scheduled_post_id in cancelled:
+            schedule_dispatcher.cancel(scheduled_post_id)
+            schedule_index.remove(current_user.id, scheduled_post_id)
+        calendar_cache.invalidate(current_user.id)
+    
+    results = []
+    for scheduled_post_id in scheduled_post_ids:
+        post_id, is_posted = found.get(scheduled_post_id, (None, False))
+        if scheduled_post_id in cancelled:
+            results.append(BulkItemResult(post_id=post_id, scheduled_post_id=scheduled_post_id, status="cancelled"))
+            continue
+        
+        if scheduled_post_id not in found:
+            error = "Scheduled post not found"
+        elif is_posted:
+            error = "Post has already been published"
+        else:
+            error = "Post is being published"
+        results.append(BulkItemResult(
+            post_id=post_id,
+            scheduled_post_id=scheduled_post_id,
+            status="error",
+            error=error
+        ))
+    
+    return BulkOperationResult(
+        succeeded=len(cancelled),
+        failed=len(results) - len(cancelled),
+        results=results
+    )
+
+
+@router.get("/scheduled", response_model=List[ScheduledPostSchema])
+async def get_scheduled_posts(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Get user's pending scheduled posts, soonest first (paginated like /content/posts)"""
     
     stmt = (
         select(ScheduledPost)
         .where(ScheduledPost.user_id == current_user.id)
         .where(ScheduledPost.is_posted == False)
-        .offset(skip)
-        .limit(limit)
     )
-    result = await db.execute(stmt)
-    scheduled_posts = result.scalars().all()
+    scheduled_posts, next_cursor = await keyset_page(
+        db, stmt, [ScheduledPost.scheduled_time, ScheduledPost.id], limit,
+        cursor=cursor, skip=skip
+    )
+    await attach_posts(db, scheduled_posts, undefer(Post.research_data))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return scheduled_posts
 
@@ -121,131 +452,483 @@ async def cancel_scheduled_post(
     if scheduled_post.is_posted:
         raise HTTPException(status_code=400, detail="Post has already been published")
     
-    # TODO: Cancel Celery task
-    
-    await db.delete(scheduled_post)
+    # A row claimed by a publish worker is being published: leave it alone
+    result = await db.execute(
+        delete(ScheduledPost)
+        .where(ScheduledPost.id == scheduled_post_id)
+        .where(ScheduledPost.is_posted == False)
+        .where(or_(ScheduledPost.celery_task_id.is_(None), ScheduledPost.lease_expires_at < datetime.utcnow()))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Post is being published")
     await db.commit()
+    schedule_dispatcher.cancel(scheduled_post_id)
+    schedule_index.remove(current_user.id, scheduled_post_id)
+    calendar_cache.invalidate(current_user.id)
     
     return {"message": "Scheduled post cancelled successfully"}
 
 
-@router.get("/calendar")
-async def get_calendar_view(
-    start_date: datetime,
-    end_date: datetime,
+async def _get_recurring_schedule(db: AsyncSession, user_id: int, recurring_schedule_id: int) -> RecurringSchedule:
+    stmt = select(RecurringSchedule).where(
+        RecurringSchedule.id == recurring_schedule_id,
+        RecurringSchedule.user_id == user_id
+    )
+    result = await db.execute(stmt)
+    recurring_schedule = result.scalar_one_or_none()
+    
+    if not recurring_schedule:
+        raise HTTPException(status_code=404, detail="Recurring schedule not found")
+    
+    return recurring_schedule
+
+
+async def _materialize_now(recurring_schedule_id: int) -> None:
+    """Materialize occurrences that already fall inside the dispatcher's window"""
+    
+    created = await recurrence_service.materialize(
+        datetime.utcnow() + timedelta(seconds=settings.SCHEDULER_LOOKAHEAD_SECONDS),
+        schedule_ids=[recurring_schedule_id]
+    )
+    for scheduled_post_id, scheduled_time in created:
+        schedule_dispatcher.schedule(scheduled_post_id, scheduled_time)
+
+
+@router.post("/recurring", response_model=RecurringScheduleSchema)
+async def create_recurring_schedule(
+    schedule_data: RecurringScheduleCreate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Get calendar view of scheduled posts"""
+    """Publish a copy of a post at every occurrence of an RRULE"""
+    
+    stmt = select(Post.id).where(Post.id == schedule_data.post_id, Post.user_id == current_user.id)
+    if await select_post(db, stmt, schedule_data.post_id) is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    dtstart = to_utc_naive(schedule_data.dtstart)
+    try:
+        parse_rule(schedule_data.rrule, dtstart, schedule_data.timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid recurrence rule: {str(e)}")
+    
+    recurring_schedule = RecurringSchedule(
+        user_id=current_user.id,
+        post_id=schedule_data.post_id,
+        rrule=schedule_data.rrule,
+        dtstart=dtstart,
+        timezone=schedule_data.timezone,
+        anchor_time=dtstart,
+        anchor_index=0,
+        # Occurrences before now are not backfilled
+        materialized_until=datetime.utcnow()
+    )
+    db.add(recurring_schedule)
+    await db.commit()
+    await db.refresh(recurring_schedule)
+    
+    await _materialize_now(recurring_schedule.id)
+    calendar_cache.invalidate(current_user.id)
+    schedule_index.invalidate(current_user.id)
+    
+    return recurring_schedule
+
+
+@router.get("/recurring", response_model=List[RecurringScheduleSchema])
+async def get_recurring_schedules(
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Get user's recurring schedules"""
     
     stmt = (
-        select(ScheduledPost)
-        .where(ScheduledPost.user_id == current_user.id)
+        select(RecurringSchedule)
+        .where(RecurringSchedule.user_id == current_user.id)
+        .order_by(RecurringSchedule.id)
+    )
+    result = await db.execute(stmt)
+    
+    return result.scalars().all()
+
+
+@router.get("/recurring/{recurring_schedule_id}/occurrences", response_model=List[RecurringOccurrence])
+async def get_recurring_occurrences(
+    recurring_schedule_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    limit: int = 100,
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """List occurrences in a date range, materialized or not"""
+    
+    recurring_schedule = await _get_recurring_schedule(db, current_user.id, recurring_schedule_id)
+    start_date = to_utc_naive(start_date)
+    end_date = to_utc_naive(end_date)
+    limit = max(1, min(limit, 1000))
+    
+    stmt = (
+        select(
+            ScheduledPost.id,
+            ScheduledPost.occurrence_time,
+            ScheduledPost.scheduled_time,
+            ScheduledPost.is_posted,
+            Post.content
+        )
+        .join(Post, Post.id == ScheduledPost.post_id)
+        .where(ScheduledPost.recurring_schedule_id == recurring_schedule.id)
         .where(ScheduledPost.scheduled_time >= start_date)
-        .where(ScheduledPost.scheduled_time <= end_date)
+        .where(ScheduledPost.scheduled_time < end_date)
         .order_by(ScheduledPost.scheduled_time)
+        .limit(limit)
     )
     result = await db.execute(stmt)
-    scheduled_posts = result.scalars().all()
+    occurrences = [
+        RecurringOccurrence(
+            occurrence_time=occurrence_time,
+            scheduled_time=scheduled_time,
+            content=content,
+            scheduled_post_id=scheduled_post_id,
+            is_posted=is_posted
+        )
+        for scheduled_post_id, occurrence_time, scheduled_time, is_posted, content in result.all()
+    ]
     
-    # Format for calendar view
-    calendar_events = []
-    for scheduled_post in scheduled_posts:
-        calendar_events.append({
-            "id": scheduled_post.id,
-            "title": scheduled_post.post.topic if scheduled_post.post else "Scheduled Post",
-            "start": scheduled_post.scheduled_time.isoformat(),
-            "platform": scheduled_post.post.platform.value.lower() if (scheduled_post.post and hasattr(scheduled_post.post.platform, 'value')) else (str(scheduled_post.post.platform).lower() if scheduled_post.post else "unknown"),
-            "status": "scheduled" if not scheduled_post.is_posted else "published",
-            "content_preview": scheduled_post.post.content[:100] + "..." if scheduled_post.post and len(scheduled_post.post.content) > 100 else scheduled_post.post.content if scheduled_post.post else ""
-        })
+    if recurring_schedule.is_active:
+        await db.refresh(recurring_schedule, ["post"])
+        lower = max(start_date, to_utc_naive(recurring_schedule.materialized_until))
+        exceptions = await load_exceptions(db, [recurring_schedule.id], lower, end_date)
+        upcoming = sorted(
+            expand(recurring_schedule, lower, end_date, exceptions[recurring_schedule.id]),
+            key=lambda occurrence: occurrence.scheduled_time
+        )
+        occurrences.extend(
+            RecurringOccurrence(
+                occurrence_time=occurrence.occurrence_time,
+                scheduled_time=occurrence.scheduled_time,
+                content=occurrence.content or recurring_schedule.post.content
+            )
+            for occurrence in upcoming[:limit]
+        )
     
-    return {"events": calendar_events}
+    return occurrences[:limit]
 
 
-@router.post("/publish-now/{post_id}")
-async def publish_now(
-    post_id: int,
+@router.delete("/recurring/{recurring_schedule_id}")
+async def delete_recurring_schedule(
+    recurring_schedule_id: int,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Publish a post immediately"""
+    """Stop a recurring schedule and cancel its pending occurrences"""
     
-    # Get the post
-    stmt = select(Post).where(
-        Post.id == post_id,
-        Post.user_id == current_user.id
+    recurring_schedule = await _get_recurring_schedule(db, current_user.id, recurring_schedule_id)
+    recurring_schedule.is_active = False
+    
+    # Pending materialized occurrences (rows claimed by a worker are left alone)
+    now = datetime.utcnow()
+    result = await db.execute(
+        delete(ScheduledPost)
+        .where(ScheduledPost.recurring_schedule_id == recurring_schedule.id)
+        .where(ScheduledPost.is_posted == False)
+        .where(or_(ScheduledPost.celery_task_id.is_(None), ScheduledPost.lease_expires_at < now))
+        .returning(ScheduledPost.id, ScheduledPost.post_id)
+        .execution_options(synchronize_session=False)
     )
-    db_result = await db.execute(stmt)
-    post = db_result.scalar_one_or_none()
+    cancelled = result.all()
+    if cancelled:
+        await db.execute(
+            delete(Post)
+            .where(Post.id.in_([post_id for _, post_id in cancelled]))
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
     
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
+    for scheduled_post_id, _ in cancelled:
+        schedule_dispatcher.cancel(scheduled_post_id)
+    calendar_cache.invalidate(current_user.id)
+    schedule_index.invalidate(current_user.id)
     
-    if post.status.value == "published":
-        raise HTTPException(status_code=400, detail="Post is already published")
+    return {
+        "message": "Recurring schedule stopped",
+        "cancelled_occurrences": len(cancelled)
+    }
+
+
+@router.post("/recurring/{recurring_schedule_id}/exceptions", response_model=RecurrenceExceptionSchema)
+async def create_recurrence_exception(
+    recurring_schedule_id: int,
+    exception_data: RecurrenceExceptionCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Skip or override a single occurrence"""
     
-    try:
-        # Implement actual publishing logic based on platform
-        # Handle both case variations for platform comparison
-        platform_value = post.platform.value.lower() if hasattr(post.platform, 'value') else str(post.platform).lower()
-        
-        if platform_value == "twitter":
-            if not twitter_service.is_available():
-                raise HTTPException(
-                    status_code=503,
-                    detail="Twitter service not available. Please check your API credentials."
-                )
-            
-            # Publish to Twitter/X
-            result = await twitter_service.publish_tweet(post.content)
-            
-            # Update post with platform data
-            post.platform_post_id = result["platform_post_id"]
-            post.status = PostStatus.PUBLISHED
-            post.published_at = datetime.utcnow()
-            
-            await db.commit()
-            await db.refresh(post)
-            
-            return {
-                "message": "Post published successfully to X/Twitter",
-                "post": {
-                    "id": post.id,
-                    "user_id": post.user_id,
-                    "topic": post.topic,
-                    "content": post.content,
-                    "platform": platform_value,
-                    "status": post.status.value,
-                    "platform_post_id": post.platform_post_id,
-                    "likes": post.likes,
-                    "shares": post.shares,
-                    "comments": post.comments,
-                    "impressions": post.impressions,
-                    "created_at": post.created_at.isoformat() if post.created_at else None,
-                    "published_at": post.published_at.isoformat() if post.published_at else None,
-                    "updated_at": post.updated_at.isoformat() if post.updated_at else None,
-                    "research_data": post.research_data
-                },
-                "platform_data": {
-                    "url": result["url"],
-                    "platform_post_id": result["platform_post_id"]
-                }
-            }
-            
-        elif platform_value == "linkedin":
-            # LinkedIn publishing not implemented yet
-            raise HTTPException(
-                status_code=501,
-                detail="LinkedIn publishing not implemented yet. Please copy and paste manually."
-            )
-            
+    recurring_schedule = await _get_recurring_schedule(db, current_user.id, recurring_schedule_id)
+    occurrence_time = to_utc_naive(exception_data.occurrence_time)
+    override_time = to_utc_naive(exception_data.override_time) if exception_data.override_time else None
+    
+    if not exception_data.skip and override_time is None and exception_data.override_content is None:
+        raise HTTPException(status_code=400, detail="Nothing to change: skip or give an override")
+    if override_time is not None and override_time <= datetime.utcnow():
+        raise HTTPException(status_code=400, detail="Override time must be in the future")
+    
+    # Occurrence that is already a ScheduledPost row
+    stmt = (
+        select(ScheduledPost)
+        .where(ScheduledPost.recurring_schedule_id == recurring_schedule.id)
+        .where(ScheduledPost.occurrence_time == occurrence_time)
+    )
+    result = await db.execute(stmt)
+    scheduled_post = result.scalar_one_or_none()
+    if scheduled_post is not None:
+        await attach_posts(db, [scheduled_post])
+    
+    if scheduled_post is None and not is_occurrence(recurring_schedule, occurrence_time):
+        raise HTTPException(status_code=400, detail="Not an upcoming occurrence of this schedule")
+    if scheduled_post is not None and (scheduled_post.is_posted or scheduled_post.celery_task_id):
+        raise HTTPException(status_code=400, detail="Occurrence has already been published")
+    
+    stmt = select(RecurrenceException).where(
+        RecurrenceException.recurring_schedule_id == recurring_schedule.id,
+        RecurrenceException.occurrence_time == occurrence_time
+    )
+    result = await db.execute(stmt)
+    exception = result.scalar_one_or_none()
+    if exception is None:
+        exception = RecurrenceException(
+            recurring_schedule_id=recurring_schedule.id,
+            occurrence_time=occurrence_time
+        )
+        db.add(exception)
+    exception.is_skipped = exception_data.skip
+    exception.override_time = override_time
+    exception.override_content = exception_data.override_content
+    
+    # Apply directly to an occurrence that is already materialized
+    if scheduled_post is not None:
+        if exception_data.skip:
+            await db.delete(scheduled_post)
+            await db.delete(scheduled_post.post)
         else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Publishing not supported for platform: {platform_value}"
+            scheduled_post.scheduled_time = override_time or occurrence_time
+            if exception_data.override_content is not None:
+                scheduled_post.post.content = exception_data.override_content
+    elif (
+        not exception_data.skip
+        and override_time is not None
+        and override_time < to_utc_naive(recurring_schedule.materialized_until)
+    ):
+        # Moved into the window that is already materialized: create its row now
+        template = await select_post(
+            db,
+            select(Post).where(Post.id == recurring_schedule.post_id).options(undefer(Post.research_data)),
+            recurring_schedule.post_id
+        )
+        scheduled_post = ScheduledPost(
+            post=Post(
+                user_id=current_user.id,
+                topic=template.topic,
+                content=exception_data.override_content or template.content,
+                platform=template.platform,
+                research_data=template.research_data,
+                status=PostStatus.SCHEDULED
+            ),
+            user_id=current_user.id,
+            scheduled_time=override_time,
+            recurring_schedule_id=recurring_schedule.id,
+            occurrence_time=occurrence_time
+        )
+        db.add(scheduled_post)
+    
+    await db.commit()
+    await db.refresh(exception)
+    
+    if scheduled_post is not None:
+        if exception_data.skip:
+            schedule_dispatcher.cancel(scheduled_post.id)
+        else:
+            schedule_dispatcher.schedule(scheduled_post.id, scheduled_post.scheduled_time)
+    calendar_cache.invalidate(current_user.id)
+    schedule_index.invalidate(current_user.id)
+    
+    return exception
+
+
+@router.get("/workers/stats")
+async def get_worker_stats(
+    current_user: User = Depends(get_current_active_superuser)
+) -> Any:
+    """Get throughput and claim latency for publish workers in this process"""
+    
+    return {"workers": [worker.stats.to_dict() for worker in local_workers]}
+
+
+@router.get("/best-times", response_model=BestTimesResponse)
+async def get_best_times(
+    platform: Platform,
+    limit: int = 5,
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Suggest the best hours of the week to post, based on past engagement"""
+    
+    return await best_time_service.recommend(
+        db, current_user.id, platform.value, limit=max(1, min(limit, 168))
+    )
+
+
+@router.get("/calendar")
+async def get_calendar_view(
+    start_date: datetime,
+    end_date: datetime,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """Get calendar view of scheduled posts"""
+    
+    cached = calendar_cache.get(current_user.id, start_date, end_date)
+    
+    if cached is None:
+        # One joined query projecting only the calendar fields; preview truncated in SQL
+        content_preview = case(
+            (
+                func.length(Post.content) > CALENDAR_PREVIEW_LENGTH,
+                func.substr(Post.content, 1, CALENDAR_PREVIEW_LENGTH, type_=Text) + "..."
+            ),
+            else_=Post.content
+        )
+        stmt = (
+            select(
+                ScheduledPost.id,
+                ScheduledPost.scheduled_time,
+                ScheduledPost.is_posted,
+                Post.topic,
+                Post.platform,
+                content_preview
             )
-            
+            .outerjoin(Post, Post.id == ScheduledPost.post_id)
+            .where(ScheduledPost.user_id == current_user.id)
+            .where(ScheduledPost.scheduled_time >= start_date)
+            .where(ScheduledPost.scheduled_time <= end_date)
+            .order_by(ScheduledPost.scheduled_time)
+        )
+        result = await db.execute(stmt)
+        
+        # Format for calendar view
+        calendar_events = []
+        for scheduled_post_id, scheduled_time, is_posted, topic, platform, preview in result.all():
+            calendar_events.append({
+                "id": scheduled_post_id,
+                "title": topic or "Scheduled Post",
+                "start": scheduled_time.isoformat(),
+                "platform": platform.value.lower() if platform is not None else "unknown",
+                "status": "scheduled" if not is_posted else "published",
+                "content_preview": preview or ""
+            })
+        
+        # Upcoming recurring occurrences that are not materialized yet
+        for recurring_schedule, occurrence in await recurrence_service.preview(
+            db, current_user.id, start_date, end_date + timedelta(microseconds=1)
+        ):
+            template = recurring_schedule.post
+            content = occurrence.content or template.content
+            if len(content) > CALENDAR_PREVIEW_LENGTH:
+                content = content[:CALENDAR_PREVIEW_LENGTH] + "..."
+            calendar_events.append({
+                "id": f"recurring-{recurring_schedule.id}-{occurrence.occurrence_time.isoformat()}",
+                "title": template.topic or "Scheduled Post",
+                "start": occurrence.scheduled_time.isoformat(),
+                "platform": template.platform.value.lower(),
+                "status": "recurring",
+                "content_preview": content,
+                "recurring_schedule_id": recurring_schedule.id,
+                "occurrence_time": occurrence.occurrence_time.isoformat()
+            })
+        calendar_events.sort(key=lambda event: event["start"])
+        
+        payload = {"events": calendar_events}
+        etag = calendar_cache.set(current_user.id, start_date, end_date, payload)
+    else:
+        etag, payload = cached
+    
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(content=payload, headers=headers)
+
+
+def _serialize_post(post: Post) -> Dict[str, Any]:
+    """Serialize a post for publish responses"""
+    return {
+        "id": post.id,
+        "user_id": post.user_id,
+        "topic": post.topic,
+        "content": post.content,
+        "platform": post.platform.value.lower() if hasattr(post.platform, 'value') else str(post.platform).lower(),
+        "status": post.status.value,
+        "platform_post_id": post.platform_post_id,
+        "likes": post.likes,
+        "shares": post.shares,
+        "comments": post.comments,
+        "impressions": post.impressions,
+        "created_at": post.created_at.isoformat() if post.created_at else None,
+        "published_at": post.published_at.isoformat() if post.published_at else None,
+        "updated_at": post.updated_at.isoformat() if post.updated_at else None,
+        "research_data": post.research_data
+    }
+
+
+def _mark_published(post: Post, result: Dict[str, Any]) -> None:
+    """Update post with platform data after a successful publish"""
+    post.platform_post_id = result["platform_post_id"]
+    post.status = PostStatus.PUBLISHED
+    post.published_at = datetime.utcnow()
+
+
+async def _record_outcomes(db: AsyncSession, outcomes: List[Tuple[Post, Optional[Dict[str, Any]]]]) -> None:
+    """Save publish outcomes (platform result, or None if it failed) and count published posts.
+
+    The posts are live on their platforms by now, so if the slot stats
+    cannot be updated the statuses are still saved on their own.
+    """
+    def apply() -> None:
+        for post, result in outcomes:
+            if result is not None:
+                _mark_published(post, result)
+            else:
+                post.status = PostStatus.FAILED
+    
+    apply()
+    try:
+        with span("db.commit"):
+            await best_time_service.record_published(db, [post for post, result in outcomes if result is not None])
+            await db.commit()
+    except SQLAlchemyError:
+        logger.exception(
+            "Recording published posts failed, saving their status only",
+            extra={"post_ids": [post.id for post, _ in outcomes]}
+        )
+        await db.rollback()
+        apply()
+        await db.commit()
+
+
+async def _publish_post(
+    post: Post,
+    publisher: Publisher,
+    db: AsyncSession,
+    message: str,
+    error_prefix: str
+) -> Dict[str, Any]:
+    """Publish a post through a publisher and build the API response"""
+    
+    try:
+        result = await publish_dispatcher.publish(publisher, post.content)
     except Exception as e:
         # Update post status to failed
         post.status = PostStatus.FAILED
@@ -254,11 +937,67 @@ async def publish_now(
         # Re-raise the exception with more context
         if isinstance(e, HTTPException):
             raise e
+        elif isinstance(e, PublishError):
+            raise HTTPException(status_code=e.status_code, detail=str(e))
         else:
             raise HTTPException(
                 status_code=500,
-                detail=f"Publishing failed: {str(e)}"
+                detail=f"{error_prefix}: {str(e)}"
             )
+    
+    # The post is live from here on: bookkeeping errors must not mark it failed
+    await _record_outcomes(db, [(post, result)])
+    await db.refresh(post, POST_ATTRIBUTES)
+    
+    return {
+        "message": f"{message} to {publisher.display_name}",
+        "post": _serialize_post(post),
+        "platform_data": {
+            "url": result["url"],
+            "platform_post_id": result["platform_post_id"]
+        }
+    }
+
+
+def _get_publisher_or_400(platform_value: str, user: User) -> Publisher:
+    try:
+        return get_publisher(platform_value, user)
+    except PublishError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/publish-now/{post_id}")
+async def publish_now(
+    post_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Publish a post immediately"""
+    
+    # Get the post
+    stmt = select(Post).where(
+        Post.id == post_id,
+        Post.user_id == current_user.id
+    ).options(undefer(Post.research_data))
+    post = await select_post(db, stmt, post_id)
+    
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    if post.status.value == "published":
+        raise HTTPException(status_code=400, detail="Post is already published")
+    
+    # Handle both case variations for platform comparison
+    platform_value = post.platform.value.lower() if hasattr(post.platform, 'value') else str(post.platform).lower()
+    publisher = _get_publisher_or_400(platform_value, current_user)
+    
+    return await _publish_post(
+        post,
+        publisher,
+        db,
+        message="Post published successfully",
+        error_prefix="Publishing failed"
+    )
 
 
 @router.post("/quick-post")
@@ -271,6 +1010,7 @@ async def quick_post(
     
     # Convert platform string to enum
     platform_enum = PlatformEnum[post_data.platform.upper()]
+    publisher = _get_publisher_or_400(platform_enum.value, current_user)
     
     # Create the post
     db_post = Post(
@@ -282,79 +1022,85 @@ async def quick_post(
     )
     
     db.add(db_post)
-    await db.commit()
-    await db.refresh(db_post)
+    with span("db.commit"):
+        await db.commit()
+    await db.refresh(db_post, POST_ATTRIBUTES)
+    
+    # Immediately publish the post
+    return await _publish_post(
+        db_post,
+        publisher,
+        db,
+        message="Post created and published successfully",
+        error_prefix="Quick post failed"
+    )
+
+
+@router.post("/cross-post")
+async def cross_post(
+    request: CrossPostRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Publish the same content to the user's account on each of the given platforms concurrently.
+    
+    Each platform has one account per user: LinkedIn uses the user's own
+    token and X the app-level credentials. Several brand accounts on the
+    same platform are not supported.
+    """
     
     try:
-        # Immediately publish the post
-        platform_value = platform_enum.value.lower()
-        
-        if platform_value == "twitter":
-            if not twitter_service.is_available():
-                raise HTTPException(
-                    status_code=503,
-                    detail="Twitter service not available. Please check your API credentials."
-                )
-            
-            # Publish to Twitter/X
-            publish_result = await twitter_service.publish_tweet(db_post.content)
-            
-            # Update post with platform data
-            db_post.platform_post_id = publish_result["platform_post_id"]
-            db_post.status = PostStatus.PUBLISHED
-            db_post.published_at = datetime.utcnow()
-            
-            await db.commit()
-            await db.refresh(db_post)
-            
-            return {
-                "message": "Post created and published successfully to X/Twitter",
-                "post": {
-                    "id": db_post.id,
-                    "user_id": db_post.user_id,
-                    "topic": db_post.topic,
-                    "content": db_post.content,
-                    "platform": platform_value,
-                    "status": db_post.status.value,
-                    "platform_post_id": db_post.platform_post_id,
-                    "likes": db_post.likes,
-                    "shares": db_post.shares,
-                    "comments": db_post.comments,
-                    "impressions": db_post.impressions,
-                    "created_at": db_post.created_at.isoformat() if db_post.created_at else None,
-                    "published_at": db_post.published_at.isoformat() if db_post.published_at else None,
-                    "updated_at": db_post.updated_at.isoformat() if db_post.updated_at else None,
-                    "research_data": db_post.research_data
-                },
-                "platform_data": {
-                    "url": publish_result["url"],
-                    "platform_post_id": publish_result["platform_post_id"]
-                }
-            }
-            
-        elif platform_value == "linkedin":
-            # LinkedIn publishing not implemented yet
-            raise HTTPException(
-                status_code=501,
-                detail="LinkedIn publishing not implemented yet. Please copy and paste manually."
-            )
-            
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Publishing not supported for platform: {platform_value}"
-            )
-            
-    except Exception as e:
-        # Update post status to failed
-        db_post.status = PostStatus.FAILED
+        publishers = get_connected_publishers(
+            current_user, [platform.value for platform in request.platforms]
+        )
+    except PublishError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    # One post row per target account
+    db_posts = [
+        Post(
+            user_id=current_user.id,
+            topic=request.topic,
+            content=request.content,
+            platform=PlatformEnum[publisher.platform.upper()],
+            research_data=request.research_data
+        )
+        for publisher in publishers
+    ]
+    db.add_all(db_posts)
+    with span("db.commit"):
         await db.commit()
-        
-        # Re-raise the exception with more context
-        if isinstance(e, HTTPException):
-            raise e
+    
+    outcomes = await publish_dispatcher.fan_out(
+        [(publisher, request.content) for publisher in publishers]
+    )
+    
+    # Record every outcome in a single commit
+    await _record_outcomes(db, [
+        (db_post, outcome if outcome["success"] else None) for db_post, outcome in zip(db_posts, outcomes)
+    ])
+    
+    results = []
+    for db_post, outcome in zip(db_posts, outcomes):
+        await db.refresh(db_post, POST_ATTRIBUTES)
+        result = {
+            "platform": outcome["platform"],
+            "account_id": outcome["account_id"],
+            "success": outcome["success"],
+            "post": _serialize_post(db_post)
+        }
+        if outcome["success"]:
+            result["platform_data"] = {
+                "url": outcome["url"],
+                "platform_post_id": outcome["platform_post_id"]
+            }
         else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Quick post failed: {str(e)}"
-            )
\ No newline at end of file
+            result["error"] = outcome["error"]
+        results.append(result)
+    
+    published_count = sum(1 for outcome in outcomes if outcome["success"])
+    
+    return {
+        "message": f"Published to {published_count} of {len(outcomes)} accounts",
+        "results": results
+    }
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import validator
 
@@ -13,11 +13,56 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # Authenticated users cached per process (0 disables)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_INVALIDATION: str = "local"  # "local" (other workers catch up within the TTL) or "redis" (broadcast, uses REDIS_URL)
+    BCRYPT_ROUNDS: int = 12  # Cost factor for new hashes (each +1 doubles the CPU time)
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Threads hashing passwords (default: CPU count)
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Logins/registrations beyond this get a 503
     
     # Database
     DATABASE_URL: str
+    DB_PROFILE: str = "dev"  # Engine profile: "dev", "prod" or "bench" (see app/models/database.py)
+    DB_ECHO: bool = False  # Log every SQL statement (at INFO, through the logging queue)
+    
+    # Optional read replica for read-only routes
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0  # Users read from the primary this long after a write
+    DB_REPLICA_RETRY_SECONDS: float = 30.0  # Wait before retrying an unreachable replica
+    
+    # Optional overrides of the profile's pool settings
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT_SECONDS: Optional[float] = None
+    DB_POOL_RECYCLE_SECONDS: Optional[int] = None
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None  # asyncpg prepared statements per connection (0 behind pgbouncer)
+    
+    # Statements slower than this are logged with their route (0 disables)
+    DB_SLOW_QUERY_MS: float = 250.0
+    
+    # SQLite high-concurrency mode (WAL, a single in-process writer, group commits)
+    SQLITE_HIGH_CONCURRENCY: bool = False  # Opt in: WAL + one in-process writer (not on network filesystems)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for the write lock before failing
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_GROUP_COMMIT_MAX_BATCH: int = 64  # Queued write transactions committed together
+    SQLITE_GROUP_COMMIT_WAIT_MS: float = 2.0  # Let concurrent writes join a commit
+    
+    # Logging (JSON lines written by a background thread; see app/core/log.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text" (readable, for development)
+    LOG_LEVELS: Dict[str, str] = {"httpx": "WARNING"}  # Per logger, e.g. {"app.services.scheduler": "DEBUG", "uvicorn.access": "WARNING"}
+    LOG_SAMPLE_RATES: Dict[str, float] = {"app.core.rate_limit": 0.1}  # Share of records below WARNING kept, per logger
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped rather than blocking requests
+    
+    # Tracing (per-request stage timings; see app/core/tracing.py)
+    TRACING_ENABLED: bool = True
+    TRACE_SERVER_TIMING: bool = True  # Return stage timings in a Server-Timing header
+    TRACE_EXPORTER: str = "none"  # "none", "file" (OTLP/JSON lines) or "otlp" (OTLP/HTTP JSON to a collector)
+    TRACE_EXPORT_FILE: str = "traces.jsonl"
+    TRACE_EXPORT_URL: str = "http://localhost:4318/v1/traces"
+    TRACE_SAMPLE_RATE: float = 1.0  # Share of traces exported (a caller's traceparent decides for its requests)
+    TRACE_QUEUE_SIZE: int = 2048  # Finished traces waiting for export; more are dropped
     
-    # Redis
     REDIS_URL: str = "redis://localhost:6379"
     
     # CORS
@@ -57,6 +102,69 @@ class Settings(BaseSettings):
     
     LINKEDIN_CLIENT_ID: Optional[str] = None
     LINKEDIN_CLIENT_SECRET: Optional[str] = None
+    LINKEDIN_API_BASE_URL: str = "https://api.linkedin.com/v2"
+
+    # Outbound HTTP (shared pooled client)
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_GET_RETRIES: int = 2
+
+    # Platform credential validation cache
+    CREDENTIAL_VALIDATION_TTL_SECONDS: int = 600
+    CREDENTIAL_VALIDATION_TIMEOUT_SECONDS: float = 10.0
+
+    # Scheduled publishing
+    # "dispatcher": in-process heap that fires posts at their scheduled_time
+    # "worker": poll and claim due rows in batches (run many replicas safely)
+    # "off": this process does not publish (e.g. a dedicated worker runs
+    #        python -m app.services.publish_worker)
+    SCHEDULER_MODE: str = "dispatcher"
+    SCHEDULER_LOOKAHEAD_SECONDS: int = 3600
+    SCHEDULER_BATCH_SIZE: int = 50
+    
+    PUBLISH_WORKER_BATCH_SIZE: int = 50
+    PUBLISH_WORKER_LEASE_SECONDS: int = 300
+    PUBLISH_WORKER_POLL_INTERVAL_SECONDS: float = 5.0
+    PUBLISH_WORKER_STATS_INTERVAL_SECONDS: float = 60.0
+    PUBLISH_MAX_ATTEMPTS: int = 5
+    PUBLISH_RETRY_BACKOFF_SECONDS: float = 30.0
+    PUBLISH_RATE_LIMIT_BURST: int = 10
+    
+    # Calendar view cache
+    CALENDAR_CACHE_TTL_SECONDS: int = 60
+    CALENDAR_CACHE_MAX_ENTRIES: int = 5000
+    
+    # Collision checks when scheduling (per user and platform)
+    SCHEDULE_MIN_SPACING_MINUTES: int = 10
+    SCHEDULE_MAX_POSTS_PER_HOUR: int = 6
+    SCHEDULE_INDEX_TTL_SECONDS: int = 300
+    SCHEDULE_INDEX_MAX_USERS: int = 10000
+    
+    # Best time to post recommendations
+    BEST_TIME_HALF_LIFE_DAYS: float = 30.0  # Engagement weight halves every N days
+    BEST_TIME_PRIOR_POSTS: float = 3.0  # Shrink sparse hours towards the user's average
+    
+    # Engagement history retention tiers
+    ENGAGEMENT_RAW_RETENTION_HOURS: int = 48  # Then folded into hourly rollups
+    ENGAGEMENT_HOURLY_RETENTION_DAYS: int = 30  # Then folded into daily rollups
+    ENGAGEMENT_COMPACT_INTERVAL_SECONDS: int = 3600
+    ENGAGEMENT_COMPACT_BATCH_SIZE: int = 5000
+    
+    # Monthly partitioning of posts and engagement rollups (PostgreSQL, opt-in:
+    # `python -m app.services.partitioning enable`)
+    PARTITION_PREMAKE_MONTHS: int = 3  # Partitions created ahead of time
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 21600
+    PARTITION_ARCHIVE_AFTER_MONTHS: int = 12  # Older partitions move to cold storage (0 disables)
+    PARTITION_ARCHIVE_TABLESPACE: Optional[str] = None  # e.g. a tablespace on cheaper, compressed disks (stays writable)
+    
+    # Content templates (filled locally, without an AI call)
+    TEMPLATE_CACHE_SIZE: int = 1000  # Compiled templates kept in memory
+    TEMPLATE_USAGE_FLUSH_SECONDS: float = 30.0  # Usage counts are written in batches
+    TEMPLATE_USAGE_FLUSH_THRESHOLD: int = 500  # Or sooner once this many uses are pending
+    RESEARCH_CACHE_TTL_SECONDS: float = 3600.0  # Research kept for template generation, which never calls Perplexity
     
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
@@ -66,8 +174,12 @@ class Settings(BaseSettings):
     CLAUDE_MODEL: str = "claude-4-sonnet-20250514"
     PERPLEXITY_MODEL: str = "llama-3.1-sonar-large-128k-online"
     
-    # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = 60
+    # Rate limiting (sliding windows in cost units; see ROUTE_COSTS in app/core/rate_limit.py)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60  # Per user (a content generation costs 10)
+    RATE_LIMIT_PER_IP_PER_MINUTE: int = 300  # Per client address, signed in or not
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared by workers, uses REDIS_URL)
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, int] = {}  # Overrides, e.g. {"POST /api/content/generate": 20}
     
     class Config:
         env_file = ".env"
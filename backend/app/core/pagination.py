@@ -0,0 +1,96 @@
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import datetime
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Select, String, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+async def keyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    key_columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    descending: bool = False,
+    scalars: bool = True
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of `stmt` ordered by `key_columns` (the last must be unique).
+
+    With a cursor the page starts right after the row it was taken from, using
+    a row value comparison that an index on the key columns can seek to, so
+    deep pages cost the same as the first. `skip` is an OFFSET for clients
+    that have not moved to cursors yet. Returns (items, next_cursor), where
+    items are the first selected entity of each row (or, with scalars=False,
+    dicts of the selected columns); next_cursor is None on the last page.
+    """
+
+    # SQLite stores timestamps as text in whichever format they were written
+    # with (CURRENT_TIMESTAMP has no fraction, SQLAlchemy adds one), so keys are
+    # compared and round-tripped as the stored text to keep ties exact.
+    sqlite = db.bind.dialect.name == "sqlite"
+    keys = [
+        type_coerce(column, String) if sqlite and isinstance(column.type, DateTime) else column
+        for column in key_columns
+    ]
+    labels = [key.label(f"_key_{i}") for i, key in enumerate(keys)]
+    stmt = stmt.add_columns(*labels)
+
+    if cursor is not None:
+        values = decode_cursor(cursor, len(keys))
+        if not sqlite:
+            values = [
+                datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value is not None else value
+                for column, value in zip(key_columns, values)
+            ]
+        row_key = tuple_(*keys)
+        stmt = stmt.where(row_key < tuple_(*values) if descending else row_key > tuple_(*values))
+        if values[0] is not None:
+            # Row comparisons are not used for partition pruning; a plain bound on the leading key is
+            stmt = stmt.where(keys[0] <= values[0] if descending else keys[0] >= values[0])
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    stmt = stmt.order_by(*order).limit(limit + 1)
+
+    rows = (await db.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, label.name) for label in labels])
+
+    if scalars:
+        return [row[0] for row in rows], next_cursor
+
+    key_names = {label.name for label in labels}
+    items = [
+        {name: value for name, value in row._mapping.items() if name not in key_names}
+        for row in rows
+    ]
+    return items, next_cursor
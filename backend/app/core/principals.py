@@ -0,0 +1,184 @@
+from typing import Iterable, Optional, Set
+import asyncio
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.database import PrimarySession
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+USER_COLUMNS = [column.key for column in User.__table__.columns]
+ALL_USERS = "*"
+
+
+class RedisInvalidations:
+    """Broadcasts principal cache invalidations to every process over Redis pub/sub"""
+
+    channel = "principal-cache-invalidations"
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis  # Only loaded when this channel is configured
+
+        self._redis = aioredis.from_url(url, socket_connect_timeout=0.5)
+        self._sends: Set[asyncio.Task] = set()
+
+    def publish(self, messages: Iterable[str]) -> None:
+        """Send from synchronous session events (delivery happens on the running loop)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(list(messages)))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _publish(self, messages) -> None:
+        try:
+            for message in messages:
+                await self._redis.publish(self.channel, message)
+        except Exception as e:
+            logger.warning("Principal cache invalidation not broadcast", extra={"error": str(e)})
+
+    async def listen(self, cache: "PrincipalCache") -> None:
+        """Apply other processes' invalidations; the cache is bypassed while disconnected"""
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Invalidations sent while unsubscribed were missed: start empty
+                    cache.invalidate()
+                    cache.connected = True
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            data = message["data"].decode()
+                            cache.invalidate(None if data == ALL_USERS else int(data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Principal cache invalidation channel lost, retrying", extra={"error": str(e)})
+            cache.connected = False
+            await asyncio.sleep(1)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class PrincipalCache:
+    """Authenticated users by id, so requests skip the per-request user SELECT.
+
+    Entries are column snapshots: every request gets its own User instance,
+    attached to its session without a query, so routes can still change and
+    commit it. A cached user only serves tokens carrying its token_version,
+    which password changes and sign-outs bump. Commits that change users
+    drop their entries in this process. Other processes see the change
+    within PRINCIPAL_CACHE_TTL_SECONDS, or at once with the Redis channel.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, channel: Optional[RedisInvalidations] = None):
+        self._cache = TTLCache(ttl_seconds, max_entries=max_entries)
+        self._invalidations = 0
+        self.channel = channel
+        self.connected = channel is None
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.ttl_seconds > 0 and self.connected
+
+    def get(self, user_id: int, token_version: int) -> Optional[User]:
+        values = self._cache.get(user_id) if self.enabled else None
+        if values is None or values["token_version"] != token_version:
+            return None
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def generation(self) -> int:
+        """Taken before loading a user; set() ignores users loaded before an invalidation"""
+        return self._invalidations
+
+    def set(self, user: User, generation: int) -> None:
+        if self.enabled and generation == self._invalidations:
+            self._cache.set(user.id, {key: getattr(user, key) for key in USER_COLUMNS})
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Forget one user, or everyone"""
+        self._invalidations += 1
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(user_id)
+
+    def changed(self, user_ids: Iterable[int], all_users: bool = False) -> None:
+        """Users were committed: forget them here and in the other processes"""
+        if all_users:
+            self.invalidate()
+            messages = [ALL_USERS]
+        else:
+            messages = []
+            for user_id in user_ids:
+                self.invalidate(user_id)
+                messages.append(str(user_id))
+
+        if messages and self.channel is not None:
+            self.channel.publish(messages)
+
+    async def start(self) -> None:
+        if self.channel is not None and self._listener is None:
+            self._listener = asyncio.create_task(self.channel.listen(self))
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.channel is not None:
+            await self.channel.close()
+
+
+# Singleton instance
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    channel=RedisInvalidations(settings.REDIS_URL) if settings.PRINCIPAL_CACHE_INVALIDATION == "redis" else None
+)
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _users_flushed(session, flush_context):
+    changed = session.info.setdefault("changed_users", set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User) and instance.id is not None:
+            changed.add(instance.id)
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _users_executed(orm_execute_state):
+    # Bulk UPDATE/DELETE of users bypass the flush
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        mapper.class_ is User for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info["changed_all_users"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _users_committed(session):
+    principal_cache.changed(
+        session.info.pop("changed_users", ()),
+        all_users=session.info.pop("changed_all_users", False)
+    )
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _users_rolled_back(session):
+    session.info.pop("changed_all_users", None)
+    session.info.pop("changed_users", None)
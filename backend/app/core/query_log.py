@@ -0,0 +1,148 @@
+from typing import Any, Optional
+from contextvars import ContextVar
+import logging
+import re
+import time
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.log import request_id
+
+logger = logging.getLogger(__name__)
+
+# ASGI scope of the request being handled (None in background tasks)
+current_request: ContextVar[Optional[dict]] = ContextVar("current_request", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_MAX_STATEMENT_CHARS = 500
+_MAX_LISTED_PARAMS = 8
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware that makes the current request visible to DB event hooks and logs.
+
+    Each request gets a correlation id: the caller's X-Request-ID if it is a
+    plausible one, otherwise a new one. It is stamped on every log record
+    written while handling the request and returned in X-Request-ID.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next((value for name, value in scope["headers"] if name == b"x-request-id"), b"")
+        incoming = incoming.decode("latin-1")
+        correlation_id = incoming if _REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", correlation_id.encode())]
+            await send(message)
+
+        token = current_request.set(scope)
+        id_token = request_id.set(correlation_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(id_token)
+            current_request.reset(token)
+
+
+def current_route() -> str:
+    """Describe where the current statement comes from"""
+    scope = current_request.get()
+    if scope is None:
+        return "background"
+
+    route = f"{scope.get('method', '')} {scope.get('path', '')}"
+    # The router adds the matched endpoint to the scope
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        route += f" ({getattr(endpoint, '__name__', endpoint)})"
+    return route
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types (not values) of a statement's parameters, to keep secrets out of logs"""
+
+    if executemany:
+        rows = len(parameters)
+        return f"{rows} x {parameters_shape(parameters[0]) if rows else '()'}"
+
+    if isinstance(parameters, dict):
+        items = [f"{key}: {type(value).__name__}" for key, value in parameters.items()]
+        opening, closing = "{", "}"
+    elif isinstance(parameters, (list, tuple)):
+        items = [type(value).__name__ for value in parameters]
+        opening, closing = "(", ")"
+    else:
+        return type(parameters).__name__
+
+    if len(items) > _MAX_LISTED_PARAMS:
+        return f"{opening}{len(items)} params{closing}"
+    return opening + ", ".join(items) + closing
+
+
+class SlowQueryLog:
+    """Times every statement on an engine and logs the ones above a threshold.
+
+    Timing uses the cursor execute events, so it measures the round trip to
+    the database (not ORM processing). Statements are logged with the shape of
+    their parameters and the route that issued them.
+    """
+
+    def __init__(self, threshold_ms: float):
+        self.threshold_ms = threshold_ms
+        self.slow_queries = 0
+
+    def install(self, engine: Engine) -> None:
+        if self.threshold_ms <= 0:
+            return
+
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    def _on_error(self, exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_times"):
+            connection.info["query_start_times"].pop()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        start_times = conn.info.get("query_start_times")
+        if not start_times:
+            return
+
+        duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        self.slow_queries += 1
+        statement = _WHITESPACE.sub(" ", statement).strip()
+        if len(statement) > _MAX_STATEMENT_CHARS:
+            statement = statement[:_MAX_STATEMENT_CHARS] + "..."
+
+        logger.warning(
+            "Slow query",
+            extra={
+                "duration_ms": round(duration_ms, 1),
+                "route": current_route(),
+                "statement": statement,
+                "params": parameters_shape(parameters, executemany),
+            }
+        )
+
+
+# Singleton instance
+slow_query_log = SlowQueryLog(threshold_ms=settings.DB_SLOW_QUERY_MS)
@@ -0,0 +1,323 @@
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+import json
+import logging
+import math
+import re
+import time
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+# Requests cost 1 unit unless listed here (RATE_LIMIT_ROUTE_COSTS overrides).
+# Routes that call AI providers or social platforms cost the most.
+ROUTE_COSTS: Dict[str, int] = {
+    "POST /api/content/generate": 10,
+    "POST /api/content/variations": 10,
+    "POST /api/content/research": 10,
+    "GET /api/content/trending-topics": 5,
+    "POST /api/content/posts/{post_id}/refresh-metrics": 3,
+    "POST /api/auth/login": 5,  # bcrypt
+    "POST /api/auth/register": 5,
+    "POST /api/schedule/publish-now/{post_id}": 5,
+    "POST /api/schedule/quick-post": 5,
+    "POST /api/schedule/cross-post": 5,
+    "POST /api/schedule/bulk": 5,
+    "POST /api/platforms/test-connection/{platform}": 5,
+    "GET /health": 0,
+    "GET /": 0,
+}
+
+# Atomically: check every key, then count the request against all of them
+# only if none would go over its limit. KEYS: (current window, previous
+# window) per key. ARGV: previous window weight, cost, expiry, then one limit
+# per key. Returns allowed (0/1), units used and the previous count per key.
+_SLIDING_WINDOW_SCRIPT = """
+local weight = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local checks = {}
+local admit = true
+for i = 1, #KEYS, 2 do
+    local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[i + 1]) or '0')
+    local used = previous * weight + current
+    local allowed = used + cost <= tonumber(ARGV[4 + (i - 1) / 2])
+    admit = admit and allowed
+    table.insert(checks, {allowed, used, previous})
+end
+local results = {}
+for n, check in ipairs(checks) do
+    local used = check[2]
+    if admit then
+        redis.call('INCRBY', KEYS[2 * n - 1], cost)
+        redis.call('EXPIRE', KEYS[2 * n - 1], ARGV[3])
+        used = used + cost
+    end
+    table.insert(results, check[1] and 1 or 0)
+    table.insert(results, tostring(used))
+    table.insert(results, check[3])
+end
+return results
+"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int  # Until the current window ends
+    retry_after: int  # Until the request would be allowed (0 if it was)
+
+
+class MemoryBackend:
+    """Sliding window counters in this process (single node)"""
+
+    def __init__(self, max_keys: int = 100000):
+        self._windows = TTLCache(ttl_seconds=3600, max_entries=max_keys)
+
+    async def hit(
+        self, checks: List[Tuple[str, int]], cost: int, window_seconds: int, now: float
+    ) -> List[Tuple[bool, float, int]]:
+        window = int(now // window_seconds)
+        weight = 1 - (now % window_seconds) / window_seconds
+
+        states = []
+        for key, limit in checks:
+            start, current, previous = self._windows.get(key) or (window, 0, 0)
+            if start != window:
+                # Roll over: the old current window becomes the previous one
+                previous = current if start == window - 1 else 0
+                current = 0
+            used = previous * weight + current
+            states.append((key, current, previous, used, used + cost <= limit))
+
+        # All or nothing: a request one key rejects is not charged to the others
+        admit = all(allowed for *_, allowed in states)
+        results = []
+        for key, current, previous, used, allowed in states:
+            if admit:
+                current += cost
+                used += cost
+            self._windows.set(key, (window, current, previous), ttl_seconds=2 * window_seconds)
+            results.append((allowed, used, previous))
+        return results
+
+
+class RedisBackend:
+    """Sliding window counters in Redis, shared by every worker"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis  # Only loaded when this backend is configured
+
+        self._redis = aioredis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._script = self._redis.register_script(_SLIDING_WINDOW_SCRIPT)
+
+    async def hit(
+        self, checks: List[Tuple[str, int]], cost: int, window_seconds: int, now: float
+    ) -> List[Tuple[bool, float, int]]:
+        window = int(now // window_seconds)
+        weight = 1 - (now % window_seconds) / window_seconds
+
+        keys = []
+        for key, _ in checks:
+            keys += [f"ratelimit:{key}:{window}", f"ratelimit:{key}:{window - 1}"]
+        reply = await self._script(
+            keys=keys,
+            args=[weight, cost, 2 * window_seconds, *[limit for _, limit in checks]]
+        )
+        return [
+            (bool(reply[i]), float(reply[i + 1]), int(reply[i + 2])) for i in range(0, len(reply), 3)
+        ]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _compile_route(route: str) -> Tuple[str, Pattern]:
+    method, path = route.split(" ", 1)
+    pattern = "/".join(
+        "[^/]+" if segment.startswith("{") else re.escape(segment) for segment in path.split("/")
+    )
+    return method, re.compile(f"^{pattern}$")
+
+
+class RateLimiter:
+    """Per-user and per-IP sliding window limits, in cost units per window.
+
+    Each key keeps a counter for the current and the previous window; usage
+    is the current count plus the previous count weighted by how much of the
+    previous window still overlaps the sliding window. If the shared
+    backend is unreachable, this process falls back to its own counters for
+    a while.
+    """
+
+    def __init__(
+        self,
+        backend,
+        per_user: int,
+        per_ip: int,
+        window_seconds: int = 60,
+        route_costs: Optional[Dict[str, int]] = None,
+        fallback_seconds: float = 30.0
+    ):
+        self.backend = backend
+        self.per_user = per_user
+        self.per_ip = per_ip
+        self.window_seconds = window_seconds
+        self.fallback_seconds = fallback_seconds
+        self._fallback = MemoryBackend() if not isinstance(backend, MemoryBackend) else None
+        self._fallback_until = 0.0
+
+        costs = {**ROUTE_COSTS, **(route_costs or {})}
+        self._exact_costs = {route: cost for route, cost in costs.items() if "{" not in route}
+        self._pattern_costs: List[Tuple[str, Pattern, int]] = [
+            (*_compile_route(route), cost) for route, cost in costs.items() if "{" in route
+        ]
+
+    def cost(self, method: str, path: str) -> int:
+        cost = self._exact_costs.get(f"{method} {path}")
+        if cost is not None:
+            return cost
+        for route_method, pattern, cost in self._pattern_costs:
+            if route_method == method and pattern.match(path):
+                return cost
+        return 1
+
+    async def _hit(self, checks: List[Tuple[str, int]], cost: int, now: float) -> List[Tuple[bool, float, int]]:
+        if self._fallback is not None and now >= self._fallback_until:
+            try:
+                return await self.backend.hit(checks, cost, self.window_seconds, now)
+            except Exception as e:  # Any Redis or connection error
+                self._fallback_until = now + self.fallback_seconds
+                logger.warning("Rate limit backend unavailable, counting per process", extra={"error": str(e)})
+        backend = self._fallback or self.backend
+        return await backend.hit(checks, cost, self.window_seconds, now)
+
+    async def check(self, user_id: Optional[int], ip: Optional[str], cost: int) -> RateLimitResult:
+        """Count a request against its user and IP; the tighter limit is reported.
+
+        Both limits are checked before either is charged, so a request the
+        IP limit rejects does not use up the user's budget (or vice versa).
+        """
+
+        now = time.time()
+        reset_seconds = math.ceil(self.window_seconds - now % self.window_seconds)
+        checks = []
+        if user_id is not None:
+            checks.append((f"user:{user_id}", self.per_user))
+        if ip is not None:
+            checks.append((f"ip:{ip}", self.per_ip))
+
+        if not checks:
+            return RateLimitResult(True, self.per_ip, self.per_ip, reset_seconds, 0)
+
+        result = None
+        hits = await self._hit(checks, cost, now)
+        for (_, limit), (allowed, used, previous) in zip(checks, hits):
+            remaining = max(0, math.floor(limit - used))
+
+            retry_after = 0
+            if not allowed:
+                # The previous window's share decays linearly; otherwise wait for the next window
+                excess = used + cost - limit
+                retry_after = reset_seconds
+                if previous > 0:
+                    retry_after = min(retry_after, math.ceil(excess * self.window_seconds / previous))
+
+            key_result = RateLimitResult(allowed, limit, remaining, reset_seconds, max(retry_after, 0))
+            if not allowed:
+                return key_result
+            if result is None or key_result.remaining < result.remaining:
+                result = key_result
+
+        return result
+
+    async def close(self) -> None:
+        if isinstance(self.backend, RedisBackend):
+            await self.backend.close()
+
+
+def _headers(result: RateLimitResult, window_seconds: int) -> List[Tuple[bytes, bytes]]:
+    headers = [
+        (b"ratelimit-limit", str(result.limit).encode()),
+        (b"ratelimit-remaining", str(result.remaining).encode()),
+        (b"ratelimit-reset", str(result.reset_seconds).encode()),
+        (b"ratelimit-policy", f"{result.limit};w={window_seconds}".encode()),
+    ]
+    if not result.allowed:
+        headers.append((b"retry-after", str(result.retry_after).encode()))
+    return headers
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware that rejects requests over their limit with a 429.
+
+    Runs before routing and before the request body is read, so expensive
+    work is shed instead of queued. The user comes from the bearer token
+    (no database lookup); the IP is the ASGI client address, so run uvicorn
+    with --proxy-headers behind a proxy.
+    """
+
+    def __init__(self, app, limiter: "RateLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cost = self.limiter.cost(scope["method"], scope["path"])
+        if cost <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        user_id = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                token_data = decode_access_token(token) if scheme.lower() == "bearer" else None
+                user_id = int(token_data.sub) if token_data is not None else None
+                break
+        client = scope.get("client")
+
+        result = await self.limiter.check(user_id, client[0] if client else None, cost)
+        headers = _headers(result, self.limiter.window_seconds)
+
+        if not result.allowed:
+            # Can be very frequent under load: sampled (LOG_SAMPLE_RATES)
+            logger.info(
+                "Rate limit exceeded",
+                extra={"user_id": user_id, "path": scope["path"], "cost": cost, "retry_after": result.retry_after}
+            )
+            body = json.dumps({"detail": "Rate limit exceeded, please retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *headers
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# Singleton instance
+rate_limiter = RateLimiter(
+    backend=RedisBackend(settings.REDIS_URL) if settings.RATE_LIMIT_BACKEND == "redis" else MemoryBackend(),
+    per_user=settings.RATE_LIMIT_PER_MINUTE,
+    per_ip=settings.RATE_LIMIT_PER_IP_PER_MINUTE,
+    window_seconds=60,
+    route_costs=settings.RATE_LIMIT_ROUTE_COSTS
+)
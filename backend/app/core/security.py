@@ -1,18 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
-from jose import jwt
+from typing import Any, Callable, Union, Optional, TypeVar
+import asyncio
+import os
+
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.config import settings
 from app.models.user import User
+from app.schemas.user import TokenPayload
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes are queued; the client should retry later"""
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool instead of on the event loop.
+
+    bcrypt releases the GIL while hashing, so threads run in parallel and
+    the loop keeps serving other requests. At most `max_pending` hashes may
+    be running or queued; beyond that calls fail fast with
+    PasswordHasherBusy rather than queueing behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusy(f"{self._pending} password hashes pending")
+        
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, token_version: int = 0
 ) -> str:
     """Create JWT access token"""
     if expires_delta:
@@ -22,11 +74,22 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "ver": token_version}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> Optional[TokenPayload]:
+    """Payload of a valid token, or None"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_data = TokenPayload(**payload)
+    except (JWTError, ValueError):
+        return None
+    
+    return token_data if token_data.sub is not None else None
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -37,6 +100,13 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Singleton instance
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
 async def authenticate_user(
     db: AsyncSession, 
     username: str, 
@@ -54,7 +124,10 @@ async def authenticate_user(
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    # Don't hold a pooled connection while bcrypt runs
+    await db.commit()
+    
+    if not await password_hasher.verify(password, user.hashed_password):
         return None
     
     return user
\ No newline at end of file
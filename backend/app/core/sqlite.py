@@ -0,0 +1,182 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import contextvars
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import await_only
+
+# Statements that never take SQLite's write lock
+_READ_PREFIXES = ("SELECT", "PRAGMA", "EXPLAIN", "WITH")
+
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class SQLiteWriter:
+    """High-concurrency mode for SQLite databases.
+
+    Connections use WAL (readers never wait for the writer), synchronous=NORMAL
+    (no fsync per commit), a memory-mapped file and a busy timeout. SQLite
+    allows one writer at a time, so writers in this process take turns on an
+    asyncio lock from their first write statement until the transaction ends,
+    instead of polling SQLite's file lock and failing with "database is
+    locked". The busy timeout still covers other processes (a publish worker).
+
+    Small write transactions can also be submitted to a queue: one task runs
+    everything queued in a single transaction (group commit), so a burst of
+    them costs one lock hand-off and one commit.
+    """
+
+    def __init__(
+        self,
+        busy_timeout_ms: int,
+        mmap_size_mb: int,
+        max_batch: int,
+        batch_wait_ms: float
+    ):
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size_mb = mmap_size_mb
+        self.max_batch = max_batch
+        self.batch_wait_seconds = batch_wait_ms / 1000
+
+        self.session_factory: Optional[Callable[[], AsyncSession]] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {"batches": 0, "operations": 0, "retried": 0, "lock_waits": 0}
+
+    def install(self, engine: Engine, session_factory: Callable[[], AsyncSession]) -> None:
+        """Apply the pragmas and the writer lock to an engine's connections"""
+
+        self.session_factory = session_factory
+        event.listen(engine, "connect", self._configure_connection)
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "commit", self._release_connection)
+        event.listen(engine, "rollback", self._release_connection)
+        event.listen(engine.pool, "checkin", self._checked_in)
+
+    def _configure_connection(self, dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(self.mmap_size_mb) * 1024 * 1024}")
+        cursor.close()
+
+    def _loop_state(self) -> None:
+        """Locks and queues belong to one event loop; start over on a new one"""
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._queue = asyncio.Queue()
+            self._task = None
+
+    # Writer lock
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if conn.info.get("holds_write_lock"):
+            return
+        if statement.lstrip()[:7].upper().startswith(_READ_PREFIXES):
+            return
+
+        # Runs inside the async adapter's greenlet, so the lock can be awaited here
+        self._loop_state()
+        if self._lock.locked():
+            self.stats["lock_waits"] += 1
+        try:
+            await_only(asyncio.wait_for(self._lock.acquire(), self.busy_timeout_ms / 1000))
+        except asyncio.TimeoutError:
+            raise SQLAlchemyTimeoutError(
+                f"Timed out after {self.busy_timeout_ms} ms waiting for the SQLite writer"
+            )
+        conn.info["holds_write_lock"] = True
+        conn.info["write_lock"] = self._lock
+
+    def _release(self, info: Dict[str, Any]) -> None:
+        if info.pop("holds_write_lock", False):
+            lock = info.pop("write_lock")
+            if lock.locked():
+                lock.release()
+
+    def _release_connection(self, conn) -> None:
+        # Fires as the transaction ends; SQLite's busy timeout covers the commit itself
+        self._release(conn.info)
+
+    def _checked_in(self, dbapi_connection, connection_record) -> None:
+        # Connections returned without commit or rollback (reset by the pool)
+        if connection_record is not None:
+            self._release(connection_record.info)
+
+    # Group commit
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        """Run `operation(session)` in the next group commit and return its result.
+
+        The operation must only write to the database: if another operation
+        in its batch fails, the batch is rolled back and every operation is
+        run again in a transaction of its own.
+        """
+
+        self._loop_state()
+        if self._task is None or self._task.done():
+            # Start from an empty context so the writer does not inherit the
+            # request (and user) of whoever submitted first
+            self._task = contextvars.Context().run(self._loop.create_task, self._run())
+
+        future = self._loop.create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_wait_seconds > 0:
+                # Let concurrent writers join this commit
+                await asyncio.sleep(self.batch_wait_seconds)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            await self._commit([entry for entry in batch if not entry[1].done()])
+
+    async def _commit(self, batch: List[Tuple[WriteOperation, asyncio.Future]]) -> None:
+        if not batch:
+            return
+
+        try:
+            async with self.session_factory() as session:
+                results = [await operation(session) for operation, _ in batch]
+                await session.commit()
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+
+            # Find the failing operation without failing the others
+            self.stats["retried"] += len(batch)
+            for entry in batch:
+                await self._commit([entry])
+            return
+
+        self.stats["batches"] += 1
+        self.stats["operations"] += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
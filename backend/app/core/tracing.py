@@ -0,0 +1,380 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# W3C trace context: version-trace id-parent span id-flags
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_SERVER_TIMING_NAME = re.compile(r"[^A-Za-z0-9._-]")
+_MAX_SERVER_TIMING_ENTRIES = 20
+
+
+class Span:
+    """One timed stage of a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "attributes", "start_ns", "duration_ns", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.duration_ns = 0
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+
+class Trace:
+    """Spans of one request, in the order they finished (the root span last)"""
+
+    def __init__(self, root: Span, sampled: bool):
+        self.root = root
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.started = time.perf_counter()
+        self.db_statements = 0
+        self.db_ns = 0
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: time per stage name, database time and the total so far"""
+        stages: Dict[str, float] = {}
+        for finished in self.spans:
+            stages[finished.name] = stages.get(finished.name, 0.0) + finished.duration_ms
+
+        entries = [
+            f"{_SERVER_TIMING_NAME.sub('_', name)};dur={duration:.1f}"
+            for name, duration in list(stages.items())[:_MAX_SERVER_TIMING_ENTRIES]
+        ]
+        if self.db_statements:
+            plural = "s" if self.db_statements != 1 else ""
+            entries.append(f'db;dur={self.db_ns / 1e6:.1f};desc="{self.db_statements} statement{plural}"')
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a stage of the current trace (does nothing outside one).
+
+    Works around awaits: `with span("research"): await ...`. Exceptions mark
+    the span as failed and propagate.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(name, trace.root.trace_id, parent.span_id if parent else None, kind, attributes)
+    token = _current_span.set(current)
+    started = time.perf_counter_ns()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration_ns = time.perf_counter_ns() - started
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def traced(name: str, kind: int = SPAN_KIND_INTERNAL) -> Callable:
+    """Decorator: run every call of a function (sync or async) in a span"""
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, kind):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return function(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def otlp_json(traces: List[Trace], service_name: str) -> Dict[str, Any]:
+    """Traces as an OTLP/JSON ExportTraceServiceRequest"""
+    spans = []
+    for trace in traces:
+        for finished in trace.spans:
+            otlp_span = {
+                "traceId": finished.trace_id,
+                "spanId": finished.span_id,
+                "name": finished.name,
+                "kind": finished.kind,
+                "startTimeUnixNano": str(finished.start_ns),
+                "endTimeUnixNano": str(finished.start_ns + finished.duration_ns),
+                "attributes": [_attribute(key, value) for key, value in finished.attributes.items()],
+                "status": {"code": 2, "message": finished.error} if finished.error else {"code": 1},
+            }
+            if finished.parent_id:
+                otlp_span["parentSpanId"] = finished.parent_id
+            spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]
+    }
+
+
+class FileExporter:
+    """Appends one OTLP/JSON request per line (the collector file exporter format)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, payload: bytes) -> None:
+        with open(self.path, "ab") as output:
+            output.write(payload + b"\n")
+
+    def close(self) -> None:
+        pass
+
+
+class OTLPHTTPExporter:
+    """Posts OTLP/JSON to a collector's /v1/traces endpoint"""
+
+    def __init__(self, url: str):
+        import httpx
+
+        self.url = url
+        self._client = httpx.Client(timeout=2.0)
+
+    def export(self, payload: bytes) -> None:
+        response = self._client.post(self.url, content=payload, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class Tracer:
+    """Per-request traces: Server-Timing headers, and OTLP export off the event loop.
+
+    Finished traces are queued for a background thread that batches them
+    into OTLP/JSON requests; when the queue is full traces are dropped
+    rather than slowing requests down. Database statement time is added to
+    the current trace from engine events.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[Any],
+        sample_rate: float = 1.0,
+        service_name: str = "socialai-backend",
+        queue_size: int = 2048,
+        batch_size: int = 128,
+        flush_seconds: float = 1.0
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        kind: int = SPAN_KIND_SERVER,
+        **attributes: Any
+    ) -> Iterator[Trace]:
+        """Make a new trace current; a W3C traceparent continues the caller's trace"""
+        parent = _TRACEPARENT.match(traceparent or "")
+        if parent:
+            trace_id, parent_id = parent.group(1), parent.group(2)
+            sampled = bool(int(parent.group(3), 16) & 1)
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+            sampled = random.random() < self.sample_rate
+
+        trace = Trace(Span(name, trace_id, parent_id, kind, attributes), sampled)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(trace.root)
+        try:
+            yield trace
+        except BaseException as e:
+            trace.root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            trace.root.duration_ns = int((time.perf_counter() - trace.started) * 1e9)
+            trace.spans.append(trace.root)
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if trace.sampled and self.exporter is not None:
+                self._enqueue(trace)
+
+    def _enqueue(self, trace: Trace) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    trace = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                if trace is None:
+                    stopping = True
+                    break
+                batch.append(trace)
+
+            if batch:
+                payload = json.dumps(otlp_json(batch, self.service_name), separators=(",", ":")).encode()
+                try:
+                    self.exporter.export(payload)
+                except Exception as e:
+                    logger.warning("Trace export failed", extra={"traces": len(batch), "error": str(e)})
+
+    def shutdown(self) -> None:
+        """Export queued traces and stop the exporter thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.exporter is not None:
+            self.exporter.close()
+
+    def install(self, engine: Engine) -> None:
+        """Count statement time on an engine against the trace that issued it"""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None and _current_trace.get() is not None:
+            context.trace_started_ns = time.perf_counter_ns()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "trace_started_ns", None)
+        trace = _current_trace.get()
+        if started is not None and trace is not None:
+            trace.db_statements += 1
+            trace.db_ns += time.perf_counter_ns() - started
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware that traces each request and adds a Server-Timing header.
+
+    The header is built when the response starts, so it covers everything
+    the route did before returning (not the streaming of the body).
+    """
+
+    def __init__(self, app, tracer: Tracer, server_timing: bool = True):
+        self.app = app
+        self.tracer = tracer
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = next((value for name, value in scope["headers"] if name == b"traceparent"), b"")
+        with self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent.decode("latin-1"),
+            **{"http.method": scope["method"], "http.target": scope["path"]}
+        ) as trace:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    trace.root.attributes["http.status_code"] = message["status"]
+                    if self.server_timing:
+                        message["headers"] = [
+                            *message.get("headers", []),
+                            (b"server-timing", trace.server_timing().encode()),
+                        ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # The router adds the matched route: name the span after its template
+                route = scope.get("route")
+                if route is not None:
+                    trace.root.name = f"{scope['method']} {route.path}"
+                    trace.root.attributes["http.route"] = route.path
+
+
+def _exporter() -> Optional[Any]:
+    if settings.TRACE_EXPORTER == "file":
+        return FileExporter(settings.TRACE_EXPORT_FILE)
+    if settings.TRACE_EXPORTER == "otlp":
+        return OTLPHTTPExporter(settings.TRACE_EXPORT_URL)
+    return None
+
+
+# Singleton instance
+tracer = Tracer(
+    exporter=_exporter(),
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+    service_name=settings.PROJECT_NAME,
+    queue_size=settings.TRACE_QUEUE_SIZE
+)
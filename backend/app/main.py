@@ -1,19 +1,48 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.core.config import settings
+from app.core.log import setup_logging
+from app.core.principals import principal_cache
+from app.core.security import password_hasher
+from app.core.query_log import RequestContextMiddleware
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.tracing import TracingMiddleware, tracer
+from app.models.database import sqlite_writer
 from app.api.routes import auth, content, schedule, platforms
-from app.models.database import init_db
+from app.services.http_client import close_http_client
+from app.services.scheduler import schedule_dispatcher
+from app.services.publish_worker import PublishWorker
+from app.services.template_engine import template_usage
+
+setup_logging()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    await init_db()
+    # Startup (the schema is managed by Alembic: run `alembic upgrade head` before starting)
+    await principal_cache.start()
+    await template_usage.start()
+    publish_worker_task = None
+    if settings.SCHEDULER_MODE == "dispatcher":
+        await schedule_dispatcher.start()
+    elif settings.SCHEDULER_MODE == "worker":
+        publish_worker_task = asyncio.create_task(PublishWorker().run_forever())
     yield
     # Shutdown
-    pass
+    await schedule_dispatcher.stop()
+    if publish_worker_task is not None:
+        publish_worker_task.cancel()
+    await template_usage.stop()
+    if sqlite_writer is not None:
+        await sqlite_writer.stop()
+    await close_http_client()
+    password_hasher.shutdown()
+    await rate_limiter.close()
+    await principal_cache.stop()
+    tracer.shutdown()
 
 
 app = FastAPI(
@@ -23,6 +52,11 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Shed requests over their rate limit before any work is done (added before
+# CORS so 429 responses still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +64,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor",
+        "X-Request-ID",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+        "Retry-After",
+    ],
 )
 
+# Times each request's stages (Server-Timing header, optional OTLP export)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware, tracer=tracer, server_timing=settings.TRACE_SERVER_TIMING)
+
+# Lets the slow query log attribute statements to routes and tags log records
+# with a request id (outermost, so rate-limited requests get one too)
+app.add_middleware(RequestContextMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(content.router, prefix="/api/content", tags=["content"])
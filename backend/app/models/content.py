@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, JSON, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, ForeignKey, DateTime, Enum, JSON, Boolean, Float, UniqueConstraint, Index, text
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import enum
 
 from app.models.database import Base
@@ -20,13 +20,17 @@ class PostStatus(enum.Enum):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Listing a user's posts, newest first
+        Index("ix_posts_user_id_created_at", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     
     # Content
     topic = Column(String, nullable=False)
-    research_data = Column(JSON, nullable=True)  # Store Perplexity research
+    research_data = deferred(Column(JSON, nullable=True))  # Store Perplexity research (large, loaded on request)
     content = Column(Text, nullable=False)
     platform = Column(Enum(Platform), nullable=False)
     
@@ -41,7 +45,7 @@ class Post(Base):
     impressions = Column(Integer, default=0)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Partition key when partitioned
     published_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -50,21 +54,47 @@ class Post(Base):
     scheduled_post = relationship("ScheduledPost", back_populates="post", uselist=False)
 
 
+# Session.refresh() skips deferred columns unless they are named
+POST_ATTRIBUTES = list(Post.__table__.columns.keys())
+
+
 class ScheduledPost(Base):
     __tablename__ = "scheduled_posts"
+    __table_args__ = (
+        UniqueConstraint("recurring_schedule_id", "occurrence_time", name="uq_scheduled_posts_occurrence"),
+        # Per-user listings and calendar ranges
+        Index("ix_scheduled_posts_user_id_scheduled_time", "user_id", "scheduled_time", "id"),
+        Index("ix_scheduled_posts_user_id_is_posted_scheduled_time", "user_id", "is_posted", "scheduled_time", "id"),
+        # Dispatcher and publish worker only look at unposted rows
+        Index(
+            "ix_scheduled_posts_pending",
+            "scheduled_time",
+            postgresql_where=text("is_posted = false"),
+            sqlite_where=text("is_posted = 0")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), unique=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     
     # Scheduling
-    scheduled_time = Column(DateTime(timezone=True), nullable=False, index=True)
-    celery_task_id = Column(String, nullable=True)
+    scheduled_time = Column(DateTime(timezone=True), nullable=False)
+    celery_task_id = Column(String, nullable=True)  # Claim token of the worker publishing it
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     
     # Status
     is_posted = Column(Boolean, default=False)
     error_message = Column(Text, nullable=True)
     
+    # Retries
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Set when materialized from a recurring schedule
+    recurring_schedule_id = Column(Integer, ForeignKey("recurring_schedules.id"), nullable=True)
+    occurrence_time = Column(DateTime(timezone=True), nullable=True)  # Original (un-overridden) occurrence
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -73,6 +103,143 @@ class ScheduledPost(Base):
     user = relationship("User", back_populates="scheduled_posts")
 
 
+class RecurringSchedule(Base):
+    """A series of posts defined by an RFC 5545 RRULE.
+    
+    Occurrences are never stored ahead of time: they are expanded on demand,
+    and only those inside the scheduler's look-ahead window are materialized
+    into ScheduledPost rows (with a copy of the template post).
+    """
+    __tablename__ = "recurring_schedules"
+    __table_args__ = (
+        # Materialization scans active schedules by materialized_until
+        Index(
+            "ix_recurring_schedules_active",
+            "materialized_until",
+            postgresql_where=text("is_active = true"),
+            sqlite_where=text("is_active = 1")
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)  # Template post
+    
+    # Recurrence
+    rrule = Column(Text, nullable=False)  # e.g. FREQ=WEEKLY;BYDAY=MO;BYHOUR=9
+    dtstart = Column(DateTime(timezone=True), nullable=False)  # UTC
+    timezone = Column(String, nullable=False, default="UTC", server_default="UTC")  # Rule is evaluated in this zone
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    # Expansion restarts from a recent occurrence instead of dtstart
+    anchor_time = Column(DateTime(timezone=True), nullable=False)
+    anchor_index = Column(Integer, default=0, server_default="0", nullable=False)  # Occurrences before anchor_time (for COUNT)
+    
+    # Occurrences up to this time have been materialized
+    materialized_until = Column(DateTime(timezone=True), nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    post = relationship("Post")
+    exceptions = relationship("RecurrenceException", back_populates="recurring_schedule", cascade="all, delete-orphan")
+
+
+class RecurrenceException(Base):
+    """Skips or overrides a single occurrence of a recurring schedule"""
+    __tablename__ = "recurrence_exceptions"
+    __table_args__ = (
+        UniqueConstraint("recurring_schedule_id", "occurrence_time", name="uq_recurrence_exceptions_occurrence"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    recurring_schedule_id = Column(Integer, ForeignKey("recurring_schedules.id"), nullable=False)
+    occurrence_time = Column(DateTime(timezone=True), nullable=False)  # Original occurrence (UTC)
+    
+    is_skipped = Column(Boolean, default=False, nullable=False)
+    override_time = Column(DateTime(timezone=True), nullable=True)
+    override_content = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    recurring_schedule = relationship("RecurringSchedule", back_populates="exceptions")
+
+
+class PostingSlotStat(Base):
+    """Engagement rollup per user, platform and hour of week (0 = Monday 00:00 UTC).
+    
+    Weighted columns use forward decay: each post contributes with a weight
+    that grows with its published_at, so rows are updated incrementally and
+    never need rescaling.
+    """
+    __tablename__ = "posting_slot_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "platform", "hour_of_week", name="uq_posting_slot_stats_slot"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    platform = Column(Enum(Platform), nullable=False)
+    hour_of_week = Column(Integer, nullable=False)
+    
+    # Raw counters
+    post_count = Column(Integer, default=0, server_default="0", nullable=False)
+    engagement = Column(Integer, default=0, server_default="0", nullable=False)
+    impressions = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Recency weighted counters
+    weighted_posts = Column(Float, default=0.0, server_default="0", nullable=False)
+    weighted_engagement = Column(Float, default=0.0, server_default="0", nullable=False)
+    weighted_impressions = Column(Float, default=0.0, server_default="0", nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class EngagementSnapshot(Base):
+    """Raw engagement samples for a post (append-only).
+    
+    Rows are kept small: counters are deltas since the post's previous sample
+    (curves are rebuilt backwards from the post's current totals) and
+    captured_at is whole seconds since ENGAGEMENT_EPOCH in
+    app/services/engagement.py. The engagement service folds old samples into
+    EngagementRollup rows.
+    """
+    __tablename__ = "engagement_snapshots"
+    
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True)
+    captured_at = Column(Integer, primary_key=True, autoincrement=False)
+    
+    # Deltas since the previous sample
+    likes = Column(Integer, default=0, server_default="0", nullable=False)
+    shares = Column(Integer, default=0, server_default="0", nullable=False)
+    comments = Column(Integer, default=0, server_default="0", nullable=False)
+    impressions = Column(Integer, default=0, server_default="0", nullable=False)
+
+
+class EngagementRollup(Base):
+    """Engagement deltas summed per post over an hour or a day"""
+    __tablename__ = "engagement_rollups"
+    __table_args__ = (
+        # Per-user aggregates
+        Index("ix_engagement_rollups_user_id_bucket_start", "user_id", "bucket_start"),
+    )
+    
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True)
+    resolution_hours = Column(SmallInteger, primary_key=True, autoincrement=False)  # 1 or 24
+    bucket_start = Column(Integer, primary_key=True, autoincrement=False)  # Seconds since ENGAGEMENT_EPOCH
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    likes = Column(Integer, default=0, server_default="0", nullable=False)
+    shares = Column(Integer, default=0, server_default="0", nullable=False)
+    comments = Column(Integer, default=0, server_default="0", nullable=False)
+    impressions = Column(Integer, default=0, server_default="0", nullable=False)
+
+
 class ContentTemplate(Base):
     __tablename__ = "content_templates"
     
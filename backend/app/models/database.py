@@ -1,35 +1,178 @@
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.query_log import slow_query_log
+from app.core.sqlite import SQLiteWriter
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Engine profiles (DB_PROFILE); DB_* settings override individual values
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Local development: small pool, connections checked before use
+    "dev": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 100,
+    },
+    # Production replicas: room for concurrent requests and workers, recycle
+    # before load balancers / pgbouncer drop idle connections
+    "prod": {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 10.0,
+        "pool_recycle": 900,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+    },
+    # Benchmarks: fixed size pool, no per-checkout ping, fail fast when exhausted
+    "bench": {
+        "pool_size": 50,
+        "max_overflow": 0,
+        "pool_timeout": 5.0,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache_size": 1000,
+    },
+}
+
+_PROFILE_OVERRIDES = {
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_timeout": "DB_POOL_TIMEOUT_SECONDS",
+    "pool_recycle": "DB_POOL_RECYCLE_SECONDS",
+    "statement_cache_size": "DB_STATEMENT_CACHE_SIZE",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Use the async driver for the configured database"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """create_async_engine() arguments for the configured profile"""
+
+    if settings.DB_PROFILE not in ENGINE_PROFILES:
+        raise ValueError(
+            f"Unknown DB_PROFILE {settings.DB_PROFILE!r}, expected one of {', '.join(ENGINE_PROFILES)}"
+        )
+
+    profile = dict(ENGINE_PROFILES[settings.DB_PROFILE])
+    for option, setting_name in _PROFILE_OVERRIDES.items():
+        value = getattr(settings, setting_name)
+        if value is not None:
+            profile[option] = value
+
+    # DB_ECHO raises the sqlalchemy.engine log level (app/core/log.py) instead of
+    # echo=True, which would add a console handler outside the logging queue
+    options: Dict[str, Any] = {
+        "pool_pre_ping": profile["pool_pre_ping"],
+    }
+
+    if url.startswith("sqlite") and ":memory:" in url:
+        # In-memory databases live in a single connection; there is no pool to size
+        return options
+
+    options.update(
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+        pool_timeout=profile["pool_timeout"],
+        pool_recycle=profile["pool_recycle"],
+    )
+    if url.startswith("sqlite"):
+        # aiosqlite defaults to NullPool, which starts a new connection thread per session
+        options["poolclass"] = AsyncAdaptedQueuePool
+    elif url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"prepared_statement_cache_size": profile["statement_cache_size"]}
+
+    return options
+
+
+def create_engine_for_url(url: str) -> AsyncEngine:
+    """Create an async engine for a database URL with the configured profile"""
+    url = async_database_url(url)
+    new_engine = create_async_engine(url, **engine_options(url))
+    slow_query_log.install(new_engine.sync_engine)
+    if settings.TRACING_ENABLED:
+        tracer.install(new_engine.sync_engine)
+    return new_engine
+
 
 # Create async engine
-database_url = settings.DATABASE_URL
-if database_url.startswith("sqlite"):
-    # For SQLite, use aiosqlite
-    database_url = database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
-    engine = create_async_engine(database_url, echo=True)
-else:
-    # For PostgreSQL
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(database_url, echo=True)
+database_url = async_database_url(settings.DATABASE_URL)
+engine = create_engine_for_url(database_url)
+
+
+class PrimarySession(Session):
+    """Sessions bound to the primary (writes are tracked for read-your-writes)"""
+
 
 # Create session factory
 AsyncSessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False
 )
 
+# High-concurrency mode for SQLite: WAL, one writer at a time, group commits
+sqlite_writer = (
+    SQLiteWriter(
+        busy_timeout_ms=settings.SQLITE_BUSY_TIMEOUT_MS,
+        mmap_size_mb=settings.SQLITE_MMAP_SIZE_MB,
+        max_batch=settings.SQLITE_GROUP_COMMIT_MAX_BATCH,
+        batch_wait_ms=settings.SQLITE_GROUP_COMMIT_WAIT_MS
+    )
+    if engine.dialect.name == "sqlite" and settings.SQLITE_HIGH_CONCURRENCY else None
+)
+if sqlite_writer is not None:
+    sqlite_writer.install(engine.sync_engine, AsyncSessionLocal)
+
+# Optional read replica for read-only routes
+replica_engine = (
+    create_engine_for_url(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None else None
+)
+
+# User the current request acts for (set by the auth dependencies)
+current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
 # Create base class for models
 Base = declarative_base()
 
 
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+def dialect_insert(session: AsyncSession):
+    """Dialect-specific INSERT construct (for ON CONFLICT upserts)"""
+    if session.bind.dialect.name == "postgresql":
+        return postgresql_insert
+    return sqlite_insert
 
 
 async def get_db():
@@ -37,4 +180,115 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def run_write(operation: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+    """Run a small write transaction and return `operation(session)`'s result.
+
+    On SQLite in high-concurrency mode it joins the writer's next group
+    commit; otherwise it runs in a session of its own. The operation should
+    add or change rows and flush, but not commit. Don't call it while the
+    caller's own session has uncommitted writes: the writer would wait for
+    that session's lock until the busy timeout.
+    """
+
+    if sqlite_writer is None:
+        async with AsyncSessionLocal() as session:
+            result = await operation(session)
+            await session.commit()
+            return result
+
+    result = await sqlite_writer.submit(operation)
+    # The writer commits outside this request's context
+    user_id = current_user_id.get()
+    if user_id is not None:
+        replica_router.mark_write(user_id)
+    return result
+
+
+class ReplicaRouter:
+    """Decides whether a read can be served by the replica.
+
+    Users who committed a write recently keep reading from the primary until
+    the replica has had time to catch up (tracked per process). If the
+    replica cannot be reached, reads go to the primary for a while before it
+    is tried again.
+    """
+
+    def __init__(self, read_your_writes_seconds: float, retry_seconds: float):
+        self._recent_writers = TTLCache(read_your_writes_seconds, max_entries=100000)
+        self.retry_seconds = retry_seconds
+        self._unavailable_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return ReplicaSessionLocal is not None
+
+    def mark_write(self, user_id: int) -> None:
+        if self.enabled:
+            self._recent_writers.set(user_id, True)
+
+    def mark_unavailable(self) -> None:
+        self._unavailable_until = time.monotonic() + self.retry_seconds
+
+    def use_replica(self, user_id: Optional[int]) -> bool:
+        if not self.enabled or time.monotonic() < self._unavailable_until:
+            return False
+        return user_id is None or self._recent_writers.get(user_id) is None
+
+
+# Singleton instance
+replica_router = ReplicaRouter(
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.DB_REPLICA_RETRY_SECONDS
+)
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flushed(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _executed(orm_execute_state):
+    # Core INSERT/UPDATE/DELETE (upserts, bulk updates) bypass the flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _committed(session):
+    if session.info.pop("has_writes", False):
+        user_id = current_user_id.get()
+        if user_id is not None:
+            replica_router.mark_write(user_id)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("has_writes", None)
+
+
+@asynccontextmanager
+async def read_session(user_id: Optional[int] = None) -> AsyncIterator[AsyncSession]:
+    """Session for read-only work: the replica when safe, otherwise the primary"""
+
+    if replica_router.use_replica(user_id):
+        session = ReplicaSessionLocal()
+        try:
+            # Check out a connection now so an unreachable replica falls back
+            await session.connection()
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            await session.close()
+            replica_router.mark_unavailable()
+            logger.warning("Read replica unavailable, using the primary", extra={"error": str(e)})
+        else:
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with AsyncSessionLocal() as session:
+        yield session
\ No newline at end of file
@@ -14,6 +14,7 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bump to revoke issued tokens
     
     # API Keys (encrypted)
     anthropic_api_key = Column(String, nullable=True)
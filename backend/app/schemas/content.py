@@ -1,5 +1,5 @@
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from enum import Enum
 
@@ -23,14 +23,6 @@ class AIProvider(str, Enum):
     xai = "xai"
 
 
-class ContentGenerationRequest(BaseModel):
-    topic: str = Field(..., description="Topic for content generation")
-    platforms: List[Platform] = Field(..., description="Platforms to generate content for")
-    ai_provider: AIProvider = Field(AIProvider.claude, description="AI provider to use")
-    include_research: bool = Field(True, description="Include Perplexity research")
-    additional_context: Optional[str] = Field(None, description="Additional context for generation")
-
-
 class ResearchData(BaseModel):
     query: str
     findings: List[str]
@@ -40,6 +32,16 @@ class ResearchData(BaseModel):
     search_results: Optional[List[Dict[str, Any]]] = None
 
 
+class ContentGenerationRequest(BaseModel):
+    topic: str = Field(..., description="Topic for content generation")
+    platforms: List[Platform] = Field(..., description="Platforms to generate content for")
+    ai_provider: AIProvider = Field(AIProvider.claude, description="AI provider to use")
+    include_research: bool = Field(True, description="Include Perplexity research (with a template: research passed in or done earlier only)")
+    additional_context: Optional[str] = Field(None, description="Additional context for generation")
+    template_id: Optional[int] = Field(None, description="Fill this content template locally instead of calling the AI provider")
+    research_data: Optional[ResearchData] = Field(None, description="Reuse earlier research instead of researching again")
+
+
 class PostSuggestion(BaseModel):
     content: str
     character_count: int
@@ -63,6 +65,23 @@ class PostCreate(PostBase):
     pass
 
 
+class CrossPostRequest(BaseModel):
+    topic: str
+    content: str
+    platforms: List[Platform] = Field(
+        ..., min_items=1, description="Platforms to publish to (one account each, so each platform once)"
+    )
+    research_data: Optional[Dict[str, Any]] = None
+    
+    @field_validator("platforms")
+    @classmethod
+    def platforms_unique(cls, platforms: List[Platform]) -> List[Platform]:
+        # One account per platform for now: a repeated platform would post twice to it
+        if len(set(platforms)) != len(platforms):
+            raise ValueError("Each platform can only be listed once")
+        return platforms
+
+
 class PostUpdate(BaseModel):
     content: Optional[str] = None
     status: Optional[PostStatus] = None
@@ -85,9 +104,36 @@ class Post(PostBase):
         from_attributes = True
 
 
+class PostListItem(BaseModel):
+    """Post in a listing; only the requested fields are returned"""
+    id: Optional[int] = None
+    user_id: Optional[int] = None
+    topic: Optional[str] = None
+    content: Optional[str] = None
+    content_preview: Optional[str] = None  # First 100 characters of content
+    platform: Optional[Platform] = None
+    research_data: Optional[Dict[str, Any]] = None
+    status: Optional[PostStatus] = None
+    platform_post_id: Optional[str] = None
+    likes: Optional[int] = None
+    shares: Optional[int] = None
+    comments: Optional[int] = None
+    impressions: Optional[int] = None
+    created_at: Optional[datetime] = None
+    published_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ConflictPolicy(str, Enum):
+    reject = "reject"  # 409 with a suggested free time
+    shift = "shift"  # Move to the next free slot
+    allow = "allow"  # Skip the collision check
+
+
 class ScheduledPostCreate(BaseModel):
     post_id: int
     scheduled_time: datetime
+    on_conflict: ConflictPolicy = ConflictPolicy.reject
 
 
 class ScheduledPost(BaseModel):
@@ -104,6 +150,147 @@ class ScheduledPost(BaseModel):
         from_attributes = True
 
 
+class SlotSpreadOptions(BaseModel):
+    window_start: datetime
+    window_end: datetime
+    min_spacing_minutes: int = Field(30, ge=0, description="Minimum gap between posts on the same platform")
+    max_per_hour: Optional[Dict[Platform, int]] = Field(
+        None, description="Per-platform hourly caps (defaults to the platform limit)"
+    )
+    prefer_best_times: bool = Field(
+        False, description="Fill the user's best-performing hours first instead of spreading evenly"
+    )
+
+
+class BulkScheduleItem(BaseModel):
+    post_id: int
+    scheduled_time: Optional[datetime] = Field(None, description="Required unless spread is given")
+
+
+class BulkScheduleRequest(BaseModel):
+    items: List[BulkScheduleItem] = Field(..., min_items=1, max_items=500)
+    on_conflict: ConflictPolicy = Field(
+        ConflictPolicy.reject, description="How to handle explicit times that collide with other posts"
+    )
+    spread: Optional[SlotSpreadOptions] = Field(
+        None, description="Auto-assign times to items without a scheduled_time"
+    )
+
+
+class BulkCancelRequest(BaseModel):
+    scheduled_post_ids: List[int] = Field(..., min_items=1, max_items=500)
+
+
+class BulkItemResult(BaseModel):
+    post_id: Optional[int] = None
+    scheduled_post_id: Optional[int] = None
+    status: str  # scheduled, rescheduled, cancelled or error
+    scheduled_time: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class BulkOperationResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class RecurringScheduleCreate(BaseModel):
+    post_id: int = Field(..., description="Template post copied for every occurrence")
+    rrule: str = Field(..., description="RFC 5545 RRULE, e.g. FREQ=WEEKLY;BYDAY=MO;BYHOUR=9;BYMINUTE=0")
+    dtstart: datetime
+    timezone: str = Field("UTC", description="IANA timezone the rule is evaluated in")
+
+
+class RecurringSchedule(BaseModel):
+    id: int
+    user_id: int
+    post_id: int
+    rrule: str
+    dtstart: datetime
+    timezone: str
+    is_active: bool
+    materialized_until: datetime
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class RecurrenceExceptionCreate(BaseModel):
+    occurrence_time: datetime = Field(..., description="Original time of the occurrence")
+    skip: bool = False
+    override_time: Optional[datetime] = None
+    override_content: Optional[str] = None
+
+
+class RecurrenceException(BaseModel):
+    id: int
+    recurring_schedule_id: int
+    occurrence_time: datetime
+    is_skipped: bool
+    override_time: Optional[datetime]
+    override_content: Optional[str]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class RecurringOccurrence(BaseModel):
+    occurrence_time: datetime
+    scheduled_time: datetime
+    content: str
+    scheduled_post_id: Optional[int] = None  # Set once materialized
+    is_posted: bool = False
+
+
+class BestTimeSlot(BaseModel):
+    hour_of_week: int  # 0 = Monday 00:00 UTC
+    day_of_week: str
+    hour: int  # UTC
+    score: float  # 0..1, relative to the best hour
+    posts: int
+    avg_engagement: float
+    avg_impressions: float
+    next_occurrence: datetime
+
+
+class BestTimesResponse(BaseModel):
+    platform: Platform
+    based_on_posts: int
+    half_life_days: float
+    slots: List[BestTimeSlot]
+
+
+class EngagementResolution(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class EngagementPoint(BaseModel):
+    time: datetime  # UTC
+    likes: int
+    shares: int
+    comments: int
+    impressions: int
+
+
+class PostEngagementCurve(BaseModel):
+    post_id: int
+    resolution: Optional[EngagementResolution] = None  # None = as stored
+    points: List[EngagementPoint]  # Cumulative totals
+
+
+class EngagementSummary(BaseModel):
+    resolution: EngagementResolution
+    platform: Optional[Platform] = None
+    start: datetime
+    end: datetime
+    buckets: List[EngagementPoint]  # Engagement gained per bucket, labelled by its start
+    totals: Dict[str, int]
+
+
 class ContentTemplateCreate(BaseModel):
     name: str
     description: Optional[str] = None
@@ -111,6 +298,13 @@ class ContentTemplateCreate(BaseModel):
     template: str
 
 
+class ContentTemplateUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    platform: Optional[Platform] = None
+    template: Optional[str] = None
+
+
 class ContentTemplate(ContentTemplateCreate):
     id: int
     user_id: int
@@ -55,6 +55,12 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[int] = None
+    ver: int = 0  # User.token_version when the token was issued
+
+
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str
 
 
 class LoginRequest(BaseModel):
@@ -1,14 +1,14 @@
 from typing import Dict, Any, Optional, List
-import anthropic
-import openai
-from google import genai
-from google.genai import types
 import random
 import json
+import logging
 import re
 from enum import Enum
 
 from app.core.config import settings
+from app.core.tracing import SPAN_KIND_CLIENT, traced
+
+logger = logging.getLogger(__name__)
 
 
 class AIProvider(str, Enum):
@@ -20,54 +20,62 @@ class AIProvider(str, Enum):
 
 class UnifiedAIService:
     def __init__(self):
-        self.claude_client = None
-        self.openai_client = None
-        self.xai_client = None
-        self.gemini_client = None
         self.gemini_keys = settings.get_gemini_api_keys()
         self.current_gemini_key_index = 0
         
-        # Initialize clients
-        self._init_clients()
+        # Clients are built (and their SDKs imported, which is slow) on first use
+        self._clients: Dict[AIProvider, Any] = {}
     
-    def _init_clients(self):
-        """Initialize all available AI clients"""
-        try:
-            if settings.ANTHROPIC_API_KEY:
-                self.claude_client = anthropic.Anthropic(
-                    api_key=settings.ANTHROPIC_API_KEY
-                )
-        except Exception as e:
-            print(f"Failed to initialize Claude client: {e}")
-            self.claude_client = None
-        
-        try:
-            if settings.OPENAI_API_KEY:
-                self.openai_client = openai.OpenAI(
-                    api_key=settings.OPENAI_API_KEY
-                )
-        except Exception as e:
-            print(f"Failed to initialize OpenAI client: {e}")
-            self.openai_client = None
-        
-        try:
-            if settings.XAI_API_KEY:
-                self.xai_client = openai.OpenAI(
-                    api_key=settings.XAI_API_KEY,
-                    base_url="https://api.x.ai/v1"
-                )
-        except Exception as e:
-            print(f"Failed to initialize XAI client: {e}")
-            self.xai_client = None
-        
+    def _is_configured(self, provider: AIProvider) -> bool:
+        """Whether the provider has an API key (without building its client)"""
+        if provider == AIProvider.CLAUDE:
+            return bool(settings.ANTHROPIC_API_KEY)
+        if provider == AIProvider.OPENAI:
+            return bool(settings.OPENAI_API_KEY)
+        if provider == AIProvider.XAI:
+            return bool(settings.XAI_API_KEY)
+        return bool(self.gemini_keys)
+    
+    def _get_client(self, provider: AIProvider) -> Optional[Any]:
+        if provider not in self._clients:
+            self._clients[provider] = self._build_client(provider) if self._is_configured(provider) else None
+        return self._clients[provider]
+    
+    def _build_client(self, provider: AIProvider) -> Optional[Any]:
         try:
-            if self.gemini_keys:
-                self.gemini_client = genai.Client(
-                    api_key=self.gemini_keys[0]
-                )
+            if provider == AIProvider.CLAUDE:
+                import anthropic
+                return anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+            
+            if provider == AIProvider.OPENAI:
+                import openai
+                return openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+            
+            if provider == AIProvider.XAI:
+                import openai
+                return openai.OpenAI(api_key=settings.XAI_API_KEY, base_url="https://api.x.ai/v1")
+            
+            from google import genai
+            return genai.Client(api_key=self.gemini_keys[0])
         except Exception as e:
-            print(f"Failed to initialize Gemini client: {e}")
-            self.gemini_client = None
+            logger.error("Failed to initialize AI client", extra={"provider": provider.value, "error": str(e)})
+            return None
+    
+    @property
+    def claude_client(self):
+        return self._get_client(AIProvider.CLAUDE)
+    
+    @property
+    def openai_client(self):
+        return self._get_client(AIProvider.OPENAI)
+    
+    @property
+    def xai_client(self):
+        return self._get_client(AIProvider.XAI)
+    
+    @property
+    def gemini_client(self):
+        return self._get_client(AIProvider.GEMINI)
     
     def _get_next_gemini_key(self) -> str:
         """Rotate through Gemini API keys for rate limiting"""
@@ -119,6 +127,7 @@ class UnifiedAIService:
                     "character_count": len(f"Content about {topic} for {platform}")
                 }]
     
+    @traced("ai.claude", SPAN_KIND_CLIENT)
     def _generate_with_claude(self, system_prompt: str, user_message: str) -> str:
         """Generate content using Claude"""
         message = self.claude_client.messages.create(
@@ -130,6 +139,7 @@ class UnifiedAIService:
         )
         return message.content[0].text
     
+    @traced("ai.openai", SPAN_KIND_CLIENT)
     def _generate_with_openai(self, system_prompt: str, user_message: str) -> str:
         """Generate content using OpenAI"""
         response = self.openai_client.chat.completions.create(
@@ -143,6 +153,7 @@ class UnifiedAIService:
         )
         return response.choices[0].message.content
     
+    @traced("ai.xai", SPAN_KIND_CLIENT)
     def _generate_with_xai(self, system_prompt: str, user_message: str) -> str:
         """Generate content using XAI (Grok)"""
         response = self.xai_client.chat.completions.create(
@@ -156,8 +167,12 @@ class UnifiedAIService:
         )
         return response.choices[0].message.content
     
+    @traced("ai.gemini", SPAN_KIND_CLIENT)
     async def _generate_with_gemini(self, system_prompt: str, user_message: str) -> str:
         """Generate content using Gemini"""
+        from google import genai
+        from google.genai import types
+        
         # Rotate API key for rate limiting
         current_key = self._get_next_gemini_key()
         client = genai.Client(api_key=current_key)
@@ -188,15 +203,10 @@ class UnifiedAIService:
     
     async def _generate_with_fallback(self, system_prompt: str, user_message: str) -> str:
         """Try available providers in order of preference"""
-        providers = [
-            (AIProvider.CLAUDE, self.claude_client),
-            (AIProvider.GEMINI, self.gemini_client),
-            (AIProvider.OPENAI, self.openai_client),
-            (AIProvider.XAI, self.xai_client)
-        ]
+        providers = [AIProvider.CLAUDE, AIProvider.GEMINI, AIProvider.OPENAI, AIProvider.XAI]
         
-        for provider, client in providers:
-            if client:
+        for provider in providers:
+            if self._get_client(provider):
                 try:
                     if provider == AIProvider.CLAUDE:
                         return self._generate_with_claude(system_prompt, user_message)
@@ -211,6 +221,7 @@ class UnifiedAIService:
         
         raise Exception("No AI providers available or all failed")
     
+    @traced("ai.parse")
     def _parse_ai_response(self, raw_response: str, platform: str) -> List[Dict[str, Any]]:
         """Parse AI response into structured suggestions"""
         try:
@@ -235,7 +246,7 @@ class UnifiedAIService:
                 return processed_suggestions
             
         except Exception as e:
-            print(f"Failed to parse JSON response: {e}")
+            logger.warning("Failed to parse JSON response, using the raw text", extra={"error": str(e)})
         
         # Fallback: treat as single content
         content = raw_response.strip()
@@ -389,46 +400,37 @@ IMPORTANT: Respond with JSON format containing 3 suggestions:
     
     def get_available_providers(self) -> List[AIProvider]:
         """Get list of available AI providers"""
-        providers = []
-        if self.claude_client:
-            providers.append(AIProvider.CLAUDE)
-        if self.openai_client:
-            providers.append(AIProvider.OPENAI)
-        if self.gemini_client:
-            providers.append(AIProvider.GEMINI)
-        if self.xai_client:
-            providers.append(AIProvider.XAI)
-        return providers
+        return [
+            provider
+            for provider in (AIProvider.CLAUDE, AIProvider.OPENAI, AIProvider.GEMINI, AIProvider.XAI)
+            if self._is_configured(provider)
+        ]
     
     def get_provider_info(self) -> Dict[str, Dict[str, Any]]:
         """Get information about each provider"""
         return {
             "claude": {
                 "name": "Claude 4 Sonnet",
-                "available": bool(self.claude_client),
+                "available": self._is_configured(AIProvider.CLAUDE),
                 "description": "Anthropic's most capable model, excellent for nuanced content",
                 "cost": "Higher cost, premium quality"
             },
             "openai": {
                 "name": "GPT-4o Mini", 
-                "available": bool(self.openai_client),
+                "available": self._is_configured(AIProvider.OPENAI),
                 "description": "OpenAI's efficient model, good balance of speed and quality",
                 "cost": "Low cost, good performance"
             },
             "gemini": {
                 "name": "Gemini 2.5 Flash",
-                "available": bool(self.gemini_client),
+                "available": self._is_configured(AIProvider.GEMINI),
                 "description": "Google's fast model with multiple API keys for rate limiting",
                 "cost": "Free tier available, very cost effective"
             },
             "xai": {
                 "name": "Grok Beta",
-                "available": bool(self.xai_client),
+                "available": self._is_configured(AIProvider.XAI),
                 "description": "X's AI model with real-time data and humor capabilities",
                 "cost": "Competitive pricing, good for X content"
             }
         }
-
-
-# Singleton instance
-ai_service = UnifiedAIService()
\ No newline at end of file
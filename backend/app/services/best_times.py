@@ -0,0 +1,290 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict
+import asyncio
+import math
+
+import numpy as np
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.log import setup_logging
+from app.models.database import AsyncSessionLocal, dialect_insert
+from app.models.content import Post, PostingSlotStat, PostStatus, Platform as PlatformEnum
+from app.services.slot_allocator import HOURS_PER_WEEK, hour_of_week, to_utc_naive
+
+# Forward decay landmark: weights are exp(rate * (published_at - LANDMARK))
+LANDMARK = datetime(2024, 1, 1)
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _engagement(likes: Optional[int], shares: Optional[int], comments: Optional[int]) -> int:
+    return (likes or 0) + (shares or 0) + (comments or 0)
+
+
+class BestTimeService:
+    """Recommends posting hours from per hour-of-week engagement rollups.
+
+    Rollups in posting_slot_stats are updated incrementally when a post is
+    published and when its metrics are refreshed, so a recommendation reads at
+    most 168 rows per platform. Recency weighting uses forward decay: a post's
+    weight only depends on its own published_at, and every score is a ratio of
+    weighted sums, so the common exp(-rate * now) factor cancels out.
+    """
+
+    def __init__(self, half_life_days: float, prior_posts: float):
+        self.decay_rate = math.log(2) / (half_life_days * 86400)
+        self.half_life_days = half_life_days
+        self.prior_posts = prior_posts
+
+    def _weight(self, published_at: datetime) -> float:
+        return math.exp(self.decay_rate * (to_utc_naive(published_at) - LANDMARK).total_seconds())
+
+    async def _apply(
+        self,
+        db: AsyncSession,
+        deltas: Dict[Tuple[int, PlatformEnum, int], List[float]]
+    ) -> None:
+        """Add counter deltas to rollup rows with a single multi-row upsert.
+
+        deltas: {(user_id, platform, hour_of_week): [posts, engagement,
+        impressions, weighted_posts, weighted_engagement, weighted_impressions]}
+        """
+
+        if not deltas:
+            return
+
+        insert = dialect_insert(db)
+        insert_stmt = insert(PostingSlotStat).values([
+            {
+                "user_id": user_id,
+                "platform": platform,
+                "hour_of_week": hour,
+                "post_count": int(values[0]),
+                "engagement": int(values[1]),
+                "impressions": int(values[2]),
+                "weighted_posts": values[3],
+                "weighted_engagement": values[4],
+                "weighted_impressions": values[5]
+            }
+            for (user_id, platform, hour), values in deltas.items()
+        ])
+        counters = [
+            "post_count", "engagement", "impressions",
+            "weighted_posts", "weighted_engagement", "weighted_impressions"
+        ]
+        set_ = {
+            name: getattr(PostingSlotStat, name) + getattr(insert_stmt.excluded, name)
+            for name in counters
+        }
+        set_["updated_at"] = func.now()
+
+        await db.execute(insert_stmt.on_conflict_do_update(
+            index_elements=[PostingSlotStat.user_id, PostingSlotStat.platform, PostingSlotStat.hour_of_week],
+            set_=set_
+        ))
+
+    def _add(
+        self,
+        deltas: Dict[Tuple[int, PlatformEnum, int], List[float]],
+        post: Post,
+        posts: int,
+        engagement: int,
+        impressions: int
+    ) -> None:
+        weight = self._weight(post.published_at)
+        bucket = deltas[(post.user_id, post.platform, hour_of_week(post.published_at))]
+        for i, value in enumerate((posts, engagement, impressions)):
+            bucket[i] += value
+            bucket[i + 3] += value * weight
+
+    async def record_published(self, db: AsyncSession, posts: List[Post]) -> None:
+        """Count newly published posts (part of the caller's transaction)"""
+
+        deltas = defaultdict(lambda: [0.0] * 6)
+        for post in posts:
+            if post.published_at is None:
+                continue
+            self._add(
+                deltas, post, 1,
+                _engagement(post.likes, post.shares, post.comments),
+                post.impressions or 0
+            )
+        await self._apply(db, deltas)
+
+    async def record_metrics(self, db: AsyncSession, post: Post, previous: Dict[str, int]) -> None:
+        """Apply the change between a post's previous and current metrics"""
+
+        if post.published_at is None:
+            return
+
+        deltas = defaultdict(lambda: [0.0] * 6)
+        engagement_delta = (
+            _engagement(post.likes, post.shares, post.comments)
+            - _engagement(previous.get("likes"), previous.get("shares"), previous.get("comments"))
+        )
+        impressions_delta = (post.impressions or 0) - (previous.get("impressions") or 0)
+        if engagement_delta or impressions_delta:
+            self._add(deltas, post, 0, engagement_delta, impressions_delta)
+        await self._apply(db, deltas)
+
+    async def rebuild(self, db: AsyncSession, user_id: Optional[int] = None) -> int:
+        """Recompute rollups from published posts; returns the number of posts counted"""
+
+        delete_stmt = delete(PostingSlotStat)
+        stmt = (
+            select(
+                Post.user_id, Post.platform, Post.published_at,
+                Post.likes, Post.shares, Post.comments, Post.impressions
+            )
+            .where(Post.status == PostStatus.PUBLISHED)
+            .where(Post.published_at.is_not(None))
+        )
+        if user_id is not None:
+            delete_stmt = delete_stmt.where(PostingSlotStat.user_id == user_id)
+            stmt = stmt.where(Post.user_id == user_id)
+
+        await db.execute(delete_stmt)
+
+        deltas = defaultdict(lambda: [0.0] * 6)
+        count = 0
+        for row in (await db.execute(stmt)).all():
+            self._add(
+                deltas, row, 1,
+                _engagement(row.likes, row.shares, row.comments),
+                row.impressions or 0
+            )
+            count += 1
+
+        await self._apply(db, deltas)
+        await db.commit()
+        return count
+
+    async def get_hour_scores(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        platform: str
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Score all 168 hours of the week for a user and platform.
+
+        Returns (scores normalized to 0..1, per-hour counters). Hours with
+        little history are shrunk towards the user's overall average, then
+        each hour is blended with its neighbours.
+        """
+
+        stmt = (
+            select(
+                PostingSlotStat.hour_of_week,
+                PostingSlotStat.post_count,
+                PostingSlotStat.weighted_posts,
+                PostingSlotStat.weighted_engagement,
+                PostingSlotStat.weighted_impressions
+            )
+            .where(PostingSlotStat.user_id == user_id)
+            .where(PostingSlotStat.platform == PlatformEnum[platform.upper()])
+        )
+        rows = (await db.execute(stmt)).all()
+
+        counters = {
+            name: np.zeros(HOURS_PER_WEEK)
+            for name in ("posts", "weighted_posts", "weighted_engagement", "weighted_impressions")
+        }
+        if rows:
+            hours = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            values = np.array([row[1:] for row in rows], dtype=np.float64)
+            for column, name in enumerate(counters):
+                counters[name][hours] = values[:, column]
+
+        weighted_posts = counters["weighted_posts"]
+        weighted_engagement = counters["weighted_engagement"]
+        total_posts = weighted_posts.sum()
+        if total_posts <= 0:
+            return np.zeros(HOURS_PER_WEEK), counters
+
+        # Empirical Bayes shrinkage of engagement per post
+        overall = weighted_engagement.sum() / total_posts
+        prior = self.prior_posts * total_posts / max(counters["posts"].sum(), 1)
+        per_post = (weighted_engagement + prior * overall) / (weighted_posts + prior)
+
+        # Neighbouring hours perform alike; the week wraps around
+        smoothed = 0.5 * per_post + 0.25 * (np.roll(per_post, 1) + np.roll(per_post, -1))
+
+        peak = smoothed.max()
+        scores = smoothed / peak if peak > 0 else np.zeros(HOURS_PER_WEEK)
+        return scores, counters
+
+    async def recommend(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        platform: str,
+        limit: int = 5,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Get the best hours of the week to post, with their next occurrence"""
+
+        scores, counters = await self.get_hour_scores(db, user_id, platform)
+        based_on_posts = int(counters["posts"].sum())
+        if not based_on_posts:
+            return {
+                "platform": platform,
+                "based_on_posts": 0,
+                "half_life_days": self.half_life_days,
+                "slots": []
+            }
+
+        now = to_utc_naive(now or datetime.utcnow())
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        current_hour_of_week = hour_of_week(current_hour)
+
+        # Highest score first; ties go to the sooner hour
+        hours_ahead = (np.arange(HOURS_PER_WEEK) - current_hour_of_week - 1) % HOURS_PER_WEEK + 1
+        order = np.lexsort((hours_ahead, -scores))[:limit]
+
+        weighted_posts = counters["weighted_posts"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_engagement = np.where(weighted_posts > 0, counters["weighted_engagement"] / weighted_posts, 0.0)
+            avg_impressions = np.where(weighted_posts > 0, counters["weighted_impressions"] / weighted_posts, 0.0)
+
+        slots = []
+        for hour in order.tolist():
+            slots.append({
+                "hour_of_week": hour,
+                "day_of_week": DAY_NAMES[hour // 24],
+                "hour": hour % 24,
+                "score": round(float(scores[hour]), 4),
+                "posts": int(counters["posts"][hour]),
+                "avg_engagement": round(float(avg_engagement[hour]), 2),
+                "avg_impressions": round(float(avg_impressions[hour]), 2),
+                "next_occurrence": current_hour + timedelta(hours=int(hours_ahead[hour]))
+            })
+
+        return {
+            "platform": platform,
+            "based_on_posts": based_on_posts,
+            "half_life_days": self.half_life_days,
+            "slots": slots
+        }
+
+
+# Singleton instance
+best_time_service = BestTimeService(
+    half_life_days=settings.BEST_TIME_HALF_LIFE_DAYS,
+    prior_posts=settings.BEST_TIME_PRIOR_POSTS
+)
+
+
+async def main() -> None:
+    setup_logging()
+    import app.models.user  # noqa: F401 (registers the User mapper)
+
+    async with AsyncSessionLocal() as db:
+        count = await best_time_service.rebuild(db)
+    print(f"✅ Rebuilt posting slot stats from {count} published posts")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+import hashlib
+import json
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CalendarCache:
+    """Caches calendar views per user and date range.
+
+    Every schedule change bumps the user's version, which orphans all of their
+    cached ranges at once. The TTL bounds staleness for changes made by other
+    processes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._views = TTLCache(ttl_seconds, max_entries)
+        self._versions: Dict[int, int] = {}
+
+    def _key(self, user_id: int, start_date: datetime, end_date: datetime) -> Tuple:
+        return (user_id, self._versions.get(user_id, 0), start_date.isoformat(), end_date.isoformat())
+
+    def get(self, user_id: int, start_date: datetime, end_date: datetime) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Get (etag, payload) for a cached view"""
+        return self._views.get(self._key(user_id, start_date, end_date))
+
+    def set(self, user_id: int, start_date: datetime, end_date: datetime, payload: Dict[str, Any]) -> str:
+        """Cache a view and return its ETag"""
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        self._views.set(self._key(user_id, start_date, end_date), (etag, payload))
+        return etag
+
+    def invalidate(self, user_id: int) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+# Singleton instance
+calendar_cache = CalendarCache(
+    ttl_seconds=settings.CALENDAR_CACHE_TTL_SECONDS,
+    max_entries=settings.CALENDAR_CACHE_MAX_ENTRIES
+)
@@ -1,10 +1,11 @@
 from typing import Dict, Any, Optional
-import anthropic
 from app.core.config import settings
 
 
 class ClaudeService:
     def __init__(self, api_key: Optional[str] = None):
+        import anthropic  # Slow to import: only loaded once the service is used
+        
         self.client = anthropic.Anthropic(
             api_key=api_key or settings.ANTHROPIC_API_KEY
         )
@@ -173,6 +174,3 @@ Make each variation distinct while preserving the original intent."""
         except Exception as e:
             raise Exception(f"Claude API error: {str(e)}")
 
-
-# Singleton instance
-claude_service = ClaudeService()
\ No newline at end of file
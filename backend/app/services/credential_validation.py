@@ -0,0 +1,139 @@
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+import asyncio
+import hashlib
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+from app.services.publishers import get_publisher
+
+VALIDATED_PLATFORMS = ["twitter", "linkedin"]
+
+
+def _credential_fingerprint(user: User, platform: str) -> Optional[str]:
+    """Hash of the stored credentials, so changed tokens never hit a stale result"""
+
+    if platform == "twitter":
+        secret = f"{user.twitter_access_token}:{user.twitter_access_token_secret}"
+        connected = bool(user.twitter_access_token)
+    elif platform == "linkedin":
+        secret = user.linkedin_access_token or ""
+        connected = bool(user.linkedin_access_token)
+    else:
+        return None
+
+    if not connected:
+        return None
+
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+class CredentialValidationCache:
+    """Caches platform credential checks per account with a TTL.
+
+    Fresh results are served directly and stale results are served while a
+    background refresh runs. Cold accounts are reported as pending (valid is
+    None) at once while they are validated in the background, so a slow
+    platform never holds up the status request.
+    """
+
+    def __init__(self, ttl_seconds: float, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self._results = TTLCache(ttl_seconds)
+        self._inflight: Dict[Tuple[int, str, str], asyncio.Task] = {}
+
+    async def _check(self, user: User, platform: str) -> bool:
+        publisher = get_publisher(platform, user)
+        try:
+            return await asyncio.wait_for(
+                publisher.validate_credentials(), self.timeout_seconds
+            )
+        except Exception:
+            return False
+
+    def _refresh(self, user: User, platform: str) -> asyncio.Task:
+        """Start (or join) a validation run for one account"""
+
+        key = (user.id, platform)
+        fingerprint = _credential_fingerprint(user, platform)
+        inflight_key = (user.id, platform, fingerprint)
+
+        task = self._inflight.get(inflight_key)
+        if task is not None and not task.done():
+            return task
+
+        async def run() -> Dict[str, Any]:
+            try:
+                result = {
+                    "valid": await self._check(user, platform),
+                    "checked_at": datetime.utcnow().isoformat(),
+                    "fingerprint": fingerprint
+                }
+                self._results.set(key, result)
+                return result
+            finally:
+                self._inflight.pop(inflight_key, None)
+
+        task = asyncio.create_task(run())
+        self._inflight[inflight_key] = task
+        return task
+
+    async def get_status(self, user: User) -> Dict[str, Dict[str, Any]]:
+        """Get validation status for every platform the user has connected"""
+
+        statuses: Dict[str, Dict[str, Any]] = {}
+
+        for platform in VALIDATED_PLATFORMS:
+            fingerprint = _credential_fingerprint(user, platform)
+            if fingerprint is None:
+                statuses[platform] = {"valid": False, "checked_at": None, "pending": False}
+                continue
+
+            key = (user.id, platform)
+            result = self._results.get(key)
+            if result is None:
+                stale = self._results.get_stale(key)
+                if stale is not None and stale["fingerprint"] == fingerprint:
+                    # Serve the stale result now, revalidate in the background
+                    self._refresh(user, platform)
+                    result = stale
+
+            if result is not None and result["fingerprint"] == fingerprint:
+                statuses[platform] = {
+                    "valid": result["valid"],
+                    "checked_at": result["checked_at"],
+                    "pending": False
+                }
+            else:
+                # Unknown until the background check finishes; clients poll again
+                self._refresh(user, platform)
+                statuses[platform] = {"valid": None, "checked_at": None, "pending": True}
+
+        return statuses
+
+    def invalidate(self, user_id: int, platform: Optional[str] = None) -> None:
+        platforms = [platform] if platform else VALIDATED_PLATFORMS
+        for name in platforms:
+            self._results.delete((user_id, name))
+
+    async def refresh(self, user: User, platform: Optional[str] = None) -> None:
+        """Revalidate credentials after they change (run as a background task)"""
+
+        platforms = [platform] if platform else VALIDATED_PLATFORMS
+        self.invalidate(user.id, platform)
+
+        tasks = [
+            self._refresh(user, name)
+            for name in platforms
+            if _credential_fingerprint(user, name) is not None
+        ]
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+# Singleton instance
+credential_validation_cache = CredentialValidationCache(
+    ttl_seconds=settings.CREDENTIAL_VALIDATION_TTL_SECONDS,
+    timeout_seconds=settings.CREDENTIAL_VALIDATION_TIMEOUT_SECONDS
+)
@@ -0,0 +1,376 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict
+import asyncio
+import logging
+
+from sqlalchemy import select, delete, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.log import setup_logging
+from app.models.database import AsyncSessionLocal, dialect_insert
+from app.models.content import Post, EngagementSnapshot, EngagementRollup, Platform as PlatformEnum
+from app.services.slot_allocator import to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+# Stored timestamps are whole seconds since this instant (fits in 32 bits until 2092)
+ENGAGEMENT_EPOCH = datetime(2024, 1, 1)
+
+COUNTERS = ("likes", "shares", "comments", "impressions")
+HOUR = 3600
+DAY = 86400
+
+# Rows per multi-row upsert (keeps bind parameters under SQLite/asyncpg limits)
+_UPSERT_CHUNK = 1000
+
+
+def to_engagement_seconds(when: datetime) -> int:
+    return int((to_utc_naive(when) - ENGAGEMENT_EPOCH).total_seconds())
+
+
+def from_engagement_seconds(seconds: int) -> datetime:
+    return ENGAGEMENT_EPOCH + timedelta(seconds=seconds)
+
+
+def _floor(seconds: int, size: int) -> int:
+    return seconds - seconds % size
+
+
+def _point(seconds: int, values) -> Dict[str, Any]:
+    point = {"time": from_engagement_seconds(seconds)}
+    point.update(zip(COUNTERS, (int(value) for value in values)))
+    return point
+
+
+class EngagementService:
+    """Engagement history for published posts, kept in three retention tiers.
+
+    Each metrics refresh appends a snapshot of deltas. Snapshots older than the
+    raw retention are folded into hourly rollups, and hourly rollups older than
+    the hourly retention into daily ones, so a post costs a couple of days of
+    samples plus one row per hour or day in which it gained engagement.
+    """
+
+    def __init__(self, raw_retention_hours: int, hourly_retention_days: int, batch_size: int):
+        self.raw_retention_hours = raw_retention_hours
+        self.hourly_retention_days = hourly_retention_days
+        self.batch_size = batch_size
+
+    async def record(
+        self,
+        db: AsyncSession,
+        post: Post,
+        previous: Dict[str, int],
+        captured_at: Optional[datetime] = None
+    ) -> None:
+        """Append the change since `previous` (part of the caller's transaction)"""
+
+        deltas = {name: (getattr(post, name) or 0) - (previous.get(name) or 0) for name in COUNTERS}
+        if not any(deltas.values()):
+            return
+
+        insert = dialect_insert(db)
+        insert_stmt = insert(EngagementSnapshot).values(
+            post_id=post.id,
+            captured_at=to_engagement_seconds(captured_at or datetime.utcnow()),
+            **deltas
+        )
+        # Two refreshes within the same second add up
+        await db.execute(insert_stmt.on_conflict_do_update(
+            index_elements=[EngagementSnapshot.post_id, EngagementSnapshot.captured_at],
+            set_={
+                name: getattr(EngagementSnapshot, name) + getattr(insert_stmt.excluded, name)
+                for name in COUNTERS
+            }
+        ))
+
+    async def _add_to_rollups(
+        self,
+        db: AsyncSession,
+        resolution_hours: int,
+        sums: Dict[Tuple[int, int], List[int]],
+        user_ids: Dict[int, int]
+    ) -> None:
+        insert = dialect_insert(db)
+        rows = [
+            {
+                "post_id": post_id,
+                "resolution_hours": resolution_hours,
+                "bucket_start": bucket_start,
+                "user_id": user_ids[post_id],
+                **dict(zip(COUNTERS, values))
+            }
+            for (post_id, bucket_start), values in sums.items()
+            if post_id in user_ids
+        ]
+
+        for i in range(0, len(rows), _UPSERT_CHUNK):
+            insert_stmt = insert(EngagementRollup).values(rows[i:i + _UPSERT_CHUNK])
+            await db.execute(insert_stmt.on_conflict_do_update(
+                index_elements=[
+                    EngagementRollup.post_id,
+                    EngagementRollup.resolution_hours,
+                    EngagementRollup.bucket_start
+                ],
+                set_={
+                    name: getattr(EngagementRollup, name) + getattr(insert_stmt.excluded, name)
+                    for name in COUNTERS
+                }
+            ))
+
+    async def _fold_snapshots(self, cutoff: int) -> int:
+        """Move snapshots captured before cutoff into hourly rollups"""
+
+        snapshot_counters = [getattr(EngagementSnapshot, name) for name in COUNTERS]
+        folded = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch = (
+                    select(EngagementSnapshot.post_id, EngagementSnapshot.captured_at)
+                    .where(EngagementSnapshot.captured_at < cutoff)
+                    .limit(self.batch_size)
+                )
+                # Deleting first makes concurrent compactions safe: a row is
+                # only ever returned to the transaction that deleted it
+                stmt = (
+                    delete(EngagementSnapshot)
+                    .where(tuple_(EngagementSnapshot.post_id, EngagementSnapshot.captured_at).in_(batch))
+                    .returning(EngagementSnapshot.post_id, EngagementSnapshot.captured_at, *snapshot_counters)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = (await db.execute(stmt)).all()
+                if not rows:
+                    await db.rollback()
+                    break
+
+                sums = defaultdict(lambda: [0] * len(COUNTERS))
+                for post_id, captured_at, *values in rows:
+                    bucket = sums[(post_id, _floor(captured_at, HOUR))]
+                    for i, value in enumerate(values):
+                        bucket[i] += value
+
+                post_ids = list({post_id for post_id, _ in sums})
+                user_ids = dict((await db.execute(
+                    select(Post.id, Post.user_id).where(Post.id.in_(post_ids))
+                )).all())
+
+                await self._add_to_rollups(db, 1, sums, user_ids)
+                await db.commit()
+
+            folded += len(rows)
+            if len(rows) < self.batch_size:
+                break
+
+        return folded
+
+    async def _fold_hourly(self, cutoff: int) -> int:
+        """Move hourly rollups for days before cutoff into daily rollups"""
+
+        rollup_counters = [getattr(EngagementRollup, name) for name in COUNTERS]
+        folded = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch = (
+                    select(
+                        EngagementRollup.post_id,
+                        EngagementRollup.resolution_hours,
+                        EngagementRollup.bucket_start
+                    )
+                    .where(EngagementRollup.resolution_hours == 1)
+                    .where(EngagementRollup.bucket_start < cutoff)
+                    .limit(self.batch_size)
+                )
+                stmt = (
+                    delete(EngagementRollup)
+                    .where(tuple_(
+                        EngagementRollup.post_id,
+                        EngagementRollup.resolution_hours,
+                        EngagementRollup.bucket_start
+                    ).in_(batch))
+                    .returning(
+                        EngagementRollup.post_id,
+                        EngagementRollup.bucket_start,
+                        EngagementRollup.user_id,
+                        *rollup_counters
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                rows = (await db.execute(stmt)).all()
+                if not rows:
+                    await db.rollback()
+                    break
+
+                sums = defaultdict(lambda: [0] * len(COUNTERS))
+                user_ids: Dict[int, int] = {}
+                for post_id, bucket_start, user_id, *values in rows:
+                    user_ids[post_id] = user_id
+                    bucket = sums[(post_id, _floor(bucket_start, DAY))]
+                    for i, value in enumerate(values):
+                        bucket[i] += value
+
+                await self._add_to_rollups(db, 24, sums, user_ids)
+                await db.commit()
+
+            folded += len(rows)
+            if len(rows) < self.batch_size:
+                break
+
+        return folded
+
+    async def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Apply the retention tiers; safe to run from several processes at once"""
+
+        now_seconds = to_engagement_seconds(now or datetime.utcnow())
+        # Cutoffs fall on bucket boundaries so every bucket is folded in one go
+        raw_cutoff = _floor(now_seconds - self.raw_retention_hours * HOUR, HOUR)
+        hourly_cutoff = _floor(now_seconds - self.hourly_retention_days * DAY, DAY)
+
+        folded = {
+            "snapshots": await self._fold_snapshots(raw_cutoff),
+            "hourly_rollups": await self._fold_hourly(hourly_cutoff)
+        }
+        if any(folded.values()):
+            logger.info("Compacted engagement history", extra=folded)
+
+        return folded
+
+    async def post_curve(
+        self,
+        db: AsyncSession,
+        post: Post,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket_seconds: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Cumulative engagement of a post over time.
+
+        Points are rebuilt backwards from the post's current counters, so
+        metrics gathered before history was kept are part of the first point.
+        Rollup points are placed at the end of their bucket. With
+        bucket_seconds, the last point in each bucket is kept.
+        """
+
+        start_seconds = to_engagement_seconds(start) if start else None
+        end_seconds = to_engagement_seconds(end) if end else None
+
+        snapshot_stmt = (
+            select(EngagementSnapshot.captured_at, *[getattr(EngagementSnapshot, name) for name in COUNTERS])
+            .where(EngagementSnapshot.post_id == post.id)
+        )
+        rollup_stmt = (
+            select(
+                EngagementRollup.bucket_start + EngagementRollup.resolution_hours * HOUR,
+                *[getattr(EngagementRollup, name) for name in COUNTERS]
+            )
+            .where(EngagementRollup.post_id == post.id)
+        )
+        if start_seconds is not None:
+            # Later changes are still needed to walk back from the current totals
+            snapshot_stmt = snapshot_stmt.where(EngagementSnapshot.captured_at >= start_seconds)
+            rollup_stmt = rollup_stmt.where(EngagementRollup.bucket_start >= start_seconds - DAY)
+
+        # (time, tier, deltas): a rollup ending at the same second as a snapshot comes first
+        events = [(row[0], 0, row[1:]) for row in (await db.execute(rollup_stmt)).all()]
+        events += [(row[0], 1, row[1:]) for row in (await db.execute(snapshot_stmt)).all()]
+        events.sort(key=lambda event: (event[0], event[1]))
+
+        totals = [getattr(post, name) or 0 for name in COUNTERS]
+        points = []
+        for seconds, _, deltas in reversed(events):
+            if (start_seconds is None or seconds >= start_seconds) and (end_seconds is None or seconds <= end_seconds):
+                points.append((seconds, tuple(totals)))
+            totals = [total - delta for total, delta in zip(totals, deltas)]
+        points.reverse()
+
+        if bucket_seconds:
+            last_in_bucket: Dict[int, tuple] = {}
+            for seconds, values in points:
+                # Label each bucket by its end, like rollup points
+                last_in_bucket[-(-seconds // bucket_seconds) * bucket_seconds] = values
+            points = sorted(last_in_bucket.items())
+
+        return [_point(seconds, values) for seconds, values in points]
+
+    async def user_engagement(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        bucket_seconds: int,
+        platform: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Engagement gained across a user's posts per bucket in [start, end).
+
+        Buckets are labelled by their start. Periods only kept as daily
+        rollups are reported at day resolution even when hours are asked for.
+        """
+
+        start_seconds = _floor(to_engagement_seconds(start), bucket_seconds)
+        end_seconds = to_engagement_seconds(end)
+        buckets = defaultdict(lambda: [0] * len(COUNTERS))
+
+        rollup_bucket = (EngagementRollup.bucket_start - EngagementRollup.bucket_start % bucket_seconds).label("bucket")
+        rollup_stmt = (
+            select(rollup_bucket, *[func.sum(getattr(EngagementRollup, name)) for name in COUNTERS])
+            .where(EngagementRollup.user_id == user_id)
+            .where(EngagementRollup.bucket_start >= start_seconds)
+            .where(EngagementRollup.bucket_start < end_seconds)
+            .group_by(rollup_bucket)
+        )
+
+        snapshot_bucket = (EngagementSnapshot.captured_at - EngagementSnapshot.captured_at % bucket_seconds).label("bucket")
+        snapshot_stmt = (
+            select(snapshot_bucket, *[func.sum(getattr(EngagementSnapshot, name)) for name in COUNTERS])
+            .join(Post, Post.id == EngagementSnapshot.post_id)
+            .where(Post.user_id == user_id)
+            .where(EngagementSnapshot.captured_at >= start_seconds)
+            .where(EngagementSnapshot.captured_at < end_seconds)
+            .group_by(snapshot_bucket)
+        )
+
+        if platform is not None:
+            platform_value = PlatformEnum[platform.upper()]
+            rollup_stmt = (
+                rollup_stmt
+                .join(Post, Post.id == EngagementRollup.post_id)
+                .where(Post.platform == platform_value)
+            )
+            snapshot_stmt = snapshot_stmt.where(Post.platform == platform_value)
+
+        for stmt in (rollup_stmt, snapshot_stmt):
+            for bucket_start, *values in (await db.execute(stmt)).all():
+                bucket = buckets[bucket_start]
+                for i, value in enumerate(values):
+                    bucket[i] += value or 0
+
+        totals = [sum(values[i] for values in buckets.values()) for i in range(len(COUNTERS))]
+        return {
+            "start": from_engagement_seconds(start_seconds),
+            "end": from_engagement_seconds(end_seconds),
+            "platform": platform,
+            "buckets": [_point(seconds, values) for seconds, values in sorted(buckets.items())],
+            "totals": dict(zip(COUNTERS, totals))
+        }
+
+
+# Singleton instance
+engagement_service = EngagementService(
+    raw_retention_hours=settings.ENGAGEMENT_RAW_RETENTION_HOURS,
+    hourly_retention_days=settings.ENGAGEMENT_HOURLY_RETENTION_DAYS,
+    batch_size=settings.ENGAGEMENT_COMPACT_BATCH_SIZE
+)
+
+
+async def main() -> None:
+    setup_logging()
+    import app.models.user  # noqa: F401 (registers the User mapper)
+
+    folded = await engagement_service.compact()
+    print(f"✅ Engagement history compacted: {folded}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
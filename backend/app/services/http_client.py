@@ -0,0 +1,75 @@
+from typing import Optional, Dict, Any
+import asyncio
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Status codes worth retrying for idempotent requests
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled async HTTP client"""
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections"""
+    global _client
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+async def get_with_retry(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    retries: Optional[int] = None,
+    backoff: float = 0.25
+) -> httpx.Response:
+    """GET with retries on transport errors and transient status codes.
+
+    Only used for idempotent requests; writes go through the client directly.
+    """
+    client = get_http_client()
+    attempts = (settings.HTTP_GET_RETRIES if retries is None else retries) + 1
+
+    for attempt in range(attempts):
+        is_last = attempt == attempts - 1
+        try:
+            response = await client.get(url, headers=headers, params=params)
+        except httpx.TransportError:
+            if is_last:
+                raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or is_last:
+                return response
+
+        await asyncio.sleep(backoff * (2 ** attempt))
@@ -1,12 +1,17 @@
 from typing import Optional, Dict, Any
-import requests
+import logging
+
+import httpx
 from app.core.config import settings
+from app.services.http_client import get_http_client, get_with_retry
+
+logger = logging.getLogger(__name__)
 
 
 class LinkedInService:
     def __init__(self, access_token: Optional[str] = None):
         self.access_token = access_token
-        self.base_url = "https://api.linkedin.com/v2"
+        self.base_url = settings.LINKEDIN_API_BASE_URL
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
@@ -38,7 +43,7 @@ class LinkedInService:
                 }
             }
             
-            response = requests.post(
+            response = await get_http_client().post(
                 f"{self.base_url}/ugcPosts",
                 headers=self.headers,
                 json=post_data
@@ -73,7 +78,7 @@ class LinkedInService:
             raise Exception("LinkedIn access token not configured")
         
         try:
-            response = requests.get(
+            response = await get_with_retry(
                 f"{self.base_url}/people/~:(id,firstName,lastName,profilePicture(displayImage~:playableStreams))",
                 headers=self.headers
             )
@@ -95,7 +100,7 @@ class LinkedInService:
         try:
             # Note: LinkedIn API has limited analytics access
             # This is a simplified version
-            response = requests.get(
+            response = await get_with_retry(
                 f"{self.base_url}/ugcPosts/{post_id}",
                 headers=self.headers
             )
@@ -113,7 +118,7 @@ class LinkedInService:
             return {"likes": 0, "shares": 0, "comments": 0, "impressions": 0}
             
         except Exception as e:
-            print(f"Error fetching LinkedIn metrics: {e}")
+            logger.warning("Error fetching LinkedIn metrics", extra={"error": str(e)})
             return {"likes": 0, "shares": 0, "comments": 0, "impressions": 0}
     
     async def validate_credentials(self) -> bool:
@@ -123,12 +128,12 @@ class LinkedInService:
             return False
         
         try:
-            response = requests.get(
+            response = await get_with_retry(
                 f"{self.base_url}/people/~:(id)",
                 headers=self.headers
             )
             return response.status_code == 200
-        except:
+        except httpx.HTTPError:
             return False
     
     def get_character_limit(self) -> int:
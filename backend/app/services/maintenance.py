@@ -0,0 +1,51 @@
+from datetime import datetime
+import logging
+import time
+
+from app.core.config import settings
+from app.services.recurrence import recurrence_service
+from app.services.engagement import engagement_service
+from app.services.partitioning import partition_service
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceSchedule:
+    """Periodic housekeeping shared by the publish worker and the dispatcher.
+
+    Each task runs on its own interval and failures are logged per task, so
+    a failing task neither blocks the others nor stops posts from publishing.
+    """
+
+    def __init__(self, materialize_interval_seconds: float):
+        self.materialize_interval_seconds = materialize_interval_seconds
+        self._next_materialize = 0.0
+        self._next_compaction = 0.0
+        self._next_partition_maintenance = 0.0
+
+    async def run_due(self, materialize_until: datetime) -> None:
+        """Run the tasks whose interval has elapsed"""
+
+        if time.monotonic() >= self._next_materialize:
+            # Turn recurring occurrences that are coming up into rows
+            self._next_materialize = time.monotonic() + self.materialize_interval_seconds
+            try:
+                await recurrence_service.materialize(materialize_until)
+            except Exception:
+                logger.exception("Recurring schedule materialization failed")
+
+        if time.monotonic() >= self._next_compaction:
+            # Fold old engagement samples into rollups
+            self._next_compaction = time.monotonic() + settings.ENGAGEMENT_COMPACT_INTERVAL_SECONDS
+            try:
+                await engagement_service.compact()
+            except Exception:
+                logger.exception("Engagement compaction failed")
+
+        if time.monotonic() >= self._next_partition_maintenance:
+            # Create upcoming monthly partitions, archive old ones (when partitioned)
+            self._next_partition_maintenance = time.monotonic() + settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+            try:
+                await partition_service.maintain()
+            except Exception:
+                logger.exception("Partition maintenance failed")
@@ -0,0 +1,544 @@
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import logging
+import re
+import time
+
+from sqlalchemy import DateTime, Select, Table, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.schema import AddConstraint
+
+from app.core.config import settings
+from app.core.log import setup_logging
+from app.models.database import Base, engine
+from app.models.content import Post
+from app.services.engagement import to_engagement_seconds, from_engagement_seconds
+from app.services.slot_allocator import to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+# Tables that can be split into monthly partitions, and the column they are split on
+PARTITION_COLUMNS = {
+    "posts": "created_at",
+    "engagement_rollups": "bucket_start",
+}
+
+ARCHIVED_COMMENT = "archived"
+
+# Held while partitions are created or archived, so several processes can run maintenance
+_MAINTENANCE_LOCK_ID = 4_300_043
+
+_PARTITION_NAME = re.compile(r"_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def _month_start(when: datetime) -> datetime:
+    return datetime(when.year, when.month, 1)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f"{table_name}_p{month:%Y_%m}"
+
+
+def _references(table_name: str) -> List[Tuple[str, str, str]]:
+    """(referencing table, column, referenced column) of foreign keys to a table"""
+    references = []
+    for name, table in sorted(Base.metadata.tables.items()):
+        for foreign_key in table.foreign_keys:
+            referenced_table, referenced_column = foreign_key.target_fullname.split(".")
+            if referenced_table == table_name:
+                references.append((name, foreign_key.parent.name, referenced_column))
+    return references
+
+
+class PartitionService:
+    """Monthly range partitioning of posts and engagement rollups (PostgreSQL only).
+
+    Partitioning is opt-in: `enable` rewrites the tables once. Afterwards
+    maintenance creates partitions ahead of time and moves old ones to a
+    cold storage tablespace. Archived partitions stay attached and writable
+    (metrics refreshes still update old posts), so every query still sees
+    them, while queries bounded by time (and newest-first listings, which
+    stop at the first partitions that fill the page) never read them.
+    Lookups by post id are bounded with post_bounds().
+
+    PostgreSQL cannot enforce foreign keys to a partitioned table without
+    the partition key, so those to posts are enforced by triggers instead.
+
+    There is deliberately no default partition: it would disable ordered
+    partition scans and has to be scanned whenever a partition is added.
+    """
+
+    def __init__(
+        self,
+        premake_months: int,
+        archive_after_months: int,
+        archive_tablespace: Optional[str],
+        post_bounds_refresh_seconds: float
+    ):
+        self.premake_months = premake_months
+        self.archive_after_months = archive_after_months
+        self.archive_tablespace = archive_tablespace
+        self.post_bounds_refresh_seconds = post_bounds_refresh_seconds
+        self._post_id_ranges: Optional[Tuple[List[Tuple[datetime, int, int]], datetime]] = None
+        self._post_id_ranges_expire = 0.0
+        self._post_id_ranges_lock = asyncio.Lock()
+
+    @property
+    def archiving(self) -> bool:
+        return self.archive_after_months > 0 and bool(self.archive_tablespace)
+
+    def _bound(self, table: Table, month: datetime) -> str:
+        if isinstance(table.c[PARTITION_COLUMNS[table.name]].type, DateTime):
+            return f"'{month:%Y-%m-%d} 00:00:00+00'"
+        return str(to_engagement_seconds(month))
+
+    async def partitioned_tables(self, conn: AsyncConnection) -> Set[str]:
+        result = await conn.execute(text(
+            "SELECT c.relname FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = current_schema()"
+        ))
+        return {name for name, in result.all()}
+
+    async def _partitions(self, conn: AsyncConnection, table_name: str) -> Dict[datetime, Tuple[str, bool]]:
+        """Month -> (partition name, archived)"""
+
+        result = await conn.execute(text(
+            "SELECT c.relname, obj_description(c.oid, 'pg_class') FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ), {"table": table_name})
+
+        partitions = {}
+        for name, comment in result.all():
+            match = _PARTITION_NAME.search(name)
+            if match:
+                month = datetime(int(match["year"]), int(match["month"]), 1)
+                partitions[month] = (name, comment == ARCHIVED_COMMENT)
+        return partitions
+
+    async def _create_partition(self, conn: AsyncConnection, table: Table, month: datetime) -> str:
+        name = partition_name(table.name, month)
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table.name}" '
+            f"FOR VALUES FROM ({self._bound(table, month)}) TO ({self._bound(table, _add_months(month, 1))})"
+        ))
+        return name
+
+    async def _convert(self, conn: AsyncConnection, table: Table) -> int:
+        """Rewrite a table as a partitioned one with a partition per month of data"""
+
+        name = table.name
+        column = PARTITION_COLUMNS[name]
+        old_name = f"{name}_unpartitioned"
+
+        await conn.execute(text(f'LOCK TABLE "{name}" IN ACCESS EXCLUSIVE MODE'))
+
+        # Foreign keys can only reference a partitioned table through its partition
+        # key: they are dropped here and enforced by triggers (see enable())
+        result = await conn.execute(text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = CAST(:table AS regclass)"
+        ), {"table": name})
+        for referencing_table, constraint in result.all():
+            await conn.execute(text(f'ALTER TABLE {referencing_table} DROP CONSTRAINT "{constraint}"'))
+
+        # Free the table, primary key and index names for the new table
+        await conn.execute(text(f'ALTER TABLE "{name}" RENAME TO "{old_name}"'))
+        await conn.execute(text(f'ALTER TABLE "{old_name}" DROP CONSTRAINT "{name}_pkey"'))
+        result = await conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"
+        ), {"table": old_name})
+        for index_name, in result.all():
+            await conn.execute(text(f'DROP INDEX "{index_name}"'))
+
+        await conn.execute(text(
+            f'CREATE TABLE "{name}" (LIKE "{old_name}" INCLUDING DEFAULTS INCLUDING STORAGE) '
+            f'PARTITION BY RANGE ("{column}")'
+        ))
+
+        # The partition key has to be part of the primary key
+        key = [key_column.name for key_column in table.primary_key.columns]
+        if column not in key:
+            key.append(column)
+        await conn.execute(text(
+            f'ALTER TABLE "{name}" ADD CONSTRAINT "{name}_pkey" PRIMARY KEY ({", ".join(key)})'
+        ))
+        for index in table.indexes:
+            await conn.run_sync(lambda sync_conn: index.create(sync_conn))
+        for constraint in table.foreign_key_constraints:
+            if constraint.referred_table.name not in PARTITION_COLUMNS:
+                await conn.run_sync(lambda sync_conn: sync_conn.execute(AddConstraint(constraint)))
+
+        # Keep the id sequence when the old table is dropped
+        for key_column in table.primary_key.columns:
+            sequence = (await conn.execute(
+                text("SELECT pg_get_serial_sequence(:table, :column)"),
+                {"table": old_name, "column": key_column.name}
+            )).scalar()
+            if sequence:
+                await conn.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY "{name}"."{key_column.name}"'))
+
+        # A partition for every month with data, up to the ones made ahead of time
+        oldest, newest = (await conn.execute(text(f'SELECT min("{column}"), max("{column}") FROM "{old_name}"'))).one()
+        if isinstance(oldest, int):
+            oldest, newest = from_engagement_seconds(oldest), from_engagement_seconds(newest)
+        elif oldest is not None:
+            oldest, newest = to_utc_naive(oldest), to_utc_naive(newest)
+
+        this_month = _month_start(datetime.utcnow())
+        month = _month_start(oldest) if oldest is not None else _add_months(this_month, -1)
+        last = _add_months(max(this_month, _month_start(newest) if newest is not None else this_month), self.premake_months)
+        while month <= last:
+            await self._create_partition(conn, table, month)
+            month = _add_months(month, 1)
+
+        result = await conn.execute(text(f'INSERT INTO "{name}" SELECT * FROM "{old_name}"'))
+        await conn.execute(text(f'DROP TABLE "{old_name}"'))
+        await conn.execute(text(f'ANALYZE "{name}"'))
+
+        return result.rowcount
+
+    async def _enforce_references(self, conn: AsyncConnection, table_name: str) -> List[str]:
+        """Create the triggers that stand in for foreign keys to a partitioned table (if missing)"""
+
+        result = await conn.execute(text(
+            "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal AND tgname LIKE '%_fkey_check'"
+        ))
+        existing = {name for name, in result.all()}
+        created = []
+
+        references = _references(table_name)
+        for referencing_table, column, referenced_column in references:
+            name = f"{referencing_table}_{column}_fkey_check"
+            if name in existing:
+                continue
+            # Lock the post like a foreign key does, so it can't be deleted before commit
+            await conn.exec_driver_sql(f'''
+                CREATE OR REPLACE FUNCTION "{name}"() RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    IF NEW."{column}" IS NOT NULL THEN
+                        PERFORM 1 FROM "{table_name}" WHERE "{referenced_column}" = NEW."{column}" FOR KEY SHARE;
+                        IF NOT FOUND THEN
+                            RAISE EXCEPTION 'insert or update on table "{referencing_table}" violates foreign key "{name}"'
+                                USING ERRCODE = 'foreign_key_violation',
+                                      DETAIL = format('Key ({column})=(%s) is not present in table "{table_name}".', NEW."{column}");
+                        END IF;
+                    END IF;
+                    RETURN NEW;
+                END $$
+            ''')
+            await conn.exec_driver_sql(
+                f'CREATE TRIGGER "{name}" BEFORE INSERT OR UPDATE OF "{column}" ON "{referencing_table}" '
+                f'FOR EACH ROW EXECUTE FUNCTION "{name}"()'
+            )
+            created.append(name)
+
+        name = f"{table_name}_referenced_fkey_check"
+        if references and name not in existing:
+            checks = "\n".join(
+                f'''
+                    IF EXISTS (SELECT 1 FROM "{referencing_table}" WHERE "{column}" = OLD."{referenced_column}") THEN
+                        RAISE EXCEPTION 'update or delete on table "{table_name}" violates foreign key from "{referencing_table}"'
+                            USING ERRCODE = 'foreign_key_violation',
+                                  DETAIL = format('Key (%s) is still referenced from table "{referencing_table}".', OLD."{referenced_column}");
+                    END IF;'''
+                for referencing_table, column, referenced_column in references
+            )
+            referenced_columns = sorted({referenced_column for _, _, referenced_column in references})
+            still_there = " AND ".join(f'"{key}" = OLD."{key}"' for key in referenced_columns)
+            key_list = ", ".join(f'"{key}"' for key in referenced_columns)
+            # Moving a row to another partition deletes and re-inserts it: it is still there
+            await conn.exec_driver_sql(f'''
+                CREATE OR REPLACE FUNCTION "{name}"() RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM 1 FROM "{table_name}" WHERE {still_there};
+                    IF FOUND THEN
+                        RETURN NULL;
+                    END IF;{checks}
+                    RETURN NULL;
+                END $$
+            ''')
+            await conn.exec_driver_sql(
+                f'CREATE TRIGGER "{name}" AFTER DELETE OR UPDATE OF {key_list} '
+                f'ON "{table_name}" FOR EACH ROW EXECUTE FUNCTION "{name}"()'
+            )
+            created.append(name)
+
+        return created
+
+    async def enable(self) -> List[str]:
+        """Convert the tables to monthly partitions (locks them while rows are copied)"""
+
+        converted = []
+        async with engine.begin() as conn:
+            if conn.dialect.name != "postgresql":
+                raise RuntimeError("Table partitioning needs PostgreSQL")
+
+            partitioned = await self.partitioned_tables(conn)
+            for table_name in PARTITION_COLUMNS:
+                if table_name in partitioned:
+                    continue
+                rows = await self._convert(conn, Base.metadata.tables[table_name])
+                logger.info("Partitioned table by month", extra={"table": table_name, "rows_copied": rows})
+                converted.append(table_name)
+
+            # After every conversion: converting a table drops the triggers on it
+            for table_name in PARTITION_COLUMNS:
+                await self._enforce_references(conn, table_name)
+
+        return converted
+
+    async def _archive(self, partition: str) -> bool:
+        async with engine.begin() as conn:
+            locked = (await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": _MAINTENANCE_LOCK_ID}
+            )).scalar()
+            if not locked:
+                return False
+
+            if self.archive_tablespace:
+                await conn.execute(text(f'ALTER TABLE "{partition}" SET TABLESPACE "{self.archive_tablespace}"'))
+                result = await conn.execute(text(
+                    "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"
+                ), {"table": partition})
+                for index_name, in result.all():
+                    await conn.execute(text(f'ALTER INDEX "{index_name}" SET TABLESPACE "{self.archive_tablespace}"'))
+            await conn.execute(text(f"COMMENT ON TABLE \"{partition}\" IS '{ARCHIVED_COMMENT}'"))
+
+        logger.info("Archived partition", extra={"partition": partition})
+        return True
+
+    async def maintain(self, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """Create upcoming partitions and archive old ones; a no-op until enabled"""
+
+        this_month = _month_start(now or datetime.utcnow())
+        created: List[str] = []
+        to_archive: List[str] = []
+
+        async with engine.begin() as conn:
+            if conn.dialect.name != "postgresql":
+                return {"created": created, "archived": []}
+
+            locked = (await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": _MAINTENANCE_LOCK_ID}
+            )).scalar()
+            if not locked:
+                # Another process is on it
+                return {"created": created, "archived": []}
+
+            archive_before = _add_months(this_month, -self.archive_after_months)
+            for table_name in sorted(await self.partitioned_tables(conn) & PARTITION_COLUMNS.keys()):
+                table = Base.metadata.tables[table_name]
+                enforced = await self._enforce_references(conn, table_name)
+                if enforced:
+                    logger.info("Created foreign key triggers", extra={"triggers": enforced})
+                partitions = await self._partitions(conn, table_name)
+
+                # Last month too: engagement rollups of recent days can still land there
+                for offset in range(-1, self.premake_months + 1):
+                    month = _add_months(this_month, offset)
+                    if month not in partitions:
+                        created.append(await self._create_partition(conn, table, month))
+
+                if self.archiving:
+                    to_archive += [
+                        name for month, (name, archived) in sorted(partitions.items())
+                        if month < archive_before and not archived
+                    ]
+
+        # One transaction per partition: moving one rewrites it
+        archived = [partition for partition in to_archive if await self._archive(partition)]
+
+        if created:
+            logger.info("Created partitions", extra={"partitions": created})
+        return {"created": created, "archived": archived}
+
+    async def _closed_post_id_ranges(self) -> Optional[Tuple[List[Tuple[datetime, int, int]], datetime]]:
+        """(month, lowest id, highest id) of posts partitions no longer written to, and the
+        first month that still is; None when posts is not partitioned"""
+
+        if engine.dialect.name != "postgresql":
+            return None
+        if time.monotonic() < self._post_id_ranges_expire:
+            return self._post_id_ranges
+
+        async with self._post_id_ranges_lock:
+            if time.monotonic() < self._post_id_ranges_expire:
+                return self._post_id_ranges
+
+            id_ranges = None
+            async with engine.connect() as conn:
+                if "posts" in await self.partitioned_tables(conn):
+                    # Last month can still get rows from transactions that began in it
+                    open_from = _add_months(_month_start(datetime.utcnow()), -1)
+                    closed = []
+                    for month, (name, _) in sorted((await self._partitions(conn, "posts")).items()):
+                        if month < open_from:
+                            lowest, highest = (await conn.execute(text(f'SELECT min(id), max(id) FROM "{name}"'))).one()
+                            if lowest is not None:
+                                closed.append((month, lowest, highest))
+                    id_ranges = (closed, open_from)
+
+            self._post_id_ranges = id_ranges
+            self._post_id_ranges_expire = time.monotonic() + self.post_bounds_refresh_seconds
+            return id_ranges
+
+    async def post_bounds(self, post_ids: Collection[int]) -> Optional[Tuple[datetime, Optional[datetime]]]:
+        """created_at range [start, end) of the partitions that can hold these posts.
+
+        Posts are partitioned by created_at, so a lookup by id alone probes
+        every partition. Ids grow over time, so each closed month covers an
+        id range. None means no bound: posts is not partitioned, or an id is
+        outside every range.
+        """
+
+        id_ranges = await self._closed_post_id_ranges()
+        if id_ranges is None or not post_ids:
+            return None
+
+        closed, open_from = id_ranges
+        newest_closed_id = max((highest for _, _, highest in closed), default=0)
+        starts: List[datetime] = []
+        ends: List[Optional[datetime]] = []
+        for post_id in post_ids:
+            if post_id > newest_closed_id:
+                starts.append(open_from)
+                ends.append(None)
+                continue
+            months = [month for month, lowest, highest in closed if lowest <= post_id <= highest]
+            if not months:
+                return None
+            starts.append(min(months))
+            ends.append(_add_months(max(months), 1))
+
+        start = min(starts).replace(tzinfo=timezone.utc)
+        end = None if None in ends else max(ends).replace(tzinfo=timezone.utc)
+        return start, end
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """Partitions with their size and storage"""
+
+        async with engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                return []
+
+            rows = []
+            for table_name in sorted(await self.partitioned_tables(conn) & PARTITION_COLUMNS.keys()):
+                result = await conn.execute(text(
+                    "SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid), "
+                    "coalesce(t.spcname, 'default'), coalesce(a.amname, 'heap'), "
+                    "obj_description(c.oid, 'pg_class') "
+                    "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "LEFT JOIN pg_tablespace t ON t.oid = c.reltablespace "
+                    "LEFT JOIN pg_am a ON a.oid = c.relam "
+                    "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+                ), {"table": table_name})
+                rows += [
+                    {
+                        "table": table_name,
+                        "partition": name,
+                        "estimated_rows": max(estimated_rows, 0),
+                        "bytes": size,
+                        "tablespace": tablespace,
+                        "access_method": access_method,
+                        "archived": comment == ARCHIVED_COMMENT,
+                    }
+                    for name, estimated_rows, size, tablespace, access_method, comment in result.all()
+                ]
+            return rows
+
+
+# Singleton instance
+partition_service = PartitionService(
+    premake_months=settings.PARTITION_PREMAKE_MONTHS,
+    archive_after_months=settings.PARTITION_ARCHIVE_AFTER_MONTHS,
+    archive_tablespace=settings.PARTITION_ARCHIVE_TABLESPACE,
+    post_bounds_refresh_seconds=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+)
+
+
+async def select_posts(
+    db: AsyncSession,
+    stmt: Select,
+    post_ids: Collection[int],
+    scalars: bool = True
+) -> List[Any]:
+    """Run a select of posts by id on only the partitions that can hold them.
+
+    The bounds are a hint: if the bounded query finds fewer rows than ids,
+    it runs again on every partition. Returns the first selected entity of
+    each row (or, with scalars=False, the rows).
+    """
+
+    bounds = await partition_service.post_bounds(set(post_ids))
+    if bounds is not None:
+        start, end = bounds
+        bounded = stmt.where(Post.created_at >= start)
+        if end is not None:
+            bounded = bounded.where(Post.created_at < end)
+        result = await db.execute(bounded)
+        rows = result.scalars().all() if scalars else result.all()
+        if len(rows) >= len(set(post_ids)):
+            return rows
+
+    result = await db.execute(stmt)
+    return result.scalars().all() if scalars else result.all()
+
+
+async def select_post(db: AsyncSession, stmt: Select, post_id: int) -> Optional[Any]:
+    """select_posts for one id: the post, or None"""
+    posts = await select_posts(db, stmt, [post_id])
+    return posts[0] if posts else None
+
+
+async def attach_posts(db: AsyncSession, parents: List[Any], *options: Any) -> None:
+    """Load the `post` of rows with a post_id (what selectinload does, bounded like select_posts)"""
+
+    post_ids = {parent.post_id for parent in parents if parent.post_id is not None}
+    if not post_ids:
+        return
+
+    stmt = select(Post).where(Post.id.in_(post_ids)).options(*options)
+    posts = {post.id: post for post in await select_posts(db, stmt, post_ids)}
+    for parent in parents:
+        set_committed_value(parent, "post", posts.get(parent.post_id))
+
+
+async def main() -> None:
+    setup_logging()
+    import app.models.user  # noqa: F401 (registers the users table)
+
+    parser = argparse.ArgumentParser(description="Monthly partitioning of posts and engagement rollups")
+    parser.add_argument(
+        "command",
+        choices=["enable", "maintain", "status"],
+        help="enable: convert the tables (once, during maintenance); "
+             "maintain: create upcoming partitions and archive old ones; status: list partitions"
+    )
+    args = parser.parse_args()
+
+    if args.command == "enable":
+        converted = await partition_service.enable()
+        print(f"✅ Partitioned: {', '.join(converted) or 'nothing to do'}")
+        print(f"✅ Maintenance: {await partition_service.maintain()}")
+    elif args.command == "maintain":
+        print(f"✅ Maintenance: {await partition_service.maintain()}")
+    else:
+        for row in await partition_service.status():
+            print(row)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
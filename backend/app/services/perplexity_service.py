@@ -1,10 +1,13 @@
 from typing import Dict, Any, List, Optional
-from openai import OpenAI
 from datetime import datetime
 import json
+import logging
 import time
 
 from app.core.config import settings
+from app.core.tracing import SPAN_KIND_CLIENT, traced
+
+logger = logging.getLogger(__name__)
 
 
 class PerplexityService:
@@ -15,18 +18,20 @@ class PerplexityService:
         api_key_to_use = api_key or settings.PERPLEXITY_API_KEY
         if not api_key_to_use:
             self.initialization_error = "No Perplexity API key provided"
-            print(f"Warning: {self.initialization_error}")
+            logger.warning(self.initialization_error)
             return
             
         try:
+            from openai import OpenAI  # Slow to import: only loaded once the service is used
+            
             self.client = OpenAI(
                 api_key=api_key_to_use,
                 base_url="https://api.perplexity.ai"
             )
-            print("✅ Perplexity client initialized successfully")
+            logger.info("Perplexity client initialized")
         except Exception as e:
             self.initialization_error = f"Failed to initialize Perplexity client: {e}"
-            print(f"❌ {self.initialization_error}")
+            logger.error(self.initialization_error)
             self.client = None
     
     async def research_topic(
@@ -42,38 +47,11 @@ class PerplexityService:
         # Build research query
         query = self._build_research_query(topic, additional_context)
         
-        print(f"🔍 Starting research for '{topic}' using model: {settings.PERPLEXITY_MODEL}")
+        logger.info("Research started", extra={"topic": topic, "model": settings.PERPLEXITY_MODEL})
         start_time = time.time()
         
         try:
-            response = self.client.chat.completions.create(
-                model=settings.PERPLEXITY_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert researcher specializing in social media content. Focus on:
-
-FACTS & DATA:
-- Latest statistics and numbers (with dates)
-- Key metrics and percentages
-- Recent research findings
-
-TRENDS & INSIGHTS:
-- Current developments (last 6 months)
-- Industry perspectives
-- Notable changes or shifts
-
-Keep responses concise, factual, and source-backed. Prioritize recent, actionable information over general knowledge."""
-                    },
-                    {
-                        "role": "user",
-                        "content": query
-                    }
-                ],
-                temperature=0.1,  # Even lower temperature for more factual content
-                max_tokens=1500,  # Reduced tokens for faster response
-                timeout=20  # Reduced timeout for faster response
-            )
+            response = self._request(query)
             
             content = response.choices[0].message.content
             
@@ -96,13 +74,16 @@ Keep responses concise, factual, and source-backed. Prioritize recent, actionabl
             findings_count = len(research_data.get('findings', []))
             sources_count = len(research_data.get('sources', []))
             
-            print(f"✅ Research completed for '{topic}' in {duration}s - {findings_count} findings, {sources_count} sources")
+            logger.info(
+                "Research completed",
+                extra={"topic": topic, "duration_s": duration, "findings": findings_count, "sources": sources_count}
+            )
             
             return research_data
             
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Perplexity API error for '{topic}': {error_msg}")
+            logger.error("Perplexity API error", extra={"topic": topic, "error": error_msg})
             
             # Provide more specific error messages
             if "timeout" in error_msg.lower():
@@ -114,6 +95,38 @@ Keep responses concise, factual, and source-backed. Prioritize recent, actionabl
             else:
                 raise Exception(f"Research failed for '{topic}': {error_msg}")
     
+    @traced("perplexity.request", SPAN_KIND_CLIENT)
+    def _request(self, query: str) -> Any:
+        """Send a research query to the Perplexity chat completions API"""
+        return self.client.chat.completions.create(
+            model=settings.PERPLEXITY_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": """You are an expert researcher specializing in social media content. Focus on:
+
+FACTS & DATA:
+- Latest statistics and numbers (with dates)
+- Key metrics and percentages
+- Recent research findings
+
+TRENDS & INSIGHTS:
+- Current developments (last 6 months)
+- Industry perspectives
+- Notable changes or shifts
+
+Keep responses concise, factual, and source-backed. Prioritize recent, actionable information over general knowledge."""
+                },
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ],
+            temperature=0.1,  # Even lower temperature for more factual content
+            max_tokens=1500,  # Reduced tokens for faster response
+            timeout=20  # Reduced timeout for faster response
+        )
+    
     def _build_research_query(
         self,
         topic: str,
@@ -141,6 +154,7 @@ Keep responses concise, factual, and source-backed. Prioritize recent, actionabl
         
         return "\n".join(query_parts)
     
+    @traced("perplexity.parse")
     def _parse_research_response(
         self,
         content: str,
@@ -273,6 +287,3 @@ Keep responses concise, factual, and source-backed. Prioritize recent, actionabl
         return topics[:10]  # Limit to top 10
 
 
-
-# Singleton instance
-perplexity_service = PerplexityService()
\ No newline at end of file
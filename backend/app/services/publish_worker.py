@@ -0,0 +1,331 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.log import setup_logging
+from app.models.database import AsyncSessionLocal
+from app.models.content import ScheduledPost, PostStatus
+from app.services.publishers import Publisher, PublishError, get_publisher, publish_dispatcher
+from app.services.calendar_cache import calendar_cache
+from app.services.partitioning import attach_posts
+from app.services.best_times import best_time_service
+from app.services.maintenance import MaintenanceSchedule
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformRateLimiter:
+    """Token bucket per account, refilled at the platform's posts_per_hour"""
+
+    def __init__(self, burst: int):
+        self.burst = burst
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float]] = {}  # key -> (tokens, updated_at)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, publisher: Publisher) -> None:
+        key = (publisher.platform, publisher.account_id)
+        rate = publisher.posts_per_hour / 3600.0
+
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                tokens, updated_at = self._buckets.get(key, (float(self.burst), now))
+                tokens = min(float(self.burst), tokens + (now - updated_at) * rate)
+
+                if tokens >= 1:
+                    self._buckets[key] = (tokens - 1, now)
+                    return
+
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / rate
+
+            await asyncio.sleep(wait)
+
+
+class WorkerStats:
+    """Throughput and claim latency counters for one worker"""
+
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+        self.started_at = time.monotonic()
+        self.batches = 0
+        self.claimed = 0
+        self.published = 0
+        self.failed = 0
+        self.retried = 0
+        self.claim_query_seconds = 0.0
+        self.due_lag_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "worker_id": self.worker_id,
+            "uptime_seconds": round(uptime, 1),
+            "batches": self.batches,
+            "claimed": self.claimed,
+            "published": self.published,
+            "failed": self.failed,
+            "retried": self.retried,
+            "throughput_per_minute": round(self.published / uptime * 60, 2),
+            "avg_claim_query_ms": round(self.claim_query_seconds / self.batches * 1000, 2) if self.batches else 0.0,
+            "avg_due_lag_seconds": round(self.due_lag_seconds / self.claimed, 2) if self.claimed else 0.0
+        }
+
+
+# Workers running in this process, for stats reporting
+local_workers: List["PublishWorker"] = []
+
+
+class PublishWorker:
+    """Claims due scheduled posts in batches and publishes them.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and stamped with a
+    claim token (stored in celery_task_id) and a lease. Several workers can
+    run against the same database without double-posting; rows whose lease
+    expired (crashed worker) become claimable again. Failed publishes are
+    retried with exponential backoff up to max_attempts.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: int = settings.PUBLISH_WORKER_BATCH_SIZE,
+        lease_seconds: int = settings.PUBLISH_WORKER_LEASE_SECONDS,
+        poll_interval_seconds: float = settings.PUBLISH_WORKER_POLL_INTERVAL_SECONDS,
+        max_attempts: int = settings.PUBLISH_MAX_ATTEMPTS,
+        backoff_base_seconds: float = settings.PUBLISH_RETRY_BACKOFF_SECONDS
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+
+        self.stats = WorkerStats(self.worker_id)
+        self.rate_limiter = PlatformRateLimiter(burst=settings.PUBLISH_RATE_LIMIT_BURST)
+
+    async def claim(self, scheduled_post_ids: Optional[List[int]] = None) -> Tuple[str, List[int]]:
+        """Claim a batch of due rows (optionally restricted to the given ids)"""
+
+        now = datetime.utcnow()
+        token = f"{self.worker_id}:{uuid.uuid4().hex}"
+        claimable = (
+            (ScheduledPost.is_posted == False)
+            & (ScheduledPost.scheduled_time <= now)
+            & (ScheduledPost.attempts < self.max_attempts)
+            & or_(ScheduledPost.next_attempt_at.is_(None), ScheduledPost.next_attempt_at <= now)
+            & or_(ScheduledPost.celery_task_id.is_(None), ScheduledPost.lease_expires_at < now)
+        )
+
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(ScheduledPost.id)
+                .where(claimable)
+                .order_by(ScheduledPost.scheduled_time)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            if scheduled_post_ids is not None:
+                stmt = stmt.where(ScheduledPost.id.in_(scheduled_post_ids))
+
+            candidate_ids = (await db.execute(stmt)).scalars().all()
+            if not candidate_ids:
+                await db.rollback()
+                self.stats.claim_query_seconds += time.perf_counter() - started
+                self.stats.batches += 1
+                return token, []
+
+            # Re-check the claim condition so backends without SKIP LOCKED stay safe
+            await db.execute(
+                update(ScheduledPost)
+                .where(ScheduledPost.id.in_(candidate_ids))
+                .where(claimable)
+                .values(
+                    celery_task_id=token,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            result = await db.execute(
+                select(ScheduledPost.id, ScheduledPost.scheduled_time)
+                .where(ScheduledPost.celery_task_id == token)
+            )
+            claimed = result.all()
+
+        self.stats.claim_query_seconds += time.perf_counter() - started
+        self.stats.batches += 1
+        self.stats.claimed += len(claimed)
+        for _, scheduled_time in claimed:
+            self.stats.due_lag_seconds += max((now - scheduled_time.replace(tzinfo=None)).total_seconds(), 0)
+
+        return token, [scheduled_post_id for scheduled_post_id, _ in claimed]
+
+    async def process(self, token: str, scheduled_post_ids: List[int]) -> Dict[int, datetime]:
+        """Publish claimed rows and record the outcomes in one transaction.
+
+        Returns {scheduled_post_id: next_attempt_at} for rows that will be retried.
+        """
+
+        retries: Dict[int, datetime] = {}
+        if not scheduled_post_ids:
+            return retries
+
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(ScheduledPost)
+                .where(ScheduledPost.id.in_(scheduled_post_ids))
+                .where(ScheduledPost.celery_task_id == token)
+                .options(selectinload(ScheduledPost.user))
+            )
+            result = await db.execute(stmt)
+            scheduled_posts = result.scalars().all()
+            await attach_posts(db, scheduled_posts)
+
+            targets = []
+            pending = []
+            for scheduled_post in scheduled_posts:
+                post = scheduled_post.post
+                scheduled_post.celery_task_id = None
+                scheduled_post.lease_expires_at = None
+
+                if post is None:
+                    self._give_up(scheduled_post, "Post no longer exists")
+                    continue
+
+                if post.status == PostStatus.PUBLISHED:
+                    # Already published manually
+                    scheduled_post.is_posted = True
+                    continue
+
+                try:
+                    publisher = get_publisher(post.platform.value, scheduled_post.user)
+                except PublishError as e:
+                    self._give_up(scheduled_post, str(e))
+                    continue
+
+                targets.append((publisher, post.content))
+                pending.append(scheduled_post)
+
+            outcomes = await publish_dispatcher.fan_out(
+                targets, throttle=self.rate_limiter.acquire
+            ) if targets else []
+
+            now = datetime.utcnow()
+            published = []
+            for scheduled_post, outcome in zip(pending, outcomes):
+                post = scheduled_post.post
+                if outcome["success"]:
+                    scheduled_post.is_posted = True
+                    scheduled_post.error_message = None
+                    scheduled_post.next_attempt_at = None
+                    post.platform_post_id = outcome["platform_post_id"]
+                    post.status = PostStatus.PUBLISHED
+                    post.published_at = now
+                    self.stats.published += 1
+                    published.append(post)
+                    continue
+
+                scheduled_post.attempts = (scheduled_post.attempts or 0) + 1
+                scheduled_post.error_message = outcome["error"]
+
+                # Client errors (e.g. content too long) will not succeed on retry
+                retryable = outcome["status_code"] >= 500
+                if retryable and scheduled_post.attempts < self.max_attempts:
+                    delay = self.backoff_base_seconds * (2 ** (scheduled_post.attempts - 1))
+                    scheduled_post.next_attempt_at = now + timedelta(seconds=delay)
+                    retries[scheduled_post.id] = scheduled_post.next_attempt_at
+                    self.stats.retried += 1
+                else:
+                    self._give_up(scheduled_post, outcome["error"])
+
+            await best_time_service.record_published(db, published)
+            await db.commit()
+
+        # Published/failed state shows on the calendar
+        for user_id in {scheduled_post.user_id for scheduled_post in scheduled_posts}:
+            calendar_cache.invalidate(user_id)
+
+        return retries
+
+    def _give_up(self, scheduled_post: ScheduledPost, error: str) -> None:
+        scheduled_post.error_message = error
+        scheduled_post.attempts = self.max_attempts
+        scheduled_post.next_attempt_at = None
+        if scheduled_post.post is not None:
+            scheduled_post.post.status = PostStatus.FAILED
+        self.stats.failed += 1
+
+    async def _renew_lease(self, token: str) -> None:
+        """Keep extending the lease while a (possibly rate limited) batch is in flight"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(ScheduledPost)
+                    .where(ScheduledPost.celery_task_id == token)
+                    .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+
+    async def run_once(self, scheduled_post_ids: Optional[List[int]] = None) -> Tuple[int, Dict[int, datetime]]:
+        """Claim and publish one batch; returns (claimed count, retries)"""
+        token, claimed_ids = await self.claim(scheduled_post_ids)
+        if not claimed_ids:
+            return 0, {}
+
+        heartbeat = asyncio.create_task(self._renew_lease(token))
+        try:
+            retries = await self.process(token, claimed_ids)
+        finally:
+            heartbeat.cancel()
+
+        return len(claimed_ids), retries
+
+    async def run_forever(self) -> None:
+        """Poll for due rows; drain back-to-back batches while a backlog remains (catch-up)"""
+
+        local_workers.append(self)
+        last_report = time.monotonic()
+        maintenance = MaintenanceSchedule(materialize_interval_seconds=settings.SCHEDULER_LOOKAHEAD_SECONDS / 2)
+        while True:
+            try:
+                await maintenance.run_due(datetime.utcnow() + timedelta(seconds=settings.SCHEDULER_LOOKAHEAD_SECONDS))
+                claimed_count, _ = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Publish worker error", extra={"worker_id": self.worker_id})
+                claimed_count = 0
+
+            if time.monotonic() - last_report >= settings.PUBLISH_WORKER_STATS_INTERVAL_SECONDS:
+                logger.info("Publish worker stats", extra=self.stats.to_dict())
+                last_report = time.monotonic()
+
+            # A full batch means there is a backlog: keep draining (rate limits still apply)
+            if claimed_count < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+
+async def main() -> None:
+    setup_logging()
+    worker = PublishWorker()
+    logger.info("Publish worker started", extra={"worker_id": worker.worker_id})
+    await worker.run_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
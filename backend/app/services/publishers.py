@@ -0,0 +1,287 @@
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple, Type
+from abc import ABC, abstractmethod
+import asyncio
+
+from app.core.tracing import SPAN_KIND_CLIENT, span
+from app.models.user import User
+from app.services.registry import twitter_service
+from app.services.linkedin_service import LinkedInService
+
+
+class PublishError(Exception):
+    """Raised when a post cannot be published to a platform"""
+
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class Publisher(ABC):
+    """A single connected account on a social platform"""
+
+    platform: str = ""
+    display_name: str = ""
+
+    # Platform limits
+    character_limit: int = 0
+    posts_per_day: int = 0
+    posts_per_hour: int = 0
+
+    # Maximum number of in-flight publishes per platform
+    max_concurrency: int = 1
+
+    # Capability flags
+    supports_hashtags: bool = False
+    supports_threads: bool = False
+    supports_metrics: bool = False
+    supports_delete: bool = False
+
+    def __init__(self, account_id: str):
+        self.account_id = account_id
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Check whether this account can publish right now"""
+
+    @property
+    def unavailable_reason(self) -> str:
+        return f"{self.display_name} service not available. Please check your API credentials."
+
+    @abstractmethod
+    async def _publish(self, content: str) -> Dict[str, Any]:
+        """Publish content and return platform_post_id and url"""
+
+    @abstractmethod
+    async def validate_credentials(self) -> bool:
+        """Validate the account credentials against the platform"""
+
+    async def fetch_metrics(self, platform_post_id: str) -> Dict[str, int]:
+        """Get likes/shares/comments/impressions for a published post"""
+        raise PublishError(
+            f"Metrics are not supported for {self.display_name}", status_code=400
+        )
+
+    def check_content(self, content: str) -> None:
+        """Reject content that the platform would refuse"""
+        if len(content) > self.character_limit:
+            raise PublishError(
+                f"Content too long for {self.display_name}: "
+                f"{len(content)} characters (max {self.character_limit})",
+                status_code=400
+            )
+
+    async def publish(self, content: str) -> Dict[str, Any]:
+        """Publish content to this account"""
+        if not self.is_available():
+            raise PublishError(self.unavailable_reason, status_code=503)
+
+        self.check_content(content)
+        return await self._publish(content)
+
+    @classmethod
+    def get_limits(cls) -> Dict[str, Any]:
+        """Get character limits, posting limits and capabilities"""
+        return {
+            "character_limit": cls.character_limit,
+            "posts_per_day": cls.posts_per_day,
+            "posts_per_hour": cls.posts_per_hour,
+            "capabilities": {
+                "hashtags": cls.supports_hashtags,
+                "threads": cls.supports_threads,
+                "metrics": cls.supports_metrics,
+                "delete": cls.supports_delete
+            }
+        }
+
+
+class TwitterPublisher(Publisher):
+    platform = "twitter"
+    display_name = "X/Twitter"
+
+    character_limit = 280
+    posts_per_day = 2400  # API limit
+    posts_per_hour = 300
+
+    max_concurrency = 4
+
+    supports_threads = True
+    supports_metrics = True
+    supports_delete = True
+
+    def __init__(self, account_id: str = "default"):
+        super().__init__(account_id)
+        self.service = twitter_service
+
+    @property
+    def unavailable_reason(self) -> str:
+        return "Twitter service not available. Please check your API credentials."
+
+    def is_available(self) -> bool:
+        return self.service.is_available()
+
+    async def _publish(self, content: str) -> Dict[str, Any]:
+        result = await self.service.publish_tweet(content)
+        return {
+            "platform_post_id": result["platform_post_id"],
+            "url": result["url"]
+        }
+
+    async def validate_credentials(self) -> bool:
+        test_result = await self.service.test_connection()
+        return test_result.get("success", False)
+
+    async def fetch_metrics(self, platform_post_id: str) -> Dict[str, int]:
+        stats = await self.service.get_tweet_stats(platform_post_id)
+        metrics = stats["metrics"]
+        return {
+            "likes": metrics["like_count"],
+            "shares": metrics["retweet_count"] + metrics["quote_count"],
+            "comments": metrics["reply_count"],
+            "impressions": metrics["impression_count"]
+        }
+
+
+class LinkedInPublisher(Publisher):
+    platform = "linkedin"
+    display_name = "LinkedIn"
+
+    character_limit = 3000
+    posts_per_day = 100  # Conservative estimate
+    posts_per_hour = 25
+
+    max_concurrency = 2
+
+    supports_hashtags = True
+    supports_metrics = True
+
+    def __init__(self, account_id: str, access_token: Optional[str]):
+        super().__init__(account_id)
+        self.service = LinkedInService(access_token)
+
+    @property
+    def unavailable_reason(self) -> str:
+        return "LinkedIn account not connected. Please add your LinkedIn access token."
+
+    def is_available(self) -> bool:
+        return bool(self.service.access_token)
+
+    async def _publish(self, content: str) -> Dict[str, Any]:
+        # LinkedIn needs the member URN of the author
+        try:
+            user_info = await self.service.get_user_info()
+        except Exception as e:
+            raise PublishError(str(e), status_code=502)
+
+        result = await self.service.post_to_linkedin(content, user_info["id"])
+        if not result["success"]:
+            raise PublishError(result["error"], status_code=502)
+
+        return {
+            "platform_post_id": result["platform_post_id"],
+            "url": result["url"]
+        }
+
+    async def validate_credentials(self) -> bool:
+        return await self.service.validate_credentials()
+
+    async def fetch_metrics(self, platform_post_id: str) -> Dict[str, int]:
+        return await self.service.get_post_metrics(platform_post_id)
+
+
+PUBLISHERS: Dict[str, Type[Publisher]] = {
+    TwitterPublisher.platform: TwitterPublisher,
+    LinkedInPublisher.platform: LinkedInPublisher
+}
+
+
+def get_publisher(platform: str, user: User) -> Publisher:
+    """Get the publisher for a user's account on a platform"""
+
+    platform = platform.lower()
+
+    if platform == TwitterPublisher.platform:
+        # Tweets go out through the app-level X credentials
+        return TwitterPublisher()
+
+    if platform == LinkedInPublisher.platform:
+        return LinkedInPublisher(str(user.id), user.linkedin_access_token)
+
+    raise PublishError(f"Publishing not supported for platform: {platform}", status_code=400)
+
+
+def get_connected_publishers(user: User, platforms: List[str]) -> List[Publisher]:
+    """Get publishers for the user's account on each of the given platforms.
+
+    Users have a single account per platform (LinkedIn through their own
+    token, X through the app-level credentials), so this is one publisher
+    per platform.
+    """
+    return [get_publisher(platform, user) for platform in platforms]
+
+
+class PublishDispatcher:
+    """Publishes to many accounts concurrently with per-platform concurrency caps"""
+
+    def __init__(self):
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_semaphore(self, publisher: Publisher) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(publisher.platform)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(publisher.max_concurrency)
+            self._semaphores[publisher.platform] = semaphore
+        return semaphore
+
+    async def publish(
+        self,
+        publisher: Publisher,
+        content: str,
+        throttle: Optional[Callable[[Publisher], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Publish to one account, waiting for a free platform slot.
+
+        throttle, if given, is awaited before taking the slot (e.g. to wait
+        for rate limit budget).
+        """
+        if throttle is not None:
+            await throttle(publisher)
+
+        async with self._get_semaphore(publisher):
+            with span(f"publish.{publisher.platform}", SPAN_KIND_CLIENT, account_id=str(publisher.account_id)):
+                return await publisher.publish(content)
+
+    async def fan_out(
+        self,
+        targets: List[Tuple[Publisher, str]],
+        throttle: Optional[Callable[[Publisher], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Publish (publisher, content) pairs concurrently.
+
+        Returns one outcome per target, in order. Failures are reported in the
+        outcome instead of being raised so one bad account cannot sink the rest.
+        """
+        results = await asyncio.gather(
+            *[self.publish(publisher, content, throttle) for publisher, content in targets],
+            return_exceptions=True
+        )
+
+        outcomes = []
+        for (publisher, _), result in zip(targets, results):
+            outcome = {
+                "platform": publisher.platform,
+                "account_id": publisher.account_id
+            }
+            if isinstance(result, BaseException):
+                outcome["success"] = False
+                outcome["error"] = str(result)
+                outcome["status_code"] = getattr(result, "status_code", 500)
+            else:
+                outcome["success"] = True
+                outcome.update(result)
+            outcomes.append(outcome)
+
+        return outcomes
+
+
+# Singleton instance
+publish_dispatcher = PublishDispatcher()
@@ -0,0 +1,322 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+import logging
+import re
+
+from dateutil import tz
+from dateutil.rrule import rrule, rrulestr
+from sqlalchemy import select, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from app.core.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.content import (
+    Post,
+    PostStatus,
+    ScheduledPost,
+    RecurringSchedule,
+    RecurrenceException
+)
+from app.services.calendar_cache import calendar_cache
+from app.services.partitioning import attach_posts
+from app.services.schedule_index import schedule_index
+from app.services.slot_allocator import to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+# Sub-hourly series would flood the platforms (and the look-ahead window)
+_DISALLOWED_FREQ = re.compile(r"FREQ=(SECONDLY|MINUTELY)", re.IGNORECASE)
+
+
+class Occurrence(NamedTuple):
+    recurring_schedule_id: int
+    occurrence_time: datetime  # Original time generated by the rule (naive UTC)
+    scheduled_time: datetime  # After overrides (naive UTC)
+    content: Optional[str]  # Overridden content, if any
+    index: Optional[int]  # Position in the series (None for occurrences moved into range)
+
+
+def get_zone(name: str) -> tz.tzfile:
+    zone = tz.gettz(name)
+    if zone is None:
+        raise ValueError(f"Unknown timezone: {name}")
+    return zone
+
+
+def parse_rule(rule: str, dtstart: datetime, timezone_name: str) -> rrule:
+    """Parse an RRULE evaluated in the given timezone (raises ValueError if invalid)"""
+
+    if "DTSTART" in rule.upper() or "\n" in rule.strip():
+        raise ValueError("Pass a single RRULE; the start time is given separately")
+    if _DISALLOWED_FREQ.search(rule):
+        raise ValueError("Recurrence must not be more frequent than hourly")
+
+    zone = get_zone(timezone_name)
+    local_start = to_utc_naive(dtstart).replace(tzinfo=timezone.utc).astimezone(zone)
+    parsed = rrulestr(rule, dtstart=local_start)
+    if not isinstance(parsed, rrule):
+        raise ValueError("Pass a single RRULE")
+    return parsed
+
+
+def iter_rule(
+    schedule: RecurringSchedule,
+    start: datetime,
+    end: datetime
+) -> Iterator[Tuple[int, datetime]]:
+    """Lazily yield (index, naive UTC time) for raw occurrences in [start, end).
+
+    Iteration starts at the schedule's anchor (a recent occurrence) instead of
+    dtstart, so the cost depends on how far ahead we look, not on how long the
+    series has been running.
+    """
+
+    rule = parse_rule(schedule.rrule, schedule.anchor_time, schedule.timezone)
+
+    # COUNT is relative to the original dtstart
+    count = getattr(rule, "_count", None)
+    if count is not None:
+        if count <= schedule.anchor_index:
+            return
+        rule = rule.replace(count=count - schedule.anchor_index)
+
+    start = to_utc_naive(start)
+    end = to_utc_naive(end)
+    for index, local_time in enumerate(rule, start=schedule.anchor_index):
+        occurrence_time = local_time.astimezone(timezone.utc).replace(tzinfo=None)
+        if occurrence_time >= end:
+            return
+        if occurrence_time >= start:
+            yield index, occurrence_time
+
+
+def expand(
+    schedule: RecurringSchedule,
+    start: datetime,
+    end: datetime,
+    exceptions: Dict[datetime, RecurrenceException]
+) -> Iterator[Occurrence]:
+    """Yield occurrences scheduled in [start, end) with skips and overrides applied.
+
+    exceptions is keyed by original occurrence time (naive UTC) and must
+    include every exception whose original or overridden time is in range.
+    """
+
+    start = to_utc_naive(start)
+    end = to_utc_naive(end)
+
+    for index, occurrence_time in iter_rule(schedule, start, end):
+        exception = exceptions.get(occurrence_time)
+        if exception is None:
+            yield Occurrence(schedule.id, occurrence_time, occurrence_time, None, index)
+            continue
+
+        if exception.is_skipped:
+            continue
+
+        scheduled_time = to_utc_naive(exception.override_time or occurrence_time)
+        if start <= scheduled_time < end:
+            yield Occurrence(schedule.id, occurrence_time, scheduled_time, exception.override_content, index)
+
+    # Occurrences moved into the range from outside of it. Ones from before
+    # materialized_until already exist as ScheduledPost rows.
+    materialized_until = to_utc_naive(schedule.materialized_until)
+    for occurrence_time, exception in exceptions.items():
+        if exception.is_skipped or exception.override_time is None:
+            continue
+        if start <= occurrence_time < end or occurrence_time < materialized_until:
+            continue
+        scheduled_time = to_utc_naive(exception.override_time)
+        if start <= scheduled_time < end:
+            yield Occurrence(schedule.id, occurrence_time, scheduled_time, exception.override_content, None)
+
+
+def is_occurrence(schedule: RecurringSchedule, occurrence_time: datetime) -> bool:
+    """Check whether the rule generates the given time"""
+    occurrence_time = to_utc_naive(occurrence_time)
+    return any(
+        True for _ in iter_rule(schedule, occurrence_time, occurrence_time + timedelta(seconds=1))
+    )
+
+
+async def load_exceptions(
+    db: AsyncSession,
+    schedule_ids: List[int],
+    start: datetime,
+    end: datetime
+) -> Dict[int, Dict[datetime, RecurrenceException]]:
+    """Exceptions affecting [start, end), grouped by schedule and original time"""
+
+    grouped: Dict[int, Dict[datetime, RecurrenceException]] = {
+        schedule_id: {} for schedule_id in schedule_ids
+    }
+    if not schedule_ids:
+        return grouped
+
+    stmt = (
+        select(RecurrenceException)
+        .where(RecurrenceException.recurring_schedule_id.in_(schedule_ids))
+        .where(or_(
+            (RecurrenceException.occurrence_time >= start) & (RecurrenceException.occurrence_time < end),
+            (RecurrenceException.override_time >= start) & (RecurrenceException.override_time < end)
+        ))
+    )
+    for exception in (await db.execute(stmt)).scalars().all():
+        grouped[exception.recurring_schedule_id][to_utc_naive(exception.occurrence_time)] = exception
+
+    return grouped
+
+
+class RecurrenceService:
+    """Materializes recurring schedule occurrences just ahead of publish time"""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    async def materialize(
+        self,
+        window_end: datetime,
+        schedule_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, datetime]]:
+        """Create ScheduledPost rows for occurrences due before window_end.
+
+        Returns (scheduled_post_id, scheduled_time) for the new rows.
+        """
+
+        created: List[Tuple[int, datetime]] = []
+        while True:
+            schedule_count, batch = await self._materialize_batch(to_utc_naive(window_end), schedule_ids)
+            created.extend(batch)
+            if schedule_count < self.batch_size:
+                break
+
+        if created:
+            logger.info("Materialized recurring occurrences", extra={"count": len(created)})
+
+        return created
+
+    async def _materialize_batch(
+        self,
+        window_end: datetime,
+        schedule_ids: Optional[List[int]]
+    ) -> Tuple[int, List[Tuple[int, datetime]]]:
+        """Materialize one batch of schedules.
+
+        Schedules are claimed with FOR UPDATE SKIP LOCKED, and the unique
+        (recurring_schedule_id, occurrence_time) constraint backs it up on
+        databases without row locks.
+        """
+
+        created: List[ScheduledPost] = []
+
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(RecurringSchedule)
+                .where(RecurringSchedule.is_active == True)
+                .where(RecurringSchedule.materialized_until < window_end)
+                .order_by(RecurringSchedule.materialized_until)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            if schedule_ids is not None:
+                stmt = stmt.where(RecurringSchedule.id.in_(schedule_ids))
+
+            schedules = (await db.execute(stmt)).scalars().all()
+            if not schedules:
+                await db.rollback()
+                return 0, []
+            await attach_posts(db, schedules, undefer(Post.research_data))
+
+            window_start = min(to_utc_naive(schedule.materialized_until) for schedule in schedules)
+            exceptions = await load_exceptions(
+                db, [schedule.id for schedule in schedules], window_start, window_end
+            )
+
+            for schedule in schedules:
+                template = schedule.post
+                anchor: Optional[Tuple[int, datetime]] = None
+
+                for occurrence in expand(
+                    schedule, schedule.materialized_until, window_end, exceptions[schedule.id]
+                ):
+                    scheduled_post = ScheduledPost(
+                        post=Post(
+                            user_id=schedule.user_id,
+                            topic=template.topic,
+                            content=occurrence.content or template.content,
+                            platform=template.platform,
+                            research_data=template.research_data,
+                            status=PostStatus.SCHEDULED
+                        ),
+                        user_id=schedule.user_id,
+                        scheduled_time=occurrence.scheduled_time,
+                        recurring_schedule_id=schedule.id,
+                        occurrence_time=occurrence.occurrence_time
+                    )
+                    db.add(scheduled_post)
+                    created.append(scheduled_post)
+
+                    if occurrence.index is not None:
+                        anchor = (occurrence.index, occurrence.occurrence_time)
+
+                # Restart future expansions from the latest occurrence
+                if anchor is not None:
+                    schedule.anchor_index, schedule.anchor_time = anchor
+                schedule.materialized_until = window_end
+
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Another scheduler materialized the same occurrences first
+                await db.rollback()
+                return 0, []
+
+        for user_id in {schedule.user_id for schedule in schedules}:
+            calendar_cache.invalidate(user_id)
+            schedule_index.invalidate(user_id)
+
+        return len(schedules), [
+            (scheduled_post.id, scheduled_post.scheduled_time) for scheduled_post in created
+        ]
+
+    async def preview(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        max_per_schedule: int = 500
+    ) -> List[Tuple[RecurringSchedule, Occurrence]]:
+        """Occurrences in [start, end) that are not materialized yet (for the calendar)"""
+
+        stmt = (
+            select(RecurringSchedule)
+            .where(RecurringSchedule.user_id == user_id)
+            .where(RecurringSchedule.is_active == True)
+            .where(RecurringSchedule.materialized_until < end)
+        )
+        schedules = (await db.execute(stmt)).scalars().all()
+        if not schedules:
+            return []
+        await attach_posts(db, schedules)
+
+        start = to_utc_naive(start)
+        end = to_utc_naive(end)
+        exceptions = await load_exceptions(db, [schedule.id for schedule in schedules], start, end)
+
+        occurrences = []
+        for schedule in schedules:
+            # Earlier occurrences are real ScheduledPost rows
+            lower = max(start, to_utc_naive(schedule.materialized_until))
+            for occurrence in islice(expand(schedule, lower, end, exceptions[schedule.id]), max_per_schedule):
+                occurrences.append((schedule, occurrence))
+
+        occurrences.sort(key=lambda item: item[1].scheduled_time)
+        return occurrences
+
+
+# Singleton instance
+recurrence_service = RecurrenceService(batch_size=settings.SCHEDULER_BATCH_SIZE)
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional
+import importlib
+
+
+class ServiceRegistry:
+    """Services built on first use, with their modules imported only then.
+
+    Provider SDKs (anthropic, openai, google-genai, tweepy) take seconds to
+    import and their clients print banners when built, so services that use
+    them are registered by the dotted path of their class instead of being
+    constructed at import time. Startup then only pays for what a request
+    actually needs.
+    """
+
+    def __init__(self):
+        self._paths: Dict[str, str] = {}
+        self._instances: Dict[str, Any] = {}
+
+    def register(self, name: str, path: str) -> "LazyService":
+        """Register "package.module:ClassName"; returns a stand-in for the shared instance"""
+        self._paths[name] = path
+        return LazyService(self, name)
+
+    def service_class(self, name: str) -> type:
+        module_name, _, class_name = self._paths[name].partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def get(self, name: str) -> Any:
+        """The shared instance, built with default settings on first call"""
+        instance = self._instances.get(name)
+        if instance is None:
+            instance = self._instances[name] = self.service_class(name)()
+        return instance
+
+    def create(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """A separate instance, e.g. one using a user's own API key"""
+        return self.service_class(name)(*args, **kwargs)
+
+    def loaded(self) -> List[str]:
+        return list(self._instances)
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Drop built instances so the next use rebuilds them (e.g. after settings change)"""
+        if name is None:
+            self._instances.clear()
+        else:
+            self._instances.pop(name, None)
+
+
+class LazyService:
+    """Stands in for a registered service; attribute access builds it"""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry.get(self._name), attribute)
+
+    def __repr__(self) -> str:
+        return f"<LazyService {self._name!r}>"
+
+
+services = ServiceRegistry()
+
+# Singleton instances (built on first use)
+ai_service = services.register("ai", "app.services.ai_service:UnifiedAIService")
+claude_service = services.register("claude", "app.services.claude_service:ClaudeService")
+perplexity_service = services.register("perplexity", "app.services.perplexity_service:PerplexityService")
+twitter_service = services.register("twitter", "app.services.twitter_service:TwitterService")
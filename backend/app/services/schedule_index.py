@@ -0,0 +1,125 @@
+from typing import Collection, Dict, List, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict
+import bisect
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.content import Post, ScheduledPost
+from app.services.slot_allocator import to_utc_naive
+
+# Sorts after every real id, for bisecting past all entries at a time
+_MAX_ID = float("inf")
+
+
+class UserSchedule:
+    """One user's scheduled times, kept sorted per platform as (time, scheduled_post_id)"""
+
+    def __init__(self):
+        self._times: Dict[str, List[Tuple[datetime, int]]] = defaultdict(list)
+        self._entries: Dict[int, Tuple[str, datetime]] = {}
+
+    def add(self, scheduled_post_id: int, platform: str, when: datetime) -> None:
+        self.remove(scheduled_post_id)
+        when = to_utc_naive(when)
+        bisect.insort(self._times[platform], (when, scheduled_post_id))
+        self._entries[scheduled_post_id] = (platform, when)
+
+    def remove(self, scheduled_post_id: int) -> None:
+        entry = self._entries.pop(scheduled_post_id, None)
+        if entry is None:
+            return
+
+        platform, when = entry
+        times = self._times[platform]
+        index = bisect.bisect_left(times, (when, scheduled_post_id))
+        if index < len(times) and times[index] == (when, scheduled_post_id):
+            del times[index]
+
+    def _range(self, platform: str, start: datetime, end: datetime) -> List[Tuple[datetime, int]]:
+        """Entries with start < time < end"""
+        times = self._times.get(platform, [])
+        low = bisect.bisect_right(times, (start, _MAX_ID))
+        high = bisect.bisect_left(times, (end,))
+        return times[low:high]
+
+    def conflicts(
+        self,
+        platform: str,
+        when: datetime,
+        within: timedelta,
+        exclude: Collection[int] = ()
+    ) -> List[Tuple[datetime, int]]:
+        """Posts strictly closer than `within` to `when` (exactly `within` apart is fine)"""
+        when = to_utc_naive(when)
+        return [
+            entry for entry in self._range(platform, when - within, when + within)
+            if entry[1] not in exclude
+        ]
+
+    def count_in_hour(self, platform: str, when: datetime, exclude: Collection[int] = ()) -> int:
+        """Posts in the clock hour containing `when`"""
+        hour = to_utc_naive(when).replace(minute=0, second=0, microsecond=0)
+        times = self._times.get(platform, [])
+        low = bisect.bisect_left(times, (hour,))
+        high = bisect.bisect_left(times, (hour + timedelta(hours=1),))
+        if not exclude:
+            return high - low
+        return sum(1 for _, scheduled_post_id in times[low:high] if scheduled_post_id not in exclude)
+
+
+class ScheduleIndex:
+    """Per-user interval index over scheduled_posts for collision checks.
+
+    A user's index is loaded with one query on first use and then kept in step
+    by the schedule routes. Entries expire after a TTL so changes made by other
+    processes (workers materializing recurring posts) are picked up.
+    """
+
+    def __init__(self, ttl_seconds: float, max_users: int):
+        self._users = TTLCache(ttl_seconds, max_users)
+
+    async def get(self, db: AsyncSession, user_id: int) -> UserSchedule:
+        user_schedule = self._users.get(user_id)
+        if user_schedule is not None:
+            return user_schedule
+
+        # Recently published posts still count against spacing
+        since = datetime.utcnow() - timedelta(days=1)
+        stmt = (
+            select(ScheduledPost.id, ScheduledPost.scheduled_time, Post.platform)
+            .join(Post, Post.id == ScheduledPost.post_id)
+            .where(ScheduledPost.user_id == user_id)
+            .where(ScheduledPost.scheduled_time >= since)
+        )
+        result = await db.execute(stmt)
+
+        user_schedule = UserSchedule()
+        for scheduled_post_id, scheduled_time, platform in result.all():
+            user_schedule.add(scheduled_post_id, platform.value, scheduled_time)
+
+        self._users.set(user_id, user_schedule)
+        return user_schedule
+
+    def add(self, user_id: int, scheduled_post_id: int, platform: str, when: datetime) -> None:
+        user_schedule = self._users.get(user_id)
+        if user_schedule is not None:
+            user_schedule.add(scheduled_post_id, platform, when)
+
+    def remove(self, user_id: int, scheduled_post_id: int) -> None:
+        user_schedule = self._users.get(user_id)
+        if user_schedule is not None:
+            user_schedule.remove(scheduled_post_id)
+
+    def invalidate(self, user_id: int) -> None:
+        self._users.delete(user_id)
+
+
+# Singleton instance
+schedule_index = ScheduleIndex(
+    ttl_seconds=settings.SCHEDULE_INDEX_TTL_SECONDS,
+    max_users=settings.SCHEDULE_INDEX_MAX_USERS
+)
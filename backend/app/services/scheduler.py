@@ -0,0 +1,198 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import asyncio
+import heapq
+import logging
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.content import ScheduledPost
+from app.services.publish_worker import PublishWorker, local_workers
+from app.services.maintenance import MaintenanceSchedule
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value: datetime) -> float:
+    """Epoch seconds for a scheduled_time (naive values are UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ScheduleDispatcher:
+    """Publishes scheduled posts at their scheduled_time.
+
+    Upcoming rows inside the look-ahead window are kept in a min-heap keyed by
+    due time. The database is only read when the window rolls over; schedule
+    and cancel calls update the heap in place. Superseded heap entries are
+    skipped lazily using a per-post version number.
+    """
+
+    def __init__(self, lookahead_seconds: int, batch_size: int):
+        self.lookahead_seconds = lookahead_seconds
+        self.batch_size = batch_size
+
+        self._heap: List[Tuple[float, int, int]] = []  # (due_ts, scheduled_post_id, version)
+        self._versions: Dict[int, int] = {}
+        self._next_version = 0
+        self._window_end = 0.0
+        # Materialize on every window load, so occurrences entering the window become rows
+        self._maintenance = MaintenanceSchedule(materialize_interval_seconds=0)
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.worker = PublishWorker(batch_size=batch_size)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        local_workers.append(self.worker)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def schedule(self, scheduled_post_id: int, scheduled_time: datetime) -> None:
+        """Track a newly scheduled or rescheduled post"""
+
+        due_ts = _timestamp(scheduled_time)
+        if due_ts > self._window_end:
+            # Picked up when the window reaches it
+            self._versions.pop(scheduled_post_id, None)
+        else:
+            self._track(scheduled_post_id, due_ts)
+        self._wake()
+
+    def cancel(self, scheduled_post_id: int) -> None:
+        """Stop tracking a cancelled post"""
+        self._versions.pop(scheduled_post_id, None)
+        self._wake()
+
+    def _track(self, scheduled_post_id: int, due_ts: float) -> None:
+        self._next_version += 1
+        self._versions[scheduled_post_id] = self._next_version
+        heapq.heappush(self._heap, (due_ts, scheduled_post_id, self._next_version))
+
+        # Drop superseded entries once they dominate the heap
+        if len(self._heap) > 2 * len(self._versions) + 1000:
+            self._heap = [
+                entry for entry in self._heap
+                if self._versions.get(entry[1]) == entry[2]
+            ]
+            heapq.heapify(self._heap)
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _is_current(self, entry: Tuple[float, int, int]) -> bool:
+        return self._versions.get(entry[1]) == entry[2]
+
+    def _peek_due_ts(self) -> Optional[float]:
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now: float) -> List[int]:
+        due_ids = []
+        while len(due_ids) < self.batch_size:
+            due_ts = self._peek_due_ts()
+            if due_ts is None or due_ts > now:
+                break
+            _, scheduled_post_id, _ = heapq.heappop(self._heap)
+            del self._versions[scheduled_post_id]
+            due_ids.append(scheduled_post_id)
+        return due_ids
+
+    async def _load_window(self) -> None:
+        """Load unposted rows due before the end of the next window"""
+
+        window_end = datetime.utcnow() + timedelta(seconds=self.lookahead_seconds)
+
+        # Recurring occurrences become rows only once they enter the window
+        await self._maintenance.run_due(window_end)
+
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(
+                    ScheduledPost.id,
+                    ScheduledPost.scheduled_time,
+                    ScheduledPost.next_attempt_at,
+                    ScheduledPost.lease_expires_at
+                )
+                .where(ScheduledPost.is_posted == False)
+                .where(ScheduledPost.attempts < self.worker.max_attempts)
+                .where(ScheduledPost.scheduled_time <= window_end)
+            )
+            result = await db.execute(stmt)
+            rows = result.all()
+
+        self._window_end = _timestamp(window_end)
+        for scheduled_post_id, *times in rows:
+            # Due at the latest of: scheduled time, retry backoff, another worker's lease
+            self._track(scheduled_post_id, max(_timestamp(t) for t in times if t is not None))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self._wakeup.clear()
+                now = time.time()
+
+                if now >= self._window_end:
+                    await self._load_window()
+                    continue
+
+                due_ids = self._pop_due(now)
+                if due_ids:
+                    await self.dispatch(due_ids)
+                    continue
+
+                next_due_ts = self._peek_due_ts()
+                wake_at = self._window_end if next_due_ts is None else min(next_due_ts, self._window_end)
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(wake_at - now, 0))
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Schedule dispatcher error")
+                await asyncio.sleep(5)
+
+    async def dispatch(self, scheduled_post_ids: List[int]) -> None:
+        """Claim and publish a batch of due posts.
+
+        Claiming makes this safe when several replicas run a dispatcher.
+        Failed posts due for a retry are put back on the heap.
+        """
+
+        claimed_count, retries = await self.worker.run_once(scheduled_post_ids)
+
+        for scheduled_post_id, next_attempt_at in retries.items():
+            self.schedule(scheduled_post_id, next_attempt_at)
+
+        if claimed_count:
+            logger.info("Dispatched scheduled posts", extra={"claimed": claimed_count, "retries": len(retries)})
+
+
+# Singleton instance
+schedule_dispatcher = ScheduleDispatcher(
+    lookahead_seconds=settings.SCHEDULER_LOOKAHEAD_SECONDS,
+    batch_size=settings.SCHEDULER_BATCH_SIZE
+)
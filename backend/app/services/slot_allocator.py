@@ -0,0 +1,158 @@
+from typing import TYPE_CHECKING, Collection, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict
+import bisect
+
+if TYPE_CHECKING:
+    from app.services.schedule_index import UserSchedule
+
+HOURS_PER_WEEK = 7 * 24
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (naive values are assumed to be UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def hour_of_week(value: datetime) -> int:
+    """Hour of the week in UTC (0 = Monday 00:00)"""
+    value = to_utc_naive(value)
+    return value.weekday() * 24 + value.hour
+
+
+def _hour_bucket(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class SlotAllocator:
+    """Picks posting slots that respect per-platform spacing and hourly caps.
+
+    Occupied times are kept in a sorted list per platform so the spacing check
+    is a bisect, and in per-hour counters for the cap check. Posts that are
+    already scheduled come from `base` (the user's schedule index); ids in
+    `exclude` (rows being rescheduled) are ignored there.
+    """
+
+    def __init__(
+        self,
+        min_spacing: timedelta,
+        hourly_caps: Dict[str, int],
+        base: Optional["UserSchedule"] = None,
+        exclude: Collection[int] = ()
+    ):
+        self.min_spacing = min_spacing
+        self.hourly_caps = hourly_caps
+        self.base = base
+        self.exclude = exclude
+        self._times: Dict[str, List[datetime]] = defaultdict(list)
+        self._hour_counts: Dict[Tuple[str, datetime], int] = defaultdict(int)
+
+    def occupy(self, platform: str, when: datetime) -> None:
+        when = to_utc_naive(when)
+        bisect.insort(self._times[platform], when)
+        self._hour_counts[(platform, _hour_bucket(when))] += 1
+
+    def _conflict(self, platform: str, when: datetime) -> Optional[datetime]:
+        """Return the earliest time after which `when` could be free, or None if free"""
+
+        cap = self.hourly_caps.get(platform)
+        hour = _hour_bucket(when)
+        if cap is not None:
+            count = self._hour_counts[(platform, hour)]
+            if self.base is not None:
+                count += self.base.count_in_hour(platform, hour, self.exclude)
+            if count >= cap:
+                return hour + timedelta(hours=1)
+
+        times = self._times[platform]
+        # Posts exactly min_spacing apart are fine
+        index = bisect.bisect_right(times, when - self.min_spacing)
+        if index < len(times) and times[index] < when + self.min_spacing:
+            return times[index] + self.min_spacing
+
+        if self.base is not None:
+            conflicts = self.base.conflicts(platform, when, self.min_spacing, self.exclude)
+            if conflicts:
+                return conflicts[-1][0] + self.min_spacing
+
+        return None
+
+    def is_free(self, platform: str, when: datetime) -> bool:
+        return self._conflict(platform, to_utc_naive(when)) is None
+
+    def find_slot(self, platform: str, earliest: datetime, latest: datetime) -> Optional[datetime]:
+        """Earliest free slot in [earliest, latest], or None"""
+
+        when = to_utc_naive(earliest)
+        latest = to_utc_naive(latest)
+        while when <= latest:
+            free_after = self._conflict(platform, when)
+            if free_after is None:
+                return when
+            when = free_after
+        return None
+
+    def spread(
+        self,
+        platform: str,
+        count: int,
+        window_start: datetime,
+        window_end: datetime
+    ) -> List[Optional[datetime]]:
+        """Spread `count` posts evenly over the window, shifting each to the next free slot"""
+
+        window_start = to_utc_naive(window_start)
+        window_end = to_utc_naive(window_end)
+        step = max((window_end - window_start) / max(count, 1), self.min_spacing)
+
+        slots: List[Optional[datetime]] = []
+        for i in range(count):
+            slot = self.find_slot(platform, window_start + step * i, window_end)
+            if slot is not None:
+                self.occupy(platform, slot)
+            slots.append(slot)
+
+        return slots
+
+    def spread_ranked(
+        self,
+        platform: str,
+        count: int,
+        window_start: datetime,
+        window_end: datetime,
+        hour_scores: Sequence[float]
+    ) -> List[Optional[datetime]]:
+        """Fill the best-scoring hours of the window first.
+
+        hour_scores has one score per hour of the week. Returned slots are in
+        chronological order; unplaced posts are None at the end.
+        """
+
+        window_start = to_utc_naive(window_start)
+        window_end = to_utc_naive(window_end)
+
+        hours = []
+        hour = _hour_bucket(window_start)
+        while hour < window_end:
+            hours.append(hour)
+            hour += timedelta(hours=1)
+        # Stable sort: equal scores keep the earlier hour first
+        hours.sort(key=lambda h: -hour_scores[hour_of_week(h)])
+
+        slots: List[datetime] = []
+        for hour in hours:
+            earliest = max(hour, window_start)
+            latest = min(hour + timedelta(hours=1), window_end)
+            while len(slots) < count:
+                slot = self.find_slot(platform, earliest, latest)
+                if slot is None:
+                    break
+                self.occupy(platform, slot)
+                slots.append(slot)
+            if len(slots) == count:
+                break
+
+        slots.sort()
+        return slots + [None] * (count - len(slots))
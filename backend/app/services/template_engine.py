@@ -0,0 +1,305 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import logging
+import re
+import time
+
+from sqlalchemy import bindparam, update
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.content import ContentTemplate
+from app.services.publishers import PUBLISHERS
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateSyntaxError(ValueError):
+    pass
+
+
+# {{ path|filter|filter:arg }}
+_PLACEHOLDER = re.compile(r"\{\{\s*(.*?)\s*\}\}")
+_PATH = re.compile(r"^[a-z_]+(\.\d+)?$")
+_HASHTAG = re.compile(r"#\w+")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_SPACES = re.compile(r"[ \t]{2,}")
+
+# Values a template can use
+VARIABLES = {
+    "topic": "The requested topic",
+    "platform": "twitter or linkedin",
+    "finding": "A research finding (each suggestion uses the next one)",
+    "findings": "All findings; findings.0 is the first",
+    "source": "The source of the current finding's research",
+    "sources": "All sources; sources.0 is the first",
+    "hashtags": "Hashtags made from the topic",
+    "context": "Additional context from the request",
+}
+
+
+def _to_hashtag(value: str) -> str:
+    words = _WORD.findall(value)
+    return "#" + "".join(word[:1].upper() + word[1:] for word in words) if words else ""
+
+
+def _truncate(value: str, length: str) -> str:
+    limit = int(length)
+    if len(value) <= limit:
+        return value
+    cut = value[:max(limit - 1, 0)].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+# name -> (function, takes an argument)
+FILTERS: Dict[str, Tuple[Callable[..., str], bool]] = {
+    "upper": (str.upper, False),
+    "lower": (str.lower, False),
+    "title": (str.title, False),
+    "capitalize": (lambda value: value[:1].upper() + value[1:], False),
+    "strip": (str.strip, False),
+    "hashtag": (_to_hashtag, False),
+    "truncate": (_truncate, True),
+    "default": (lambda value, fallback: value or fallback, True),
+}
+
+Part = Union[str, Callable[[Dict[str, Any]], str]]
+
+
+class CompiledTemplate:
+    """A template turned into literal strings and lookup functions"""
+
+    __slots__ = ("source", "parts", "variables")
+
+    def __init__(self, source: str, parts: List[Part], variables: List[str]):
+        self.source = source
+        self.parts = parts
+        self.variables = variables
+
+    def render(self, context: Dict[str, Any]) -> str:
+        return "".join(part if isinstance(part, str) else part(context) for part in self.parts)
+
+
+def _compile_placeholder(expression: str) -> Tuple[Callable[[Dict[str, Any]], str], str]:
+    path, *filter_specs = [piece.strip() for piece in expression.split("|")]
+    if not _PATH.match(path):
+        raise TemplateSyntaxError(f"Invalid placeholder {{{{ {expression} }}}}")
+
+    name, _, index = path.partition(".")
+    if name not in VARIABLES:
+        raise TemplateSyntaxError(f"Unknown variable '{name}'. Available: {', '.join(VARIABLES)}")
+
+    filters = []
+    for spec in filter_specs:
+        filter_name, has_arg, arg = spec.partition(":")
+        if filter_name not in FILTERS:
+            raise TemplateSyntaxError(f"Unknown filter '{filter_name}'. Available: {', '.join(FILTERS)}")
+        function, takes_arg = FILTERS[filter_name]
+        if takes_arg != bool(has_arg):
+            raise TemplateSyntaxError(f"Filter '{filter_name}' {'needs' if takes_arg else 'takes no'} argument")
+        arg = arg.strip().strip("\"'")
+        if filter_name == "truncate" and not arg.isdigit():
+            raise TemplateSyntaxError("truncate needs a number, e.g. truncate:100")
+        filters.append((function, arg) if takes_arg else (function, None))
+
+    position = int(index) if index else None
+
+    def lookup(context: Dict[str, Any]) -> str:
+        value = context.get(name)
+        if position is not None:
+            value = value[position] if isinstance(value, list) and position < len(value) else None
+        elif isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        value = "" if value is None else str(value)
+        for function, arg in filters:
+            value = function(value, arg) if arg is not None else function(value)
+        return value
+
+    return lookup, name
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    """Parse a template once; raises TemplateSyntaxError"""
+
+    parts: List[Part] = []
+    variables: List[str] = []
+    position = 0
+    for match in _PLACEHOLDER.finditer(source):
+        if match.start() > position:
+            parts.append(source[position:match.start()])
+        lookup, name = _compile_placeholder(match.group(1))
+        parts.append(lookup)
+        variables.append(name)
+        position = match.end()
+
+    if position < len(source):
+        parts.append(source[position:])
+    if "{{" in "".join(part for part in parts if isinstance(part, str)):
+        raise TemplateSyntaxError("Unclosed placeholder ('{{' without '}}')")
+
+    return CompiledTemplate(source, parts, variables)
+
+
+class TemplateEngine:
+    """Fills content templates locally: no AI call, just string assembly.
+
+    Templates are compiled once and cached by template id. A cached entry is
+    only used while its source matches the row, so an update made through
+    another process is picked up on its next use; updates made here also
+    drop the entry right away.
+    """
+
+    def __init__(self, cache_size: int):
+        self._cache = TTLCache(ttl_seconds=24 * 3600, max_entries=cache_size)
+
+    def compiled(self, template: ContentTemplate) -> CompiledTemplate:
+        compiled = self._cache.get(template.id)
+        if compiled is None or compiled.source != template.template:
+            compiled = compile_template(template.template)
+            self._cache.set(template.id, compiled)
+        return compiled
+
+    def invalidate(self, template_id: int) -> None:
+        self._cache.delete(template_id)
+
+    def render_suggestions(
+        self,
+        template: ContentTemplate,
+        topic: str,
+        platform: str,
+        research_data: Optional[Dict[str, Any]] = None,
+        additional_context: Optional[str] = None,
+        count: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Up to `count` suggestions, each built around a different research finding"""
+
+        compiled = self.compiled(template)
+        findings = list((research_data or {}).get("findings") or [])
+        sources = list((research_data or {}).get("sources") or [])
+        limit = PUBLISHERS[platform].character_limit
+
+        context = {
+            "topic": topic,
+            "platform": platform,
+            "findings": findings,
+            "sources": sources,
+            "hashtags": " ".join(tag for tag in (_to_hashtag(topic),) if tag),
+            "context": additional_context or "",
+        }
+
+        # Only templates that use the current finding vary between suggestions
+        variants = min(count, len(findings)) if "finding" in compiled.variables or "source" in compiled.variables else 1
+        suggestions = []
+        seen = set()
+        for i in range(max(variants, 1)):
+            context["finding"] = findings[i] if i < len(findings) else ""
+            context["source"] = sources[i] if i < len(sources) else (sources[0] if sources else "")
+
+            # Empty placeholders leave doubled spaces behind
+            content = _SPACES.sub(" ", compiled.render(context)).strip()
+            if len(content) > limit:
+                content = _truncate(content, str(limit))
+            if not content or content in seen:
+                continue
+            seen.add(content)
+
+            suggestions.append({
+                "content": content,
+                "character_count": len(content),
+                "hashtags": _HASHTAG.findall(content) or None,
+                "variation_note": f"Template '{template.name}'" + (f", finding {i + 1}" if variants > 1 else ""),
+            })
+
+        return suggestions
+
+
+class TemplateUsageCounter:
+    """Template uses counted in memory and written to the database in batches.
+
+    A batch is written once enough uses are pending, or by the background
+    task every flush_interval_seconds so a quiet process still saves its counts.
+    """
+
+    def __init__(self, flush_interval_seconds: float, flush_threshold: int):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[int, int] = {}
+        self._pending_uses = 0
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._periodic_task: Optional[asyncio.Task] = None
+
+    def record(self, template_id: int, uses: int = 1) -> None:
+        self._pending[template_id] = self._pending.get(template_id, 0) + uses
+        self._pending_uses += uses
+
+        due = (
+            self._pending_uses >= self.flush_threshold
+            or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        )
+        if due and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def start(self) -> None:
+        if self._periodic_task is None:
+            self._periodic_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background task and write what is pending"""
+        if self._periodic_task is not None:
+            self._periodic_task.cancel()
+            try:
+                await self._periodic_task
+            except asyncio.CancelledError:
+                pass
+            self._periodic_task = None
+        await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            if self._pending:
+                await self.flush()
+
+    def pending(self, template_id: int) -> int:
+        """Uses not written yet (added to counts read from the database)"""
+        return self._pending.get(template_id, 0)
+
+    async def flush(self) -> int:
+        pending, self._pending = self._pending, {}
+        self._pending_uses = 0
+        self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        table = ContentTemplate.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_template_id"))
+            .values(usage_count=table.c.usage_count + bindparam("b_uses"))
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(stmt, [
+                    {"b_template_id": template_id, "b_uses": uses}
+                    for template_id, uses in pending.items()
+                ])
+                await db.commit()
+        except Exception as e:
+            # Keep the counts for the next flush
+            for template_id, uses in pending.items():
+                self._pending[template_id] = self._pending.get(template_id, 0) + uses
+                self._pending_uses += uses
+            logger.error("Template usage flush failed", extra={"error": str(e)})
+            return 0
+
+        return sum(pending.values())
+
+
+# Singleton instances
+template_engine = TemplateEngine(cache_size=settings.TEMPLATE_CACHE_SIZE)
+template_usage = TemplateUsageCounter(
+    flush_interval_seconds=settings.TEMPLATE_USAGE_FLUSH_SECONDS,
+    flush_threshold=settings.TEMPLATE_USAGE_FLUSH_THRESHOLD
+)
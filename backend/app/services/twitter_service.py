@@ -1,9 +1,12 @@
 from typing import Dict, Any, Optional
-import tweepy
+import asyncio
+import logging
 from datetime import datetime
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class TwitterService:
     def __init__(
@@ -25,10 +28,12 @@ class TwitterService:
         
         if not all([self.api_key, self.api_secret, self.access_token, self.access_token_secret]):
             self.initialization_error = "Missing Twitter API credentials"
-            print(f"⚠️  {self.initialization_error}")
+            logger.warning(self.initialization_error)
             return
             
         try:
+            import tweepy  # Only loaded once the service is used
+            
             # Initialize Twitter API v2 client for posting
             self.client = tweepy.Client(
                 consumer_key=self.api_key,
@@ -47,11 +52,11 @@ class TwitterService:
             )
             self.api = tweepy.API(auth, wait_on_rate_limit=True)
             
-            print("✅ Twitter/X client initialized successfully")
+            logger.info("Twitter/X client initialized")
             
         except Exception as e:
             self.initialization_error = f"Failed to initialize Twitter client: {e}"
-            print(f"❌ {self.initialization_error}")
+            logger.error(self.initialization_error)
             self.client = None
             self.api = None
     
@@ -69,7 +74,7 @@ class TwitterService:
         
         try:
             # Test by getting user info
-            me = self.api.verify_credentials()
+            me = await asyncio.to_thread(self.api.verify_credentials)
             return {
                 "success": True,
                 "user": {
@@ -95,8 +100,8 @@ class TwitterService:
             if len(content) > 280:
                 raise Exception(f"Tweet too long: {len(content)} characters (max 280)")
             
-            # Post the tweet using API v2
-            response = self.client.create_tweet(text=content)
+            # Post the tweet using API v2 (tweepy is blocking, keep it off the event loop)
+            response = await asyncio.to_thread(self.client.create_tweet, text=content)
             
             if response.data:
                 tweet_id = response.data['id']
@@ -114,7 +119,7 @@ class TwitterService:
                 
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Twitter publishing failed: {error_msg}")
+            logger.error("Twitter publishing failed", extra={"error": error_msg})
             raise Exception(f"Failed to publish tweet: {error_msg}")
     
     async def delete_tweet(self, tweet_id: str) -> Dict[str, Any]:
@@ -133,7 +138,7 @@ class TwitterService:
             
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Twitter deletion failed: {error_msg}")
+            logger.error("Twitter deletion failed", extra={"tweet_id": tweet_id, "error": error_msg})
             raise Exception(f"Failed to delete tweet: {error_msg}")
     
     async def get_tweet_stats(self, tweet_id: str) -> Dict[str, Any]:
@@ -167,7 +172,7 @@ class TwitterService:
                 
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Twitter stats retrieval failed: {error_msg}")
+            logger.error("Twitter stats retrieval failed", extra={"tweet_id": tweet_id, "error": error_msg})
             raise Exception(f"Failed to get tweet stats: {error_msg}")
     
     def get_rate_limit_status(self) -> Dict[str, Any]:
@@ -194,6 +199,3 @@ class TwitterService:
                 "error": f"Failed to get rate limit: {str(e)}"
             }
 
-
-# Singleton instance
-twitter_service = TwitterService()
\ No newline at end of file
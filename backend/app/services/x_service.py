@@ -1,7 +1,11 @@
 from typing import Optional, Dict, Any
+import logging
+
 import tweepy
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class XService:
     def __init__(
@@ -76,7 +80,7 @@ class XService:
             return {"likes": 0, "shares": 0, "comments": 0, "impressions": 0}
             
         except Exception as e:
-            print(f"Error fetching X metrics: {e}")
+            logger.warning("Error fetching X metrics", extra={"error": str(e)})
             return {"likes": 0, "shares": 0, "comments": 0, "impressions": 0}
     
     async def validate_credentials(self) -> bool:
@@ -0,0 +1,109 @@
+"""Login throughput and unrelated-route latency during a login burst.
+
+Compares bcrypt run inline on the event loop with the bounded hashing pool
+(app.core.security.password_hasher). Logins go through the real /auth/login
+route against a temporary SQLite database while a probe requests /health
+in a loop. Run from backend/:
+
+    python -m benchmarks.password_hashing --logins 64 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+directory = tempfile.mkdtemp()
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # The burst would be rate limited
+os.environ["DATABASE_URL"] = f"sqlite:///{directory}/benchmark_auth.db"
+
+import httpx
+
+from app.core import security
+from app.core.security import PasswordHasher, pwd_context
+from app.models.database import Base, engine
+from app.main import app
+
+
+class InlineHasher:
+    """The old behaviour: bcrypt on the event loop"""
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return security.verify_password(plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return security.get_password_hash(password)
+
+
+async def _burst(client: httpx.AsyncClient, logins: int) -> dict:
+    probe_latencies = []
+    statuses = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            # Measured from when the request was due, so time spent waiting
+            # for a blocked event loop counts
+            due = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            await client.get("/health")
+            probe_latencies.append((time.perf_counter() - due) * 1000)
+
+    async def login() -> None:
+        response = await client.post("/api/auth/login", json={"username": "bench", "password": "benchmark-pw"})
+        statuses.append(response.status_code)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    latencies = sorted(probe_latencies) or [0.0]
+    return {
+        "logins_per_second": round(statuses.count(200) / elapsed, 1),
+        "rejected_503": statuses.count(503),
+        "health_requests": len(probe_latencies),
+        "health_p50_ms": round(statistics.median(latencies), 1),
+        "health_max_ms": round(latencies[-1], 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int, default=1000)
+    args = parser.parse_args()
+
+    pwd_context.update(bcrypt__rounds=args.rounds)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        await client.post(
+            "/api/auth/register",
+            json={"email": "bench@example.com", "username": "bench", "password": "benchmark-pw"}
+        )
+
+        modes = {
+            "inline": InlineHasher(),
+            "pool": PasswordHasher(workers=args.workers, max_pending=args.max_pending),
+        }
+        for name, hasher in modes.items():
+            security.password_hasher = hasher
+            result = await _burst(client, args.logins)
+            print({"mode": name, "rounds": args.rounds, **result})
+
+        modes["pool"].shutdown()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+"""Mixed read/write throughput on SQLite, default settings vs high-concurrency mode.
+
+Readers page through a user's posts (the dashboard listing) while writers
+create posts and update metrics, the mix seen when the scheduler publishes
+while users are working. Run from backend/:
+
+    python -m benchmarks.sqlite_concurrency --readers 16 --writers 16 --seconds 10
+"""
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "benchmark_app.db"))
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.sqlite import SQLiteWriter
+from app.models.database import Base
+from app.models.user import User
+from app.models.content import Post, Platform, PostStatus
+
+USERS = 50
+POSTS_PER_USER = 200
+
+
+async def _setup(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as db:
+        db.add_all([
+            User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="x")
+            for i in range(USERS)
+        ])
+        await db.flush()
+        db.add_all([
+            Post(
+                user_id=user_id,
+                topic="benchmark",
+                content="x" * 280,
+                platform=Platform.TWITTER,
+                status=PostStatus.PUBLISHED
+            )
+            for user_id in range(1, USERS + 1)
+            for _ in range(POSTS_PER_USER)
+        ])
+        await db.commit()
+    await engine.dispose()
+
+
+async def _run_mode(url: str, high_concurrency: bool, readers: int, writers: int, seconds: float) -> Dict[str, Any]:
+    engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=readers + writers,
+        max_overflow=0
+    )
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    writer = None
+    if high_concurrency:
+        writer = SQLiteWriter(busy_timeout_ms=5000, mmap_size_mb=256, max_batch=64, batch_wait_ms=2.0)
+        writer.install(engine.sync_engine, Session)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    write_latencies: List[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def read_loop() -> None:
+        while time.perf_counter() < deadline:
+            async with Session() as db:
+                try:
+                    stmt = (
+                        select(Post.id, Post.topic, Post.likes, Post.created_at)
+                        .where(Post.user_id == random.randint(1, USERS))
+                        .order_by(Post.created_at.desc(), Post.id.desc())
+                        .limit(20)
+                    )
+                    (await db.execute(stmt)).all()
+                    counts["reads"] += 1
+                except (DBAPIError, SQLAlchemyError):
+                    counts["errors"] += 1
+
+    async def write(db: AsyncSession) -> None:
+        user_id = random.randint(1, USERS)
+        if random.random() < 0.5:
+            db.add(Post(user_id=user_id, topic="new", content="y" * 280, platform=Platform.LINKEDIN))
+            await db.flush()
+        else:
+            await db.execute(
+                update(Post)
+                .where(Post.id == random.randint(1, USERS * POSTS_PER_USER))
+                .values(likes=Post.likes + 1)
+            )
+
+    async def write_loop() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if writer is not None:
+                    await writer.submit(write)
+                else:
+                    async with Session() as db:
+                        await write(db)
+                        await db.commit()
+                counts["writes"] += 1
+                write_latencies.append(time.perf_counter() - started)
+            except (DBAPIError, SQLAlchemyError):
+                counts["errors"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[read_loop() for _ in range(readers)],
+        *[write_loop() for _ in range(writers)]
+    )
+    elapsed = time.perf_counter() - started
+
+    if writer is not None:
+        await writer.stop()
+    await engine.dispose()
+
+    latencies_ms = sorted(latency * 1000 for latency in write_latencies) or [0.0]
+    return {
+        "mode": "high-concurrency" if high_concurrency else "default",
+        "reads_per_second": round(counts["reads"] / elapsed, 1),
+        "writes_per_second": round(counts["writes"] / elapsed, 1),
+        "errors": counts["errors"],
+        "write_p50_ms": round(statistics.median(latencies_ms), 1),
+        "write_p99_ms": round(latencies_ms[int(len(latencies_ms) * 0.99) - 1 if len(latencies_ms) > 1 else 0], 1),
+        "group_commits": writer.stats if writer is not None else None,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for high_concurrency in (False, True):
+            # Fresh database each run (WAL is persistent once enabled)
+            url = f"sqlite+aiosqlite:///{directory}/{'wal' if high_concurrency else 'default'}.db"
+            await _setup(url)
+            result = await _run_mode(url, high_concurrency, args.readers, args.writers, args.seconds)
+            print(result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
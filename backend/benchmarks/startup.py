@@ -0,0 +1,118 @@
+"""Startup cost: import time of app.main and time to the first served request.
+
+Each run is a fresh interpreter, as for a worker boot. Import time comes
+from `python -X importtime`; time to first request is measured from
+process start until the app has run its startup and answered GET /health.
+Exits with status 1 if the median exceeds the budget or a provider SDK
+(anthropic, openai, google-genai, tweepy) is imported at startup, so it
+can run as a CI check. Run from backend/:
+
+    python -m benchmarks.startup --runs 5 --budget-ms 2500
+"""
+from typing import Dict, List, Tuple
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Must not be imported until a request needs them (app/services/registry.py)
+LAZY_MODULES = ("anthropic", "openai", "google.genai", "tweepy", "redis")
+
+FIRST_REQUEST = """
+import asyncio, sys
+import httpx
+from app.main import app
+
+async def first_request():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.get("/health")
+            response.raise_for_status()
+    print("lazy loaded:", ",".join(name for name in {lazy!r} if name in sys.modules))
+
+asyncio.run(first_request())
+"""
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "benchmark")
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "benchmark_startup.db"))
+    env["SCHEDULER_MODE"] = "off"  # App startup only, not the scheduler's first load
+    return env
+
+
+def _import_time(env: Dict[str, str]) -> Tuple[float, List[Tuple[float, str]]]:
+    """Total import ms and the slowest modules imported directly by app.main"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True, check=True
+    )
+
+    total = 0.0
+    direct = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0 and name.strip() == "app.main":
+            total = int(cumulative) / 1000
+        elif depth == 1:
+            direct.append((int(cumulative) / 1000, name.strip()))
+
+    return total, sorted(direct, reverse=True)[:8]
+
+
+def _first_request(env: Dict[str, str]) -> Tuple[float, str]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST.format(lazy=LAZY_MODULES)],
+        env=env, capture_output=True, text=True, check=True
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+
+    loaded = ""
+    for line in result.stdout.splitlines():
+        if line.startswith("lazy loaded:"):
+            loaded = line.split(":", 1)[1].strip()
+    return elapsed, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2500.0, help="Median time to first request")
+    args = parser.parse_args()
+
+    env = _environment()
+    imports = [_import_time(env) for _ in range(args.runs)]
+    first_requests = [_first_request(env) for _ in range(args.runs)]
+
+    import_ms = statistics.median(total for total, _ in imports)
+    first_request_ms = statistics.median(elapsed for elapsed, _ in first_requests)
+    loaded = sorted({name for _, names in first_requests for name in names.split(",") if name})
+
+    print({"import_ms": round(import_ms, 1), "first_request_ms": round(first_request_ms, 1), "budget_ms": args.budget_ms})
+    print("Slowest imports from app.main:")
+    for cumulative, name in imports[-1][1]:
+        print(f"  {cumulative:8.1f} ms  {name}")
+
+    failures = []
+    if first_request_ms > args.budget_ms:
+        failures.append(f"time to first request {first_request_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"imported at startup (should be lazy): {', '.join(loaded)}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Template rendering cost: compiling every time vs the cached compiled template.
+
+No database or network is involved: this is the work done for a
+/content/generate request with a template_id once research is available.
+Run from backend/:
+
+    python -m benchmarks.template_render --iterations 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "benchmark_app.db"))
+
+from app.models.content import ContentTemplate, Platform
+from app.services.template_engine import TemplateEngine, compile_template
+
+TEMPLATE = (
+    "{{ topic|title }}: {{ finding|truncate:180 }}\n\n"
+    "Source: {{ source|default:'our research' }}\n"
+    "{{ context }}\n\n{{ hashtags }}"
+)
+
+RESEARCH = {
+    "query": "remote work",
+    "findings": [
+        "Remote roles made up 28% of new job postings in 2025, up from 9% in 2019",
+        "Hybrid teams report fewer meetings but longer written updates",
+        "Companies with written remote policies retained staff 12% longer",
+    ],
+    "sources": ["https://example.com/report", "https://example.com/survey"],
+    "timestamp": "2026-01-01T00:00:00",
+}
+
+
+def _per_call_us(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    template = ContentTemplate(id=1, name="Insight", platform=Platform.LINKEDIN, template=TEMPLATE)
+    engine = TemplateEngine(cache_size=100)
+
+    def render() -> None:
+        engine.render_suggestions(template, "remote work", "linkedin", RESEARCH, "Thoughts?")
+
+    def compile_and_render() -> None:
+        engine.invalidate(template.id)
+        render()
+
+    render()  # Warm the cache
+    print({
+        "compile_us": round(_per_call_us(lambda: compile_template(TEMPLATE), args.iterations), 2),
+        "uncached_suggestions_us": round(_per_call_us(compile_and_render, args.iterations), 2),
+        "cached_suggestions_us": round(_per_call_us(render, args.iterations), 2),
+        "suggestions": len(engine.render_suggestions(template, "remote work", "linkedin", RESEARCH)),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+# Settings are read at import time: point the app at a throwaway database first
+_directory = tempfile.mkdtemp()
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/test.db"
+os.environ["SQLITE_HIGH_CONCURRENCY"] = "false"
+os.environ["SCHEDULER_MODE"] = "off"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["TRACE_EXPORTER"] = "none"
+
+import pytest_asyncio
+
+import app.models.content  # noqa: F401 (registers the mappers)
+import app.models.user  # noqa: F401
+from app.models.database import Base, engine
+
+
+@pytest_asyncio.fixture
+async def database():
+    """A fresh schema per test; the engine is disposed so no connection outlives the test's loop"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.dependencies import _load_current_user
+from app.api.routes.auth import change_password, logout_all
+from app.core.principals import PrincipalCache, RedisInvalidations
+from app.core.security import create_access_token, password_hasher
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+from app.schemas.user import PasswordChange
+
+
+async def _signed_in_user() -> str:
+    """A user and a token for them, with the user cached by a first request"""
+    async with AsyncSessionLocal() as db:
+        user = User(email="a@example.com", username="a", hashed_password=await password_hasher.hash("old"))
+        db.add(user)
+        await db.commit()
+        token = create_access_token(subject=user.id, token_version=user.token_version)
+
+    async with AsyncSessionLocal() as db:
+        await _load_current_user(db, token)
+    return token
+
+
+async def _assert_revoked(token: str) -> None:
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(HTTPException) as rejected:
+            await _load_current_user(db, token)
+    assert rejected.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_change_password_revokes_older_tokens(database):
+    old_token = await _signed_in_user()
+
+    async with AsyncSessionLocal() as db:
+        user = await _load_current_user(db, old_token)
+        response = await change_password(
+            PasswordChange(current_password="old", new_password="new"), current_user=user, db=db
+        )
+
+    await _assert_revoked(old_token)
+    async with AsyncSessionLocal() as db:
+        user = await _load_current_user(db, response["access_token"])
+        assert await password_hasher.verify("new", user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_older_tokens(database):
+    old_token = await _signed_in_user()
+
+    async with AsyncSessionLocal() as db:
+        user = await _load_current_user(db, old_token)
+        await logout_all(current_user=user, db=db)
+
+    await _assert_revoked(old_token)
+
+
+@pytest.mark.asyncio
+async def test_invalidations_reach_other_processes_through_redis():
+    url = os.environ.get("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL not set")
+
+    sender = PrincipalCache(60, 100, channel=RedisInvalidations(url))
+    receiver = PrincipalCache(60, 100, channel=RedisInvalidations(url))
+    await receiver.start()
+    try:
+        for _ in range(50):
+            if receiver.connected:
+                break
+            await asyncio.sleep(0.05)
+
+        user = User(id=1, email="a@example.com", username="a", hashed_password="x", token_version=0)
+        receiver.set(user, receiver.generation())
+        assert receiver.get(1, 0) is not None
+
+        sender.changed([1])
+        for _ in range(50):
+            if receiver.get(1, 0) is None:
+                break
+            await asyncio.sleep(0.05)
+        assert receiver.get(1, 0) is None
+    finally:
+        await receiver.stop()
+        await sender.stop()
@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.routes.content import get_posts
+from app.models.content import Platform, Post
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+
+
+async def _user_with_post() -> User:
+    async with AsyncSessionLocal() as db:
+        user = User(email="l@example.com", username="l", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        db.add(Post(
+            user_id=user.id, topic="t", content="hello", platform=Platform.LINKEDIN,
+            research_data={"findings": ["f"]}
+        ))
+        await db.commit()
+        return user
+
+
+async def _list(user: User, fields=None) -> dict:
+    async with AsyncSessionLocal() as db:
+        posts = await get_posts(Response(), skip=0, limit=10, cursor=None, fields=fields, current_user=user, db=db)
+    return posts[0]
+
+
+@pytest.mark.asyncio
+async def test_listing_includes_research_data_unless_left_out(database):
+    user = await _user_with_post()
+
+    post = await _list(user)
+    assert post["research_data"] == {"findings": ["f"]}
+    assert "content_preview" not in post
+
+    post = await _list(user, "-research_data")
+    assert "research_data" not in post
+    assert post["content"] == "hello"
+
+    assert set(await _list(user, "id,content_preview")) == {"id", "content_preview"}
+
+    with pytest.raises(HTTPException):
+        await _list(user, "-research_data,id")
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from app.models.user import User
+from app.services.credential_validation import CredentialValidationCache
+
+
+@pytest.mark.asyncio
+async def test_cold_accounts_are_pending_while_validated_in_the_background(monkeypatch):
+    platform_answered = asyncio.Event()
+
+    async def slow_check(self, user, platform):
+        await platform_answered.wait()
+        return True
+
+    monkeypatch.setattr(CredentialValidationCache, "_check", slow_check)
+    cache = CredentialValidationCache(ttl_seconds=60, timeout_seconds=10)
+    user = User(id=1, linkedin_access_token="token")
+
+    statuses = await asyncio.wait_for(cache.get_status(user), timeout=1)
+    assert statuses["linkedin"] == {"valid": None, "checked_at": None, "pending": True}
+    assert statuses["twitter"] == {"valid": False, "checked_at": None, "pending": False}
+
+    platform_answered.set()
+    await asyncio.gather(*cache._inflight.values())
+
+    statuses = await cache.get_status(user)
+    assert statuses["linkedin"]["valid"] is True
+    assert not statuses["linkedin"]["pending"]
@@ -0,0 +1,99 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.services import linkedin_service
+from app.services.http_client import close_http_client
+from app.services.linkedin_service import LinkedInService
+
+
+class FakeLinkedIn(BaseHTTPRequestHandler):
+    """Answers like the LinkedIn API for the token "valid" and rejects any other"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is visible
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self, status: int, body: bytes = b"{}", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.headers["Authorization"] != "Bearer valid":
+            self._reply(401)
+        else:
+            self._reply(200, b'{"id": "abc"}')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._reply(201, headers=[("x-linkedin-id", "urn:li:share:1")])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_linkedin(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLinkedIn)
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "LINKEDIN_API_BASE_URL", f"http://127.0.0.1:{server.server_port}/v2")
+    monkeypatch.setattr(settings, "HTTP_GET_RETRIES", 0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def fresh_http_client():
+    """Each test gets its own pooled client, closed on this test's loop"""
+    await close_http_client()
+    yield
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_one_pooled_connection(fake_linkedin):
+    service = LinkedInService("valid")
+
+    assert await service.validate_credentials()
+    assert (await service.get_user_info())["id"] == "abc"
+    assert (await service.post_to_linkedin("hello", "abc"))["platform_post_id"] == "urn:li:share:1"
+    assert await LinkedInService("valid").validate_credentials()
+
+    assert fake_linkedin.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_validate_credentials_is_false_for_rejected_tokens(fake_linkedin):
+    assert not await LinkedInService("expired").validate_credentials()
+
+
+@pytest.mark.asyncio
+async def test_validate_credentials_is_false_when_linkedin_is_unreachable(fake_linkedin):
+    fake_linkedin.shutdown()
+    fake_linkedin.server_close()
+
+    assert not await LinkedInService("valid").validate_credentials()
+
+
+@pytest.mark.asyncio
+async def test_validate_credentials_does_not_hide_programming_errors(monkeypatch):
+    async def broken_get(*args, **kwargs):
+        raise TypeError("unexpected keyword argument")
+
+    monkeypatch.setattr(linkedin_service, "get_with_retry", broken_get)
+
+    with pytest.raises(TypeError):
+        await LinkedInService("valid").validate_credentials()
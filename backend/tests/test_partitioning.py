@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.content import Platform, Post
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.partitioning import partition_service, select_posts
+
+# Closed months hold ids 1-10 (January) and 11-20 (February); March onwards is still written to
+ID_RANGES = ([(datetime(2026, 1, 1), 1, 10), (datetime(2026, 2, 1), 11, 20)], datetime(2026, 3, 1))
+
+
+def _utc(year: int, month: int) -> datetime:
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def partitioned_posts(monkeypatch):
+    async def closed_post_id_ranges():
+        return ID_RANGES
+
+    monkeypatch.setattr(partition_service, "_closed_post_id_ranges", closed_post_id_ranges)
+
+
+@pytest.mark.asyncio
+async def test_post_bounds_cover_the_partitions_holding_the_ids(partitioned_posts):
+    assert await partition_service.post_bounds([5]) == (_utc(2026, 1), _utc(2026, 2))
+    assert await partition_service.post_bounds([5, 12]) == (_utc(2026, 1), _utc(2026, 3))
+    assert await partition_service.post_bounds([21]) == (_utc(2026, 3), None)
+    assert await partition_service.post_bounds([5, 21]) == (_utc(2026, 1), None)
+
+
+@pytest.mark.asyncio
+async def test_select_posts_falls_back_to_every_partition(database, partitioned_posts):
+    async with AsyncSessionLocal() as db:
+        user = User(email="p@example.com", username="p", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        # Outside the month its id points at (e.g. inserted with an explicit created_at)
+        db.add(Post(
+            id=5, user_id=user.id, topic="t", content="hello", platform=Platform.LINKEDIN,
+            created_at=datetime(2026, 6, 1, tzinfo=timezone.utc)
+        ))
+        await db.commit()
+
+        posts = await select_posts(db, select(Post).where(Post.id == 5), [5])
+
+    assert [post.id for post in posts] == [5]
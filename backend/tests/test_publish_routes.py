@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.api.routes.schedule import _publish_post, cross_post
+from app.models.content import Platform, Post, PostStatus
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+from app.schemas.content import CrossPostRequest
+from app.services.best_times import best_time_service
+from app.services.publishers import LinkedInPublisher
+
+
+@pytest.fixture
+def failing_bookkeeping(monkeypatch):
+    """The platform accepts every post, then the slot stats update fails"""
+
+    async def fake_publish(self, content):
+        return {"platform_post_id": "urn:li:share:1", "url": "https://www.linkedin.com/feed/update/urn:li:share:1"}
+
+    async def failing_record_published(db, posts):
+        raise OperationalError("UPDATE posting_slot_stats", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(LinkedInPublisher, "_publish", fake_publish)
+    monkeypatch.setattr(best_time_service, "record_published", failing_record_published)
+
+
+async def _user(db) -> User:
+    user = User(email="p@example.com", username="p", hashed_password="x", linkedin_access_token="token")
+    db.add(user)
+    await db.flush()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_published_post_is_not_marked_failed_when_bookkeeping_fails(database, failing_bookkeeping):
+    async with AsyncSessionLocal() as db:
+        user = await _user(db)
+        post = Post(user_id=user.id, topic="t", content="hello", platform=Platform.LINKEDIN)
+        db.add(post)
+        await db.commit()
+
+        response = await _publish_post(
+            post,
+            LinkedInPublisher(str(user.id), user.linkedin_access_token),
+            db,
+            message="Post published successfully",
+            error_prefix="Publishing failed"
+        )
+        post_id = post.id
+
+    assert response["platform_data"]["platform_post_id"] == "urn:li:share:1"
+    async with AsyncSessionLocal() as db:
+        post = await db.get(Post, post_id)
+        assert post.status == PostStatus.PUBLISHED
+        assert post.platform_post_id == "urn:li:share:1"
+
+
+@pytest.mark.asyncio
+async def test_cross_posted_posts_are_saved_when_bookkeeping_fails(database, failing_bookkeeping):
+    async with AsyncSessionLocal() as db:
+        user = await _user(db)
+        await db.commit()
+
+        response = await cross_post(
+            CrossPostRequest(topic="t", content="hello", platforms=["linkedin"]),
+            current_user=user,
+            db=db
+        )
+
+    assert [result["success"] for result in response["results"]] == [True]
+    async with AsyncSessionLocal() as db:
+        posts = (await db.execute(select(Post))).scalars().all()
+        assert [(post.status, post.platform_post_id) for post in posts] == [(PostStatus.PUBLISHED, "urn:li:share:1")]
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.content import Platform, Post, PostingSlotStat, PostStatus, ScheduledPost
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.publish_worker import PublishWorker
+from app.services.publishers import LinkedInPublisher
+
+
+async def _due_scheduled_post() -> int:
+    async with AsyncSessionLocal() as db:
+        user = User(
+            email="worker@example.com",
+            username="worker",
+            hashed_password="x",
+            linkedin_access_token="token"
+        )
+        db.add(user)
+        await db.flush()
+
+        post = Post(user_id=user.id, topic="t", content="hello", platform=Platform.LINKEDIN)
+        db.add(post)
+        await db.flush()
+
+        scheduled_post = ScheduledPost(
+            post_id=post.id,
+            user_id=user.id,
+            scheduled_time=datetime.utcnow() - timedelta(minutes=1)
+        )
+        db.add(scheduled_post)
+        await db.commit()
+        return scheduled_post.id
+
+
+@pytest.mark.asyncio
+async def test_process_records_published_posts_in_slot_stats(database, monkeypatch):
+    async def fake_publish(self, content):
+        return {"platform_post_id": "urn:li:share:1", "url": "https://www.linkedin.com/feed/update/urn:li:share:1"}
+
+    monkeypatch.setattr(LinkedInPublisher, "_publish", fake_publish)
+    scheduled_post_id = await _due_scheduled_post()
+
+    worker = PublishWorker(worker_id="test")
+    token, claimed_ids = await worker.claim()
+    assert claimed_ids == [scheduled_post_id]
+    await worker.process(token, claimed_ids)
+
+    async with AsyncSessionLocal() as db:
+        scheduled_post = await db.get(ScheduledPost, scheduled_post_id)
+        post = await db.get(Post, scheduled_post.post_id)
+        stats = (await db.execute(select(PostingSlotStat))).scalars().all()
+
+    assert scheduled_post.is_posted
+    assert post.status == PostStatus.PUBLISHED
+    assert [(stat.platform, stat.post_count) for stat in stats] == [(Platform.LINKEDIN, 1)]
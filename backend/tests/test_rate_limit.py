@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from app.core.rate_limit import MemoryBackend, RateLimiter, RedisBackend
+
+
+async def _ip_rejection_leaves_user_budget(limiter: RateLimiter) -> None:
+    for _ in range(3):
+        assert (await limiter.check(1, "10.0.0.1", 1)).allowed
+
+    rejected = await limiter.check(1, "10.0.0.1", 1)
+    assert not rejected.allowed
+    assert rejected.limit == limiter.per_ip
+
+    # Only the 3 admitted requests count against the user
+    result = await limiter.check(1, None, 1)
+    assert result.allowed
+    assert result.limit == limiter.per_user
+    assert result.remaining == limiter.per_user - 4
+
+
+@pytest.mark.asyncio
+async def test_ip_rejection_does_not_charge_the_user():
+    limiter = RateLimiter(MemoryBackend(), per_user=100, per_ip=3)
+    await _ip_rejection_leaves_user_budget(limiter)
+
+
+@pytest.mark.asyncio
+async def test_ip_rejection_does_not_charge_the_user_in_redis():
+    url = os.environ.get("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL not set")
+
+    backend = RedisBackend(url)
+    await backend._redis.flushdb()
+    limiter = RateLimiter(backend, per_user=100, per_ip=3, fallback_seconds=0)
+    limiter._fallback = None  # Fail instead of silently counting in memory
+    try:
+        await _ip_rejection_leaves_user_budget(limiter)
+    finally:
+        await limiter.close()
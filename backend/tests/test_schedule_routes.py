@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes.schedule import cancel_scheduled_post
+from app.models.content import Platform, Post, ScheduledPost
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+
+
+async def _scheduled_post(**values) -> tuple:
+    async with AsyncSessionLocal() as db:
+        user = User(email="c@example.com", username="c", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        post = Post(user_id=user.id, topic="t", content="hello", platform=Platform.LINKEDIN)
+        db.add(post)
+        await db.flush()
+        scheduled_post = ScheduledPost(
+            post_id=post.id, user_id=user.id, scheduled_time=datetime.utcnow(), **values
+        )
+        db.add(scheduled_post)
+        await db.commit()
+        return user, scheduled_post.id
+
+
+@pytest.mark.asyncio
+async def test_cancel_refuses_rows_leased_by_a_worker(database):
+    user, scheduled_post_id = await _scheduled_post(
+        celery_task_id="worker:token", lease_expires_at=datetime.utcnow() + timedelta(minutes=5)
+    )
+
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(HTTPException) as raised:
+            await cancel_scheduled_post(scheduled_post_id, current_user=user, db=db)
+    assert raised.value.status_code == 409
+
+    async with AsyncSessionLocal() as db:
+        assert await db.get(ScheduledPost, scheduled_post_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_cancel_deletes_rows_with_an_expired_lease(database):
+    user, scheduled_post_id = await _scheduled_post(
+        celery_task_id="worker:token", lease_expires_at=datetime.utcnow() - timedelta(minutes=5)
+    )
+
+    async with AsyncSessionLocal() as db:
+        await cancel_scheduled_post(scheduled_post_id, current_user=user, db=db)
+
+    async with AsyncSessionLocal() as db:
+        assert await db.get(ScheduledPost, scheduled_post_id) is None
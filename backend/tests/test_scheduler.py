@@ -0,0 +1,23 @@
+import pytest
+
+from app.services import maintenance
+from app.services.scheduler import ScheduleDispatcher
+from tests.test_publish_worker import _due_scheduled_post
+
+
+@pytest.mark.asyncio
+async def test_load_window_survives_failing_maintenance(database, monkeypatch):
+    async def fail(*args, **kwargs):
+        raise RuntimeError("maintenance down")
+
+    monkeypatch.setattr(maintenance.recurrence_service, "materialize", fail)
+    monkeypatch.setattr(maintenance.engagement_service, "compact", fail)
+    monkeypatch.setattr(maintenance.partition_service, "maintain", fail)
+    scheduled_post_id = await _due_scheduled_post()
+
+    dispatcher = ScheduleDispatcher(lookahead_seconds=60, batch_size=10)
+    await dispatcher._load_window()
+
+    assert dispatcher._window_end > 0
+    assert dispatcher._peek_due_ts() is not None
+    assert dispatcher._pop_due(dispatcher._window_end) == [scheduled_post_id]
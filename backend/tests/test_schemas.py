@@ -0,0 +1,12 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.content import CrossPostRequest
+
+
+def test_cross_post_rejects_repeated_platforms():
+    with pytest.raises(ValidationError):
+        CrossPostRequest(topic="t", content="hello", platforms=["twitter", "twitter"])
+
+    request = CrossPostRequest(topic="t", content="hello", platforms=["twitter", "linkedin"])
+    assert [platform.value for platform in request.platforms] == ["twitter", "linkedin"]
@@ -0,0 +1,16 @@
+from pathlib import Path
+import subprocess
+import sys
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def test_startup_is_within_budget():
+    """The startup benchmark passes: first request within 2.5 s and provider SDKs loaded lazily"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--runs", "3", "--budget-ms", "2500"],
+        cwd=BACKEND, capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Within budget" in result.stdout
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.api.routes import content
+from app.models.content import ContentTemplate, Platform
+from app.models.database import AsyncSessionLocal
+from app.models.user import User
+from app.schemas.content import ContentGenerationRequest
+from app.services.template_engine import TemplateUsageCounter
+
+
+class UnreachablePerplexity:
+    async def research_topic(self, topic, additional_context=None):
+        raise AssertionError("template generation must not call Perplexity")
+
+
+async def _template() -> ContentTemplate:
+    async with AsyncSessionLocal() as db:
+        user = User(email="t@example.com", username="t", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        template = ContentTemplate(
+            user_id=user.id, name="Finding", platform=Platform.LINKEDIN, template="{{ topic }}: {{ finding }}"
+        )
+        db.add(template)
+        await db.commit()
+        return template
+
+
+@pytest.mark.asyncio
+async def test_template_generation_uses_cached_research_only(database, monkeypatch):
+    monkeypatch.setattr(content, "perplexity_service", UnreachablePerplexity())
+    monkeypatch.setattr(content.template_usage, "record", lambda template_id: None)
+    template = await _template()
+    request = ContentGenerationRequest(
+        topic="Remote work", platforms=["linkedin"], include_research=True, template_id=template.id
+    )
+
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, template.user_id)
+        generated = await content.generate_content(request, current_user=user, db=db)
+        assert generated[0].research_data is None
+        assert generated[0].suggestions[0].content == "Remote work:"
+
+        research = {"query": "q", "findings": ["Most teams are hybrid"], "sources": ["s"], "timestamp": "t"}
+        content.research_cache.set((user.id, "Remote work", None), research)
+        generated = await content.generate_content(request, current_user=user, db=db)
+        assert generated[0].suggestions[0].content == "Remote work: Most teams are hybrid"
+
+
+@pytest.mark.asyncio
+async def test_usage_counts_are_flushed_without_further_uses(database):
+    template = await _template()
+    counter = TemplateUsageCounter(flush_interval_seconds=0.05, flush_threshold=1000)
+    await counter.start()
+    try:
+        counter.record(template.id, uses=3)
+        await asyncio.sleep(0.3)
+
+        async with AsyncSessionLocal() as db:
+            assert (await db.get(ContentTemplate, template.id)).usage_count == 3
+        assert counter.pending(template.id) == 0
+    finally:
+        await counter.stop()
@@ -303,11 +303,25 @@ const ContentPreview = ({ generatedContent, researchData, onBack, onComplete })
           research_data: researchData,
         });
 
-        await scheduleMutation.mutateAsync({
+        const schedule = (onConflict) => scheduleMutation.mutateAsync({
           post_id: savedPost.data.id,
           scheduled_time: scheduledTime.toISOString(),
+          on_conflict: onConflict,
         });
 
+        try {
+          await schedule('reject');
+        } catch (error) {
+          // Too close to another post: offer the next free slot
+          const detail = error.response?.data?.detail;
+          const suggestedTime = detail?.suggested_time && new Date(`${detail.suggested_time}Z`);
+          if (error.response?.status !== 409 || !suggestedTime
+              || !window.confirm(`${detail.message}. Schedule at ${suggestedTime.toLocaleString()} instead?`)) {
+            throw error;
+          }
+          await schedule('shift');
+        }
+
         alert('Content scheduled successfully!');
       } catch (error) {
         alert('Failed to schedule content');
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useMemo, useState } from 'react';
 import FullCalendar from '@fullcalendar/react';
 import dayGridPlugin from '@fullcalendar/daygrid';
 import interactionPlugin from '@fullcalendar/interaction';
@@ -28,16 +28,21 @@ const ScheduleCalendar = () => {
   const monthStart = startOfMonth(today);
   const monthEnd = endOfMonth(today);
 
+  // Return only the payload so unchanged responses (304 revalidations) keep
+  // the same data reference and the calendar does not re-render
   const { data: calendarData, isLoading } = useQuery({
     queryKey: ['calendar', monthStart, monthEnd],
     queryFn: () => scheduleAPI.getCalendarView(
       monthStart.toISOString(),
       monthEnd.toISOString()
-    ),
+    ).then((response) => response.data),
   });
 
   const cancelMutation = useMutation({
-    mutationFn: scheduleAPI.cancelScheduledPost,
+    // Occurrences of a recurring schedule are skipped rather than deleted
+    mutationFn: (event) => (event.status === 'recurring'
+      ? scheduleAPI.skipOccurrence(event.recurring_schedule_id, event.occurrence_time)
+      : scheduleAPI.cancelScheduledPost(event.id)),
     onSuccess: () => {
       queryClient.invalidateQueries(['calendar']);
       queryClient.invalidateQueries(['scheduledPosts']);
@@ -46,7 +51,7 @@ const ScheduleCalendar = () => {
     },
   });
 
-  const events = calendarData?.data?.events?.map(event => ({
+  const events = useMemo(() => calendarData?.events?.map(event => ({
     id: event.id,
     title: event.title,
     start: event.start,
@@ -56,8 +61,10 @@ const ScheduleCalendar = () => {
       platform: event.platform,
       status: event.status,
       content_preview: event.content_preview,
+      recurring_schedule_id: event.recurring_schedule_id,
+      occurrence_time: event.occurrence_time,
     },
-  })) || [];
+  })) || [], [calendarData]);
 
   const handleEventClick = (clickInfo) => {
     const event = clickInfo.event;
@@ -68,13 +75,15 @@ const ScheduleCalendar = () => {
       platform: event.extendedProps.platform,
       status: event.extendedProps.status,
       content_preview: event.extendedProps.content_preview,
+      recurring_schedule_id: event.extendedProps.recurring_schedule_id,
+      occurrence_time: event.extendedProps.occurrence_time,
     });
     setDialogOpen(true);
   };
 
   const handleCancelPost = async () => {
     if (selectedEvent) {
-      await cancelMutation.mutateAsync(selectedEvent.id);
+      await cancelMutation.mutateAsync(selectedEvent);
     }
   };
 
@@ -201,7 +210,9 @@ const ScheduleCalendar = () => {
             onClick={handleCancelPost}
             disabled={cancelMutation.isLoading}
           >
-            {cancelMutation.isLoading ? 'Canceling...' : 'Cancel Post'}
+            {cancelMutation.isLoading
+              ? 'Canceling...'
+              : selectedEvent?.status === 'recurring' ? 'Skip Occurrence' : 'Cancel Post'}
           </Button>
         </DialogActions>
       </Dialog>
@@ -24,7 +24,7 @@ import {
   Schedule,
   Publish,
 } from '@mui/icons-material';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { scheduleAPI } from '../../services/api';
 import { format, isToday, isTomorrow, isThisWeek } from 'date-fns';
 
@@ -33,9 +33,18 @@ const ScheduleList = () => {
   const [selectedPost, setSelectedPost] = useState(null);
   const queryClient = useQueryClient();
 
-  const { data: scheduledPosts, isLoading } = useQuery({
+  const {
+    data: scheduledPosts,
+    isLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ['scheduledPosts'],
-    queryFn: () => scheduleAPI.getScheduledPosts({ limit: 50 }),
+    queryFn: ({ pageParam }) =>
+      scheduleAPI.getScheduledPosts({ limit: 50, cursor: pageParam }),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.headers['x-next-cursor'] || undefined,
   });
 
   const cancelMutation = useMutation({
@@ -125,7 +134,7 @@ const ScheduleList = () => {
     );
   }
 
-  const posts = scheduledPosts?.data || [];
+  const posts = scheduledPosts?.pages.flatMap((page) => page.data) || [];
   
   if (posts.length === 0) {
     return (
@@ -236,6 +245,18 @@ const ScheduleList = () => {
       {renderPostGroup('This Week', groupedPosts.thisWeek)}
       {renderPostGroup('Later', groupedPosts.later)}
 
+      {hasNextPage && (
+        <Box sx={{ textAlign: 'center', mt: 2 }}>
+          <Button
+            variant="outlined"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+          >
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </Button>
+        </Box>
+      )}
+
       {/* Context Menu */}
       <Menu
         anchorEl={anchorEl}
@@ -54,6 +54,9 @@ const StatCard = ({ title, value, icon, color = 'primary' }) => (
   </Card>
 );
 
+// Only what the recent posts list shows (skips research data and full content)
+const RECENT_POST_FIELDS = 'id,topic,platform,status,content_preview,published_at';
+
 const RecentPost = ({ post }) => (
   <ListItem>
     <ListItemIcon>
@@ -64,7 +67,7 @@ const RecentPost = ({ post }) => (
       secondary={
         <Box>
           <Typography variant="body2" color="text.secondary">
-            {post.content.substring(0, 100)}...
+            {post.content_preview}
           </Typography>
           <Chip
             label={post.status}
@@ -84,7 +87,7 @@ const Dashboard = () => {
   // Fetch recent posts
   const { data: postsData } = useQuery({
     queryKey: ['posts', { limit: 5 }],
-    queryFn: () => contentAPI.getPosts({ limit: 5 }),
+    queryFn: () => contentAPI.getPosts({ limit: 5, fields: RECENT_POST_FIELDS }),
   });
 
   // Fetch scheduled posts
@@ -25,8 +25,14 @@ import {
   LinkedIn,
 } from '@mui/icons-material';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { formatDistanceToNow } from 'date-fns';
 import { platformsAPI } from '../services/api';
 
+const formatCheckedAt = (checkedAt) =>
+  checkedAt
+    ? `Checked ${formatDistanceToNow(new Date(`${checkedAt}Z`), { addSuffix: true })}`
+    : null;
+
 const Settings = () => {
   const [tabValue, setTabValue] = useState(0);
   const [showKeys, setShowKeys] = useState({});
@@ -44,6 +50,11 @@ const Settings = () => {
   const { data: platformStatus } = useQuery({
     queryKey: ['platformStatus'],
     queryFn: platformsAPI.getPlatformStatus,
+    // Accounts not validated yet come back pending: poll until they are checked
+    refetchInterval: (query) => {
+      const data = query.state.data?.data;
+      return data?.twitter?.pending || data?.linkedin?.pending ? 2000 : false;
+    },
   });
 
   const updateAPIKeysMutation = useMutation({
@@ -226,14 +237,20 @@ const Settings = () => {
                 </Typography>
                 <Box sx={{ ml: 'auto' }}>
                   <Chip
-                    icon={status.twitter?.valid ? <Check /> : <Error />}
-                    label={status.twitter?.valid ? 'Connected' : 'Not Connected'}
-                    color={status.twitter?.valid ? 'success' : 'error'}
+                    icon={status.twitter?.pending ? undefined : status.twitter?.valid ? <Check /> : <Error />}
+                    label={status.twitter?.pending ? 'Checking…' : status.twitter?.valid ? 'Connected' : 'Not Connected'}
+                    color={status.twitter?.pending ? 'default' : status.twitter?.valid ? 'success' : 'error'}
                     size="small"
                   />
                 </Box>
               </Box>
               
+              {status.twitter?.checked_at && (
+                <Typography variant="caption" color="text.secondary" display="block" sx={{ mb: 2 }}>
+                  {formatCheckedAt(status.twitter.checked_at)}
+                </Typography>
+              )}
+              
               <TextField
                 fullWidth
                 label="Access Token"
@@ -284,14 +301,20 @@ const Settings = () => {
                 </Typography>
                 <Box sx={{ ml: 'auto' }}>
                   <Chip
-                    icon={status.linkedin?.valid ? <Check /> : <Error />}
-                    label={status.linkedin?.valid ? 'Connected' : 'Not Connected'}
-                    color={status.linkedin?.valid ? 'success' : 'error'}
+                    icon={status.linkedin?.pending ? undefined : status.linkedin?.valid ? <Check /> : <Error />}
+                    label={status.linkedin?.pending ? 'Checking…' : status.linkedin?.valid ? 'Connected' : 'Not Connected'}
+                    color={status.linkedin?.pending ? 'default' : status.linkedin?.valid ? 'success' : 'error'}
                     size="small"
                   />
                 </Box>
               </Box>
               
+              {status.linkedin?.checked_at && (
+                <Typography variant="caption" color="text.secondary" display="block" sx={{ mb: 2 }}>
+                  {formatCheckedAt(status.linkedin.checked_at)}
+                </Typography>
+              )}
+              
               <TextField
                 fullWidth
                 label="Access Token"
@@ -51,6 +51,16 @@ export const authAPI = {
   
   getCurrentUser: () =>
     api.get('/api/auth/me'),
+  
+  // Signs out every other session; the response carries a new token for this one
+  changePassword: (currentPassword, newPassword) =>
+    api.post('/api/auth/change-password', {
+      current_password: currentPassword,
+      new_password: newPassword
+    }),
+  
+  logoutAll: () =>
+    api.post('/api/auth/logout-all'),
 };
 
 // Content API
@@ -70,6 +80,15 @@ export const contentAPI = {
   getPost: (postId) =>
     api.get(`/api/content/posts/${postId}`),
   
+  refreshPostMetrics: (postId) =>
+    api.post(`/api/content/posts/${postId}/refresh-metrics`),
+  
+  getPostEngagement: (postId, params = {}) =>
+    api.get(`/api/content/posts/${postId}/engagement`, { params }),
+  
+  getEngagement: (params = {}) =>
+    api.get('/api/content/engagement', { params }),
+  
   generateVariations: (postId, count = 3) =>
     api.post(`/api/content/variations?post_id=${postId}&count=${count}`),
   
@@ -79,6 +98,9 @@ export const contentAPI = {
   getTemplates: () =>
     api.get('/api/content/templates'),
   
+  updateTemplate: (templateId, templateData) =>
+    api.put(`/api/content/templates/${templateId}`, templateData),
+  
   getTrendingTopics: (category = null) =>
     api.get('/api/content/trending-topics', { params: { category } }),
   
@@ -107,6 +129,42 @@ export const scheduleAPI = {
   
   quickPost: (postData) =>
     api.post('/api/schedule/quick-post', postData),
+  
+  // One account per platform: each platform may appear once in crossPostData.platforms
+  crossPost: (crossPostData) =>
+    api.post('/api/schedule/cross-post', crossPostData),
+  
+  bulkSchedule: (bulkData) =>
+    api.post('/api/schedule/bulk', bulkData),
+  
+  bulkCancel: (scheduledPostIds) =>
+    api.post('/api/schedule/bulk-cancel', { scheduled_post_ids: scheduledPostIds }),
+  
+  getBestTimes: (platform, limit = 5) =>
+    api.get('/api/schedule/best-times', { params: { platform, limit } }),
+  
+  createRecurringSchedule: (recurringData) =>
+    api.post('/api/schedule/recurring', recurringData),
+  
+  getRecurringSchedules: () =>
+    api.get('/api/schedule/recurring'),
+  
+  getRecurringOccurrences: (recurringScheduleId, startDate, endDate) =>
+    api.get(`/api/schedule/recurring/${recurringScheduleId}/occurrences`, {
+      params: { start_date: startDate, end_date: endDate },
+    }),
+  
+  deleteRecurringSchedule: (recurringScheduleId) =>
+    api.delete(`/api/schedule/recurring/${recurringScheduleId}`),
+  
+  updateOccurrence: (recurringScheduleId, exceptionData) =>
+    api.post(`/api/schedule/recurring/${recurringScheduleId}/exceptions`, exceptionData),
+  
+  skipOccurrence: (recurringScheduleId, occurrenceTime) =>
+    api.post(`/api/schedule/recurring/${recurringScheduleId}/exceptions`, {
+      occurrence_time: occurrenceTime,
+      skip: true,
+    }),
 };
 
 // Platforms API
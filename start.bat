@@ -17,6 +17,10 @@ if not exist "backend\venv" (
 REM Activate virtual environment
 call backend\venv\Scripts\activate.bat
 
+REM Create or upgrade the database schema
+cd backend && alembic upgrade head && cd ..
+if errorlevel 1 exit /b 1
+
 REM Start both servers concurrently
 npx concurrently ^
     --names "Backend,Frontend" ^
@@ -17,6 +17,9 @@ fi
 # Activate virtual environment and start backend
 source backend/venv/bin/activate
 
+# Create or upgrade the database schema
+(cd backend && alembic upgrade head) || exit 1
+
 # Start both servers concurrently
 npx concurrently \
     --names "Backend,Frontend" \